@@ -0,0 +1,262 @@
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+COUNT_FIELD = "count"
+M2_SUFFIX = "_m2"  # the column of the sum of squared differences from the mean of a field is named field + M2_SUFFIX
+INITIAL_CAPACITY = 1024
+PASSAGE_RADII_KEY = "passage_radii"
+PASSAGE_COUNTS_KEY = "passage_counts"  # the dense counts of older files, a row per radius and a column per step
+PASSAGE_ENTRIES_KEY = "passage_entries"
+
+
+class RunningMoments:
+    """
+    The count, mean and M2 (the sum of squared differences from the mean) of a stream of values, updated one value
+    at a time with Welford's method. Two of them can be merged as if all the values were added to one.
+
+    Attributes:
+        count (int): The number of values that were added.
+        mean (float): The mean of the values.
+        m2 (float): The sum of the squared differences of the values from their mean.
+    """
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @property
+    def sum(self) -> float:
+        return self.mean * self.count
+
+    def add(self, value: float) -> None:
+        """adds one value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningMoments") -> None:
+        """adds the values of other moments into these ones, the other moments are not changed"""
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+    def to_dict(self) -> dict[str, Any]:
+        """the json form of the moments, the same keys the radius pass block was always saved with, and its M2"""
+        return {"total_counts": self.count, "sum_steps": self.sum, "average_steps": self.mean, "m2_steps": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RunningMoments":
+        """reads moments saved by to_dict. blocks saved before M2 was kept are read with no spread"""
+        count = data.get("total_counts", 0)
+        mean = data["sum_steps"] / count if count else 0.0
+        return cls(count, mean, data.get("m2_steps", 0.0))
+
+
+class StepAccumulator:
+    """
+    Keeps running moments of several fields for every step of a run, over many runs: index i of every column holds
+    step i + 1. Every field has a mean column, named as the field, and an M2 column, and all of the fields share
+    one count column. The columns are allocated with spare capacity and grow by doubling.
+
+    Accumulators of different runs, processes or machines can be merged with the parallel formulas of Chan et al.
+    The merge is associative, so any number of them can be reduced in any grouping.
+
+    Attributes:
+        fields (tuple[str, ...]): The names of the fields, in the order their values are given to add.
+        steps (int): The number of steps that have data in the columns.
+        __columns (dict[str, np.ndarray]): The count column, and the mean and M2 columns of every field.
+    """
+    def __init__(self, fields: Sequence[str], capacity: int = INITIAL_CAPACITY):
+        self.fields = tuple(fields)
+        self.steps = 0
+        self.__columns = self.__empty_columns(capacity)
+
+    def __column_names(self) -> list[str]:
+        return [COUNT_FIELD] + [name for field in self.fields for name in (field, field + M2_SUFFIX)]
+
+    def __empty_columns(self, capacity: int) -> dict[str, np.ndarray]:
+        """allocates zeroed columns for the given number of steps"""
+        return {name: np.zeros(capacity, dtype=np.int64 if name == COUNT_FIELD else np.float64)
+                for name in self.__column_names()}
+
+    def __reserve(self, steps: int) -> None:
+        """grows the columns until they have room for the given number of steps"""
+        capacity = len(self.__columns[COUNT_FIELD])
+        if steps <= capacity:
+            return
+        while capacity < steps:
+            capacity *= 2
+        for name, column in self.__columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            self.__columns[name] = grown
+
+    def add(self, step_index: int, values: Sequence[float]) -> None:
+        """
+        adds the values of one run at one step
+        :param step_index: the index of the step, 0 for the first step
+        :param values: the value of every field, in the order of fields
+        """
+        self.add_run(step_index, np.asarray(values, dtype=np.float64).reshape(1, -1))
+
+    def add_run(self, step_index: int, values: np.ndarray) -> None:
+        """
+        adds the values of one run at consecutive steps, one value per step and field, all at once
+        :param step_index: the index of the first step of the values
+        :param values: an array of a row per step and a column per field, in the order of fields
+        """
+        end = step_index + len(values)
+        if end > self.steps:
+            self.__reserve(end)
+            self.steps = end
+        columns = self.__columns
+        counts = columns[COUNT_FIELD][step_index:end]
+        counts += 1
+        for index, field in enumerate(self.fields):
+            means = columns[field][step_index:end]
+            delta = values[:, index] - means
+            means += delta / counts
+            columns[field + M2_SUFFIX][step_index:end] += delta * (values[:, index] - means)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        returns one column for all the recorded steps
+        :param name: COUNT_FIELD, a field for its means, or a field + M2_SUFFIX for its M2
+        :return: a read only view of the column
+        """
+        column = self.__columns[name][:self.steps]
+        column.flags.writeable = False
+        return column
+
+    def sum(self, field: str) -> np.ndarray:
+        """returns the sum of the values of a field at every step"""
+        return self.column(field) * self.column(COUNT_FIELD)
+
+    def merge(self, other: "StepAccumulator") -> None:
+        """
+        adds the moments of another accumulator of the same fields into this one, as if its values were added here
+        :param other: the accumulator to add, it is not changed
+        """
+        if other.fields != self.fields:
+            raise ValueError("Can't merge accumulators of different fields")
+        steps = other.steps
+        self.__reserve(steps)
+        mine, theirs = self.__columns, other.__columns
+
+        my_counts = mine[COUNT_FIELD][:steps]
+        their_counts = theirs[COUNT_FIELD][:steps]
+        total_counts = my_counts + their_counts
+        their_share = np.divide(their_counts, total_counts, out=np.zeros(steps), where=total_counts > 0)
+        for field in self.fields:
+            delta = theirs[field][:steps] - mine[field][:steps]
+            mine[field + M2_SUFFIX][:steps] += theirs[field + M2_SUFFIX][:steps] + \
+                delta * delta * my_counts * their_share
+            mine[field][:steps] += delta * their_share
+        mine[COUNT_FIELD][:steps] = total_counts
+        self.steps = max(self.steps, steps)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """returns all the columns trimmed to the recorded steps, to be saved"""
+        return {name: column[:self.steps] for name, column in self.__columns.items()}
+
+    @classmethod
+    def from_arrays(cls, fields: Sequence[str], arrays: Mapping[str, np.ndarray]) -> "StepAccumulator":
+        """
+        makes an accumulator from saved columns. a missing column is filled with zeros, so columns saved before
+        M2 was kept are read with no spread
+        """
+        accumulator = cls(fields)
+        saved = {name: np.asarray(arrays[name]) for name in accumulator.__columns if name in arrays}
+        steps = max((len(column) for column in saved.values()), default=0)
+        accumulator.__reserve(steps)
+        for name, column in saved.items():
+            accumulator.__columns[name][:len(column)] = column
+        accumulator.steps = steps
+        return accumulator
+
+
+class PassageHistogram:
+    """
+    Counts, for every radius of a set, how many runs passed it for the first time at every step. A run passes
+    every radius at most once, so the counts are kept sparse: for every radius, the count of every step that some
+    run passed it at. Histograms of the same radii are merged by adding.
+
+    Attributes:
+        radii (np.ndarray): The radii, in increasing order.
+        steps (int): The number of steps up to the last step a radius was passed at.
+        __counts (list[dict[int, int]]): For every radius, the number of runs that passed it at every step index,
+            where index i is step i + 1. Steps no run passed it at are left out.
+    """
+    def __init__(self, radii: Sequence[float]):
+        self.radii = np.array(sorted(radii), dtype=np.float64)
+        self.steps = 0
+        self.__counts: list[dict[int, int]] = [{} for _ in range(len(self.radii))]
+
+    def add(self, radius_index: int, step_index: int) -> None:
+        """
+        counts one run that passed a radius for the first time at a step
+        :param radius_index: the index of the radius in radii
+        :param step_index: the index of the step, 0 for the first step
+        """
+        counts = self.__counts[radius_index]
+        counts[step_index] = counts.get(step_index, 0) + 1
+        if step_index >= self.steps:
+            self.steps = step_index + 1
+
+    def get_histogram(self, radius_index: int, steps: int) -> np.ndarray:
+        """
+        returns the counts of one radius as a dense histogram
+        :param radius_index: the index of the radius in radii
+        :param steps: the length of the histogram, passages after it are left out
+        :return: the counts, index i holds step i + 1
+        """
+        histogram = np.zeros(steps, dtype=np.int64)
+        for step_index, count in self.__counts[radius_index].items():
+            if step_index < steps:
+                histogram[step_index] = count
+        return histogram
+
+    def get_counts(self) -> np.ndarray:
+        """returns the dense counts of all the recorded steps, a row per radius and a column per step"""
+        return np.array([self.get_histogram(index, self.steps) for index in range(len(self.radii))],
+                        dtype=np.int64).reshape(len(self.radii), self.steps)
+
+    def merge(self, other: "PassageHistogram") -> None:
+        """
+        adds the counts of another histogram of the same radii into this one
+        :param other: the histogram to add, it is not changed
+        """
+        if not np.array_equal(self.radii, other.radii):
+            raise ValueError("Can't merge first passage histograms of different radii")
+        for counts, other_counts in zip(self.__counts, other.__counts):
+            for step_index, count in other_counts.items():
+                counts[step_index] = counts.get(step_index, 0) + count
+        self.steps = max(self.steps, other.steps)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """returns the radii and the counts as (radius index, step index, count) rows, to be saved"""
+        entries = [(radius_index, step_index, count) for radius_index, counts in enumerate(self.__counts)
+                   for step_index, count in sorted(counts.items())]
+        return {PASSAGE_RADII_KEY: self.radii,
+                PASSAGE_ENTRIES_KEY: np.array(entries, dtype=np.int64).reshape(len(entries), 3)}
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "PassageHistogram":
+        """makes a histogram from arrays saved by to_arrays, or by older versions that saved the dense counts"""
+        histogram = cls(np.asarray(arrays[PASSAGE_RADII_KEY]).tolist())
+        if PASSAGE_ENTRIES_KEY in arrays:
+            entries = np.asarray(arrays[PASSAGE_ENTRIES_KEY]).tolist()
+        else:
+            counts = np.asarray(arrays[PASSAGE_COUNTS_KEY])
+            entries = [(radius_index, step_index, counts[radius_index, step_index])
+                       for radius_index, step_index in np.argwhere(counts).tolist()]
+        for radius_index, step_index, count in entries:
+            histogram.__counts[radius_index][step_index] = int(count)
+            histogram.steps = max(histogram.steps, step_index + 1)
+        return histogram
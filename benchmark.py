@@ -0,0 +1,243 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+from board import *
+
+BENCHMARK_SEED = 1234  # the obstacles, portals and steps of every benchmark are the same on every run
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25  # a benchmark that got slower than its baseline by more than this share is a regression
+RUN_STEPS = 1000  # the walker starts a new run at the origin after this many steps, so it stays among the obstacles
+FIELD_SIZE = 500  # obstacles and portals are spread over the points with |x|, |y| <= FIELD_SIZE
+CLEAR_RADIUS = 2.0  # no obstacle is placed this close to the origin, so the walker is never stuck at the start
+OBSTACLE_SIZE = 0.2
+PORTAL_SIZE = 0.3
+RESULTS_KEY = "results"
+
+# makes the operation of a benchmark, given a directory it may write files into. the operation is called many times
+Setup = Callable[[str], Callable[[], Any]]
+
+
+class BenchmarkResult(NamedTuple):
+    """the measures of one benchmark"""
+    ns_per_op: float  # the time of one operation, in the fastest repeat
+    blocks_per_op: float  # the memory blocks that were allocated and not freed, on average per operation
+    peak_bytes: int  # the most memory the operations held at once, above what was allocated before them
+
+
+class Benchmark(NamedTuple):
+    name: str
+    number: int  # the number of operations of every repeat
+    setup: Setup
+
+
+def _random_position(rng: random.Random) -> Position:
+    """a random position of the field that is not too close to the origin"""
+    while True:
+        position = rng.uniform(-FIELD_SIZE, FIELD_SIZE), rng.uniform(-FIELD_SIZE, FIELD_SIZE)
+        if math.hypot(*position) > CLEAR_RADIUS:
+            return position
+
+
+def make_field_board(obstacles: int, portals: int, statistics: Optional[Statistics] = None) -> Board:
+    """
+    builds a board with obstacles and portals spread at random over the field, the same for every call
+    :param obstacles: the number of obstacles
+    :param portals: the number of portals
+    :param statistics: the statistics the board records into, statistics that are not saved by default
+    :return: the board
+    """
+    rng = random.Random(BENCHMARK_SEED)
+    board = Board(Walker(rng=random.Random(BENCHMARK_SEED)), statistics or Statistics(None))
+    for _ in range(obstacles):
+        board.add_obstacle(Obstacle(*_random_position(rng), OBSTACLE_SIZE))
+    for _ in range(portals):
+        board.add_portal(Portal(_random_position(rng), _random_position(rng), PORTAL_SIZE))
+    return board
+
+
+def _walk(method: int) -> Setup:
+    def setup(directory: str) -> Callable[[], Any]:
+        return Walker(method, random.Random(BENCHMARK_SEED)).walk
+    return setup
+
+
+def _do_move(obstacles: int, portals: int) -> Setup:
+    def setup(directory: str) -> Callable[[], Any]:
+        board = make_field_board(obstacles, portals)
+        steps = 0
+
+        def operation() -> None:
+            nonlocal steps
+            if steps == RUN_STEPS:
+                board.reset_game()
+                steps = 0
+            board.do_move()
+            steps += 1
+        return operation
+    return setup
+
+
+def _record_step(persistent: bool) -> Setup:
+    def setup(directory: str) -> Callable[[], Any]:
+        if persistent:
+            # the statistics the board keeps by default, written to the file every so many steps or seconds
+            statistics = Statistics(os.path.join(directory, STATISTICS_FILE_PATH), STATISTICS_FLUSH_STEPS,
+                                    STATISTICS_FLUSH_SECONDS, flush_growth=STATISTICS_FLUSH_GROWTH)
+        else:
+            statistics = Statistics(None)
+        walker = Walker(SIMPLE_WALK, random.Random(BENCHMARK_SEED))
+        positions = []
+        for _ in range(RUN_STEPS):
+            walker.walk()
+            positions.append(walker.get_position())
+        step = 0
+
+        def operation() -> None:
+            nonlocal step
+            if step == RUN_STEPS:
+                statistics.reset_statistics()
+                step = 0
+            statistics.record_step(positions[step])
+            step += 1
+        return operation
+    return setup
+
+
+def _get_screen(directory: str) -> Callable[[], Any]:
+    board = make_field_board(10000, 10)
+    return board.get_screen
+
+
+BENCHMARKS = (
+    *(Benchmark(f"walker_walk[{name}]", 20000, _walk(method))
+      for name, method in (("simple", SIMPLE_WALK), ("random_size", RANDOM_SIZE_WALK), ("square", SQUARE_WALK),
+                           ("preferred", PREFERRED_WALK))),
+    *(Benchmark(f"board_do_move[obstacles={obstacles},portals={portals}]", 5000, _do_move(obstacles, portals))
+      for obstacles, portals in ((0, 0), (100, 0), (10000, 0), (0, 10), (0, 1000), (10000, 1000))),
+    Benchmark("statistics_record_step[memory]", 20000, _record_step(False)),
+    Benchmark("statistics_record_step[persistent]", 20000, _record_step(True)),
+    Benchmark("board_get_screen", 20000, _get_screen),
+)
+
+
+def measure(operation: Callable[[], Any], number: int, repeat: int = DEFAULT_REPEAT) -> BenchmarkResult:
+    """
+    measures an operation. the time is taken without tracing, and the memory in one more repeat with tracemalloc,
+    which slows every allocation down
+    :param operation: the operation, called with no arguments
+    :param number: the number of calls of every repeat
+    :param repeat: the number of timed repeats, the fastest is kept since the others were only slowed down
+    :return: the measures
+    """
+    operation()  # the first call may fill caches, it is not counted
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+
+    tracemalloc.start()
+    try:
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start_blocks = sys.getallocatedblocks()
+        for _ in range(number):
+            operation()
+        blocks = sys.getallocatedblocks() - start_blocks
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(best, blocks / number, peak_bytes)
+
+
+def run_benchmarks(name_filter: str = "", repeat: int = DEFAULT_REPEAT, scale: float = 1.0,
+                   benchmarks: tuple[Benchmark, ...] = BENCHMARKS) -> dict[str, BenchmarkResult]:
+    """
+    runs the benchmarks, and prints every result as it is measured
+    :param name_filter: only the benchmarks whose name contains it are run
+    :param repeat: the number of timed repeats of every benchmark
+    :param scale: the number of operations of every benchmark is multiplied by it, for a quick run
+    :param benchmarks: the benchmarks to choose from
+    :return: the result of every benchmark that was run, by its name
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for benchmark in benchmarks:
+            if name_filter not in benchmark.name:
+                continue
+            result = measure(benchmark.setup(directory), max(1, int(benchmark.number * scale)), repeat)
+            print(f"{benchmark.name}: {result.ns_per_op:.0f} ns/op, {result.blocks_per_op:.3f} blocks/op, "
+                  f"peak {result.peak_bytes} bytes")
+            results[benchmark.name] = result
+    return results
+
+
+def save_results(path: str, results: Mapping[str, BenchmarkResult]) -> None:
+    """saves results as a json baseline, with the python and machine they were measured on"""
+    data = {"python": platform.python_version(), "machine": platform.machine(),
+            RESULTS_KEY: {name: result._asdict() for name, result in results.items()}}
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=4)
+
+
+def load_results(path: str) -> dict[str, BenchmarkResult]:
+    """loads results saved by save_results"""
+    with open(path, 'r') as file:
+        data = json.load(file)
+    return {name: BenchmarkResult(**result) for name, result in data[RESULTS_KEY].items()}
+
+
+def find_regressions(baseline: Mapping[str, BenchmarkResult], results: Mapping[str, BenchmarkResult],
+                     tolerance: float = DEFAULT_TOLERANCE) -> dict[str, float]:
+    """
+    compares results with a baseline. only the benchmarks that are in both are compared
+    :param baseline: the results to compare with
+    :param results: the new results
+    :param tolerance: how much slower than the baseline a benchmark may get, as a share of its baseline time
+    :return: the time of every benchmark that got slower than allowed, as a ratio of its baseline time
+    """
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result.ns_per_op / baseline[name].ns_per_op
+        if ratio > 1 + tolerance:
+            regressions[name] = ratio
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the speed and the memory of the simulation hot paths")
+    parser.add_argument("--filter", default="", help="run only the benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed repeats of every benchmark")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the operations of every benchmark")
+    parser.add_argument("--save", help="a json file to save the results into, as a baseline")
+    parser.add_argument("--compare", help="a json baseline to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="how much slower than the baseline a benchmark may get, 0.25 for 25%%")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.repeat, args.scale)
+    if args.save:
+        save_results(args.save, results)
+    if args.compare:
+        regressions = find_regressions(load_results(args.compare), results, args.tolerance)
+        for name, ratio in regressions.items():
+            print(f"regression: {name} is {ratio:.2f} times slower than the baseline")
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == '__main__':
+    main()
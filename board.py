@@ -2,16 +2,63 @@ from walker import *
 from obstacle import *
 from portal import *
 from statistics import *
-from typing import Optional, Any
+from spatial_index import SpatialHash, TileIndex, Cell
+from trajectory import TrajectoryRecorder
+from metrics import *
+from procedural import ProceduralField, FieldChunk
+from types import MappingProxyType
+from typing import Optional, Any, Mapping, Sequence
+from itertools import count
+from operator import itemgetter
 import math
+import random
 
 SCREEN_SIZE = 8
-STATISTICS_FILE_PATH = "stats.json"
+STATISTICS_FILE_PATH = "stats.npz"
+LEGACY_STATISTICS_FILE_PATH = "stats.json"  # statistics of older versions, imported once into STATISTICS_FILE_PATH
+# the board writes its statistics behind, on these intervals, instead of on every step
+STATISTICS_FLUSH_STEPS = 1000
+STATISTICS_FLUSH_SECONDS = 5.0
+STATISTICS_FLUSH_GROWTH = 0.5  # the file is written again after at least half as many steps as it holds
+
+FIELD_LOAD_RADIUS = 1  # the tiles of a generated field this far from the tile of the walker are on the board
+MAX_PORTAL_HOPS = 100  # a step that goes through more portals than this is rejected and drawn again
+MAX_STEP_RETRIES = 1000  # when this many drawn steps in a row are rejected, the walker is stuck and the move fails
 
 LOCATION_KEY = 'location'
 SIZE_KEY = 'size'
 
 
+# a portal endpoint in the portal index: the order it was added in, its portal, and its position
+PortalEndpoint = tuple[int, Portal, Position]
+# the read only data of the obstacles or the portals of one screen, as get_screen returns it
+ScreenView = tuple[Mapping[str, Any], ...]
+
+
+def make_board_statistics(passage_radii: Sequence[float] = DEFAULT_PASSAGE_RADII) -> Statistics:
+    """
+    makes the statistics a board records into by default: the statistics file, written behind
+    :param passage_radii: the radii whose first passage steps are counted
+    :return: the statistics
+    """
+    return Statistics(STATISTICS_FILE_PATH, STATISTICS_FLUSH_STEPS, STATISTICS_FLUSH_SECONDS,
+                      LEGACY_STATISTICS_FILE_PATH, track_quantiles=True, passage_radii=passage_radii,
+                      flush_growth=STATISTICS_FLUSH_GROWTH)
+
+
+def obstacle_from_config(obstacle_data: Mapping[str, Any]) -> Obstacle:
+    """makes an obstacle from the way it is saved in the configuration file"""
+    return Obstacle(obstacle_data.get('x', 0), obstacle_data.get('y', 0),
+                    obstacle_data.get('size', DEAFULT_OBSTICLE_SIZE))
+
+
+def portal_from_config(portal_data: Mapping[str, Any]) -> Portal:
+    """makes a portal from the way it is saved in the configuration file"""
+    endpoint1 = (portal_data['endpoint1'].get('x', 0), portal_data['endpoint1'].get('y', 0))
+    endpoint2 = (portal_data['endpoint2'].get('x', 0), portal_data['endpoint2'].get('y', 0))
+    return Portal(endpoint1, endpoint2, portal_data.get('size', DEAFULT_PORTAL_SIZE))
+
+
 class Board:
     """
     Manages the game board for a simulation, handling the placement and interaction of walkers, obstacles,
@@ -22,23 +69,156 @@ class Board:
     Attributes:
         __walker (Walker): The entity that moves around the board according to user inputs or predefined behaviors.
         __obstacles (list[Obstacle]): A list of obstacles placed on the board that the walker may encounter.
+        __obstacle_index (SpatialHash[Obstacle]): The obstacles by their place on the board, so a step is checked
+            only against the obstacles near it.
         __portales (list[Portal]): A list of portals that can transport the walker to different locations on the board.
+        __portal_index (SpatialHash[PortalEndpoint]): The endpoints of the portals by their place on the board.
+        __obstacle_screens (TileIndex): The obstacles by the screen they are on, with the ready screen data.
+        __portal_screens (TileIndex): The portal endpoints by the screen they are on, with the ready screen data.
         __stats (Statistics): Tracks and records various statistics throughout the course of the simulation.
+            By default they are saved to STATISTICS_FILE_PATH.
+        __recorder (Optional[TrajectoryRecorder]): If set, every step is also appended to a trajectory file.
+        __metrics (Optional[StepMetrics]): If set, the phases of every step are counted and timed.
+        __last_cut_moves (list[tuple[Position, Position]]): The straight parts of the last step that was made, it
+            is cut where the walker went through a portal.
+        __field (Optional[ProceduralField]): If set, its obstacles and portals are added around the walker as it goes.
+        __field_tiles (dict[Cell, FieldChunk]): The tiles of the field that are on the board now.
+        __walker_tile (Optional[Cell]): The tile of the walker when the field tiles were last loaded.
     """
 
-    def __init__(self, walker: Walker):
+    def __init__(self, walker: Walker, statistics: Optional[Statistics] = None):
         self.__walker = walker
         self.__obstacles: list[Obstacle] = []
+        self.__obstacle_index: SpatialHash[Obstacle] = SpatialHash()
         self.__portales: list[Portal] = []
-        self.__stats = Statistics(STATISTICS_FILE_PATH)
+        self.__portal_index: SpatialHash[PortalEndpoint] = SpatialHash()
+        self.__endpoint_order = count()  # keeps the endpoints checked in the order the portals were added
+        self.__portal_endpoints: dict[Portal, list[PortalEndpoint]] = {}
+        self.__obstacle_screens: TileIndex[Obstacle, ScreenView] = TileIndex(self.__make_obstacles_view)
+        self.__portal_screens: TileIndex[tuple[Portal, Position], ScreenView] = TileIndex(self.__make_portals_view)
+        if statistics is None:
+            statistics = make_board_statistics()
+        self.__stats = statistics
+        self.__recorder: Optional[TrajectoryRecorder] = None
+        self.__metrics: Optional[StepMetrics] = None
+        self.__last_cut_moves: list[tuple[Position, Position]] = []
+        self.__field: Optional[ProceduralField] = None
+        self.__field_tiles: dict[Cell, FieldChunk] = {}
+        self.__walker_tile: Optional[Cell] = None
 
     def add_obstacle(self, obstacle: Obstacle) -> None:
         """public method to add given obstacle"""
         self.__obstacles.append(obstacle)
+        self.__obstacle_index.insert(obstacle, obstacle.position, obstacle.get_size())
+        self.__obstacle_screens.add(self.__get_screen(obstacle.position), obstacle)
+
+    def remove_obstacle(self, obstacle: Obstacle) -> None:
+        """public method to remove given obstacle, raises ValueError if it is not on the board"""
+        self.__obstacles.remove(obstacle)
+        self.__obstacle_index.remove(obstacle)
+        self.__obstacle_screens.remove(self.__get_screen(obstacle.position), obstacle)
 
     def add_portal(self, portal: Portal) -> None:
         """public method to add given portal"""
         self.__portales.append(portal)
+        entries = [(next(self.__endpoint_order), portal, endpoint) for endpoint in portal.get_endpoints()]
+        self.__portal_endpoints[portal] = entries
+        for entry in entries:
+            _, _, endpoint = entry
+            self.__portal_index.insert(entry, endpoint, portal.get_size())
+            self.__portal_screens.add(self.__get_screen(endpoint), (portal, endpoint))
+
+    def remove_portal(self, portal: Portal) -> None:
+        """public method to remove given portal, raises ValueError if it is not on the board"""
+        self.__portales.remove(portal)
+        for entry in self.__portal_endpoints.pop(portal):
+            _, _, endpoint = entry
+            self.__portal_index.remove(entry)
+            self.__portal_screens.remove(self.__get_screen(endpoint), (portal, endpoint))
+
+    def load_game_elements(self, config: Any) -> bool:
+        """
+        loads the portals and obstacles from the data of a configuration file
+        :param config: the data taken from the configuration file
+        :return: whether we changed the data because something wasn't set right or not
+        """
+        config_updated = False
+
+        # Load obstacles if they exist, otherwise initialize with an empty list
+        if 'obstacles' not in config:
+            config['obstacles'] = []
+            config_updated = True
+        for obstacle_data in config['obstacles']:
+            if 'size' not in obstacle_data:
+                obstacle_data['size'] = DEAFULT_OBSTICLE_SIZE
+                config_updated = True
+            self.add_obstacle(obstacle_from_config(obstacle_data))
+
+        # Load portals if they exist, otherwise initialize with an empty list
+        if 'portals' not in config:
+            config['portals'] = []
+            config_updated = True
+        for portal_data in config['portals']:
+            if 'size' not in portal_data:
+                portal_data['size'] = DEAFULT_PORTAL_SIZE
+                config_updated = True
+            self.add_portal(portal_from_config(portal_data))
+
+        # a generated field is used only if the configuration asks for one, nothing is added otherwise
+        if 'procedural' in config:
+            self.set_field(ProceduralField.from_config(config['procedural'], SCREEN_SIZE))
+
+        return config_updated
+
+    def set_field(self, field: Optional[ProceduralField]) -> None:
+        """
+        sets the generated field whose obstacles and portals are added to the board around the walker, None to take
+        the field that is on the board off it. the elements that were added by hand stay
+        :param field: the field, its tiles should be the size of a screen
+        """
+        for chunk in self.__field_tiles.values():
+            self.__unload_chunk(chunk)
+        self.__field_tiles.clear()
+        self.__walker_tile = None
+        self.__field = field
+        self.__update_field()
+
+    def get_field(self) -> Optional[ProceduralField]:
+        """public method to retrieve the generated field of the board, None if there is none"""
+        return self.__field
+
+    def __update_field(self) -> None:
+        """
+        keeps the tiles of the field around the walker on the board: when the walker gets to a new tile, the tiles
+        near it are added and the ones that are too far are taken off, so the board holds a bounded number of
+        elements however far the walker goes. steps are shorter than half a tile and portals reach half a tile, so
+        nothing a step can meet from the tile of the walker is on a tile that isn't loaded
+        """
+        if self.__field is None:
+            return
+        walker_tile = self.__get_screen(self.__walker.get_position())
+        if walker_tile == self.__walker_tile:
+            return
+        self.__walker_tile = walker_tile
+        tile_x, tile_y = walker_tile
+        near = {(tile_x + dx, tile_y + dy) for dx in range(-FIELD_LOAD_RADIUS, FIELD_LOAD_RADIUS + 1)
+                for dy in range(-FIELD_LOAD_RADIUS, FIELD_LOAD_RADIUS + 1)}
+        for tile in [tile for tile in self.__field_tiles if tile not in near]:
+            self.__unload_chunk(self.__field_tiles.pop(tile))
+        for tile in sorted(near - self.__field_tiles.keys()):
+            chunk = self.__field.get_chunk(tile)
+            self.__field_tiles[tile] = chunk
+            for obstacle in chunk.obstacles:
+                self.add_obstacle(obstacle)
+            for portal in chunk.portals:
+                self.add_portal(portal)
+
+    def __unload_chunk(self, chunk: FieldChunk) -> None:
+        """takes the elements of a tile of the field off the board"""
+        for obstacle in chunk.obstacles:
+            self.remove_obstacle(obstacle)
+        for portal in chunk.portals:
+            self.remove_portal(portal)
 
     def __if_segment_passed_obstacle(self, src_position: Position, dst_position: Position) -> Optional[Obstacle]:
         """
@@ -50,9 +230,10 @@ class Board:
         :param src_position: the beginning of the segment to check
         :param dst_position: the end of the segment to check
         :return: the Obstacle the segment passed if it passed one, None if not
+        only the obstacles in the grid cells around the segment are checked
         """
 
-        for i in self.__obstacles:
+        for i in self.__obstacle_index.query_segment(src_position, dst_position):
             closest_point = self.__closest_point_on_segment(*src_position, *dst_position, *i.position)
             if self.__distance(*closest_point, *i.position) <= i.get_size():
                 return i
@@ -86,35 +267,57 @@ class Board:
         """return distance between two positions"""
         return float(math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2))
 
-    def __handle_portal_steps(self, src_position: Position, dst_position: Position) -> list[tuple[Position, Position]]:
+    def __handle_portal_steps(self, src_position: Position,
+                              dst_position: Position) -> Optional[list[tuple[Position, Position]]]:
         """
-        Recursively handles the interaction of the walker with portals during a movement step. This method checks
+        Handles the interaction of the walker with portals during a movement step. This method checks
         if the walker starts or ends a step within a portal's radius, allowing for teleportation to the
-        portal's corresponding endpoint. It recursively handles sequential portal jumps within a single move.
+        portal's corresponding endpoint. It follows sequential portal jumps within a single move one after the
+        other, up to MAX_PORTAL_HOPS jumps.
 
         :param src_position: The starting position of the walker.
         :param dst_position: The intended ending position of the walker.
         :return: A list of positions detailing the walker's journey, potentially modified by portal transport.
+                 None if the step went through more than MAX_PORTAL_HOPS portals.
 
-        This method first checks if the walker is already inside a portal to prevent re-triggering transport on
-        the same step. If the walker crosses into another portal's radius during the movement, it transports the
-        walker, recalculates the step from the new position, and checks for additional portal interactions recursively.
-        """
-        for portal in self.__portales:
-            for endpoint in portal.get_endpoints():
-                if self.__distance(*src_position, *endpoint) <= portal.get_size():
-                    # means that the step has started allready in the portal,
-                    # so we want to ignore it so he will be able to go out
-                    continue
-                closest_point = self.__closest_point_on_segment(*src_position, *dst_position, *endpoint)
-                if self.__distance(*closest_point, *endpoint) <= portal.get_size():
-                    self.__walker.set_position(
-                        src_position)  # we have to take it back so the walker can recalculate the step
-                    self.__walker.portal_walk(dst_position, closest_point, portal.transport(endpoint))
-                    # we will use recursion so we will check allso at the other side if the portal if he went through another portal
-                    return [(src_position, closest_point)] + self.__handle_portal_steps(portal.transport(endpoint),
-                                                                                        self.__walker.get_position())
-        return [(src_position, dst_position)]
+        Every time the walker crosses into a portal's radius during the movement, it transports the walker,
+        recalculates the rest of the step from the other endpoint, and checks that part for portals again.
+        """
+        cut_moves: list[tuple[Position, Position]] = []
+        while True:
+            crossing = self.__find_portal_crossing(src_position, dst_position)
+            if crossing is None:
+                cut_moves.append((src_position, dst_position))
+                return cut_moves
+            if len(cut_moves) >= MAX_PORTAL_HOPS:  # every portal that was passed cut the step once
+                return None
+            portal, endpoint, closest_point = crossing
+            portal_exit = portal.transport(endpoint)
+            self.__walker.set_position(src_position)  # we have to take it back so the walker can recalculate the step
+            self.__walker.portal_walk(dst_position, closest_point, portal_exit)
+            cut_moves.append((src_position, closest_point))
+            # the rest of the step starts at the other side of the portal
+            src_position, dst_position = portal_exit, self.__walker.get_position()
+
+    def __find_portal_crossing(self, src_position: Position,
+                               dst_position: Position) -> Optional[tuple[Portal, Position, Position]]:
+        """
+        finds the first portal endpoint, in the order the portals were added, that the segment enters
+        :param src_position: the beginning of the segment to check
+        :param dst_position: the end of the segment to check
+        :return: the portal, the endpoint that was entered and the point on the segment closest to it,
+                 or None if the segment does not enter any portal
+        """
+        candidates = sorted(self.__portal_index.query_segment(src_position, dst_position), key=itemgetter(0))
+        for _, portal, endpoint in candidates:
+            if self.__distance(*src_position, *endpoint) <= portal.get_size():
+                # means that the step has started allready in the portal,
+                # so we want to ignore it so he will be able to go out
+                continue
+            closest_point = self.__closest_point_on_segment(*src_position, *dst_position, *endpoint)
+            if self.__distance(*closest_point, *endpoint) <= portal.get_size():
+                return portal, endpoint, closest_point
+        return None
 
     def do_move(self) -> bool:
         """
@@ -124,26 +327,85 @@ class Board:
 
         :return: A boolean indicating if the movement was successful without being blocked by too many obstacles.
 
-        This method continuously attempts to move the walker until it can do so without encountering an obstacle
-        immediately after a portal. If too many retries occur (indicated by catching an exception), it returns False,
-        signaling that the path is blocked.
+        This method attempts to move the walker until it can do so without encountering an obstacle, also
+        immediately after a portal, and without going through more than MAX_PORTAL_HOPS portals. If MAX_STEP_RETRIES
+        steps in a row are rejected, or a step can't be computed, it returns False, signaling that the path is
+        blocked.
         """
         # because we don't want it to fall if the obs is after the portal, and we also want to check after the portal
         # if there is an obstacle.
+        metrics = self.__metrics  # the phases are timed only when metrics are on, otherwise nothing is measured
         try:
-            while True:
+            for _ in range(MAX_STEP_RETRIES):
                 prev_position = self.__walker.get_position()
+                clock = metrics.start() if metrics is not None else 0
                 self.__walker.walk()
+                if metrics is not None:
+                    clock = metrics.lap(WALK_PHASE, clock)
                 cut_moves = self.__handle_portal_steps(prev_position, self.__walker.get_position())
-                if not self.__if_cut_step_passed_obstacle(cut_moves):
-                    break
+                if metrics is not None:
+                    clock = metrics.lap(PORTALS_PHASE, clock)
+                # a step through too many portals is rejected like a step into an obstacle
+                if cut_moves is not None:
+                    passed_obstacle = self.__if_cut_step_passed_obstacle(cut_moves)
+                    if metrics is not None:
+                        metrics.lap(OBSTACLES_PHASE, clock)
+                    if not passed_obstacle:
+                        break
+                    if metrics is not None:
+                        metrics.obstacle_retries += 1
+                elif metrics is not None:
+                    metrics.portal_hop_retries += 1
                 self.__walker.set_position(prev_position)
+            else:
+                raise RuntimeError("every drawn step was rejected")
         except:
+            if metrics is not None:
+                metrics.failed_steps += 1
             print("too many obstacles, cant pass")
             return False
+        self.__last_cut_moves = cut_moves
+        clock = metrics.start() if metrics is not None else 0
         self.__stats.record_step(self.__walker.get_position())
+        if metrics is not None:
+            clock = metrics.lap(STATISTICS_PHASE, clock)
+        if self.__recorder is not None:
+            # a step that went straight is a single segment, only the cuts of portal steps are worth keeping
+            self.__recorder.record_step(self.__walker.get_position(), cut_moves if len(cut_moves) > 1 else None)
+            if metrics is not None:
+                metrics.lap(RECORDER_PHASE, clock)
+        if metrics is not None:
+            metrics.steps += 1
+            if len(cut_moves) > 1:
+                metrics.portal_steps += 1
+        if self.__field is not None:
+            self.__update_field()
         return True
 
+    def do_moves(self, steps: int, trail: Optional[list[list[Position]]] = None) -> int:
+        """
+        makes several steps one after the other, as do_move does, and stops at the first step that can't be made
+        :param steps: the number of steps to make
+        :param trail: if given, the path of the walker is added to it, as lines of positions. every step continues
+        the last line, and a step through portals ends it where the walker entered a portal and starts a new line
+        where it left, so a jump is never drawn as a path
+        :return: the number of steps that were made, less than steps only if the walker couldn't move
+        """
+        for made in range(steps):
+            if not self.do_move():
+                return made
+            if trail is not None:
+                self.__extend_trail(trail)
+        return steps
+
+    def __extend_trail(self, trail: list[list[Position]]) -> None:
+        """adds the parts of the last step to the lines of a trail"""
+        if not trail:
+            trail.append([self.__last_cut_moves[0][0]])
+        trail[-1].append(self.__last_cut_moves[0][1])
+        for src_position, dst_position in self.__last_cut_moves[1:]:
+            trail.append([src_position, dst_position])
+
     def __if_cut_step_passed_obstacle(self, cut_step: list[tuple[Position, Position]]) -> bool:
         """check if any part of the list passed an obstacle"""
         for segment in cut_step:
@@ -151,10 +413,19 @@ class Board:
                 return True
         return False
 
-    def reset_game(self) -> None:
-        """resets the board"""
+    def reset_game(self, rng: Optional[random.Random] = None) -> None:
+        """
+        resets the board
+        :param rng: the random generator the walker draws the steps of the new run from, the current one is kept
+        when not given
+        """
+        if rng is not None:
+            self.__walker.set_random(rng)
         self.__walker.set_position((0, 0))
+        self.__update_field()
         self.__stats.reset_statistics()
+        if self.__recorder is not None:
+            self.__recorder.start_run()
 
     @staticmethod
     def __get_screen_position(location: float) -> int:
@@ -173,94 +444,208 @@ class Board:
         """returns the position of an object on the given screen, given its general position"""
         return location - (screen * SCREEN_SIZE - SCREEN_SIZE / 2)
 
-    def get_screen(self) -> dict[str, Any]:
+    @classmethod
+    def __get_position_on_screen(cls, position: Position, screen: Cell) -> Position:
+        """returns the position of an object on the given screen, given its general position"""
+        return (cls.__get_location_on_screen(position[X_INDEX], screen[X_INDEX]),
+                cls.__get_location_on_screen(position[Y_INDEX], screen[Y_INDEX]))
+
+    @classmethod
+    def __get_screen(cls, position: Position) -> Cell:
+        """returns the indexes of the screen a position is on"""
+        return cls.__get_screen_position(position[X_INDEX]), cls.__get_screen_position(position[Y_INDEX])
+
+    def get_screen(self, position: Optional[Position] = None,
+                   trail: Optional[Sequence[Sequence[Position]]] = None) -> dict[str, Any]:
         """
         this function returns a dictionary containing the information needed for the
         simulation to present
+        :param position: where to show the walker, for example a recorded position that is played back. the
+        position of the walker by default
+        :param trail: lines of positions to show as the path of the walker, for example the steps made since the
+        last screen was shown, see do_moves
         :return:
         a dictionary with the following arguments:
         s - the location of the screen the walker is in
         w - the location of the walker on the board
         o - obstacles on screen
         p - portals on screen
+        ov - the version of the obstacles on screen, it changes only when they change
+        pv - the version of the portals on screen, it changes only when they change
+        t - the trail, the positions of its lines on the screen of the walker, only when a trail is given.
+        positions of other screens are outside the screen
+        the obstacles and portals are read only, and are the same objects as long as their version is the same
         """
         ret: dict[str, Any] = {}
+        if position is None:
+            position = self.__walker.get_position()
         # we will calculate what is the screen that we are returning
-        x_screen = self.__get_screen_position(self.__walker.get_position()[X_INDEX])
-        y_screen = self.__get_screen_position(self.__walker.get_position()[Y_INDEX])
-        ret.update({"s": (x_screen, y_screen)})
+        screen = self.__get_screen(position)
+        ret.update({"s": screen})
+
+        ret.update({"w": self.__get_position_on_screen(position, screen)})
+
+        if self.__field is not None and screen != self.__walker_tile:
+            # the field is loaded only around the walker, other screens, like the ones of a run that is played
+            # back, are built from the field itself
+            ret.update(self.__make_field_screen(screen))
+        else:
+            # Add obstacles that are on the current screen
+            ret.update({"o": self.__obstacle_screens.get_view(screen),
+                        "ov": self.__obstacle_screens.get_version(screen)})
+            ret.update({"p": self.__portal_screens.get_view(screen), "pv": self.__portal_screens.get_version(screen)})
+        if trail is not None:
+            ret.update({"t": tuple(tuple(self.__get_position_on_screen(point, screen) for point in line)
+                                     for line in trail)})
 
-        x_on_screen = self.__get_location_on_screen(self.__walker.get_position()[X_INDEX], x_screen)
-        y_on_screen = self.__get_location_on_screen(self.__walker.get_position()[Y_INDEX], y_screen)
-        ret.update({"w": (x_on_screen, y_on_screen)})
+        return ret
+
+    def __make_field_screen(self, screen: Cell) -> dict[str, Any]:
+        """
+        builds the obstacles and the portals of a screen from the generated field and the elements that were added
+        by hand, whether the tiles of the screen are loaded on the board or not. the views are built on every call
+        :param screen: the horizontal and vertical screen indexes, the tiles of the field are screens
+        :return: the "o", "ov", "p" and "pv" items of get_screen
+        """
+        field = self.__field
+        if field is None:
+            raise ValueError("There is no field to build the screen from")
+        loaded_obstacles = self.__get_loaded_obstacles()
+        loaded_portals = self.__get_loaded_portals()
+        obstacles = [obstacle for obstacle in self.__obstacle_screens.get_items(screen)
+                     if obstacle not in loaded_obstacles]
+        obstacles.extend(field.get_chunk(screen).obstacles)
+        endpoints = [(portal, endpoint) for portal, endpoint in self.__portal_screens.get_items(screen)
+                     if portal not in loaded_portals]
+        # the endpoints of a portal are up to half a tile apart, so they are on its tile or on a tile next to it
+        screen_x, screen_y = screen
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                for portal in field.get_chunk((screen_x + dx, screen_y + dy)).portals:
+                    endpoints.extend((portal, endpoint) for endpoint in portal.get_endpoints()
+                                     if self.__get_screen(endpoint) == screen)
+        # the versions of the indexes change when elements of the screen are added or removed, by hand or when the
+        # tiles around the walker are loaded. the elements of a field never change, only the field can be replaced
+        return {"o": self.__make_obstacles_view(screen, obstacles),
+                "ov": (field, self.__obstacle_screens.get_version(screen)),
+                "p": self.__make_portals_view(screen, endpoints),
+                "pv": (field, self.__portal_screens.get_version(screen))}
+
+    @classmethod
+    def __make_obstacles_view(cls, screen: Cell, obstacles: list[Obstacle]) -> ScreenView:
+        """
+        builds the data of the obstacles that are located within one screen. it is built only when the obstacles
+        of the screen change, and is kept by the screen index until then.
 
-        # Add obstacles that are on the current screen
-        screen_obstacles = self.__get_obstacles_on_screen_locations(x_screen, y_screen)
-        ret.update({"o": screen_obstacles})
+        :param screen: The horizontal and vertical screen indexes.
+        :param obstacles: The obstacles on that screen.
+        :return: A read only dictionary for each obstacle on the screen, with keys for
+                 'location' (tuple of x, y coordinates on the screen) and 'size'.
+        """
+        return tuple(MappingProxyType({LOCATION_KEY: cls.__get_position_on_screen(obstacle.position, screen),
+                                       SIZE_KEY: obstacle.get_size()})
+                     for obstacle in obstacles)
 
-        screen_portals = self.__get_portals_on_screen_locations(x_screen, y_screen)
-        ret.update({"p": screen_portals})
+    @classmethod
+    def __make_portals_view(cls, screen: Cell, endpoints: list[tuple[Portal, Position]]) -> ScreenView:
+        """
+        builds the data of the portal endpoints that are located within one screen. it is built only when the
+        portals of the screen change, and is kept by the screen index until then.
 
-        return ret
+        :param screen: The horizontal and vertical screen indexes.
+        :param endpoints: The endpoints on that screen, each with its portal.
+        :return: A read only dictionary for each endpoint on the screen, detailing the 'location'
+                 (x, y coordinates on the screen) and 'size' of the portals.
+        """
+        return tuple(MappingProxyType({LOCATION_KEY: cls.__get_position_on_screen(endpoint, screen),
+                                       SIZE_KEY: portal.get_size()})
+                     for portal, endpoint in endpoints)
+
+    def get_walker_position(self) -> Position:
+        """public method to retrieve the position of the walker on the board"""
+        return self.__walker.get_position()
+
+    def get_obstacles(self) -> tuple[Obstacle, ...]:
+        """public method to retrieve the obstacles on the board, in the order they were added"""
+        return tuple(self.__obstacles)
+
+    def __get_loaded_obstacles(self) -> set[Obstacle]:
+        """returns the obstacles of the field tiles that are on the board now"""
+        return {obstacle for chunk in self.__field_tiles.values() for obstacle in chunk.obstacles}
+
+    def __get_loaded_portals(self) -> set[Portal]:
+        """returns the portals of the field tiles that are on the board now"""
+        return {portal for chunk in self.__field_tiles.values() for portal in chunk.portals}
+
+    def get_obstacle_at(self, position: Position) -> Optional[Obstacle]:
+        """
+        finds the obstacle that was added by hand whose center is at a position, with the obstacle index, so only
+        the obstacles near it are checked. the obstacles of the generated field are not found
+        :param position: the center of the obstacle
+        :return: the obstacle that was added first of the ones there, None if there is none
+        """
+        loaded_obstacles = self.__get_loaded_obstacles()
+        found = [obstacle for obstacle in self.__obstacle_index.query_point(position)
+                 if obstacle.position == position and obstacle not in loaded_obstacles]
+        if len(found) > 1:
+            return min(found, key=self.__obstacles.index)
+        return found[0] if found else None
+
+    def get_portal_at(self, endpoint1: Position, endpoint2: Position) -> Optional[Portal]:
+        """
+        finds the portal that was added by hand between two endpoints, in either direction, with the portal index.
+        the portals of the generated field are not found
+        :param endpoint1: one endpoint of the portal
+        :param endpoint2: the other endpoint
+        :return: the portal that was added first of the ones there, None if there is none
+        """
+        loaded_portals = self.__get_loaded_portals()
+        found = [(order, portal) for order, portal, endpoint in self.__portal_index.query_point(endpoint1)
+                 if endpoint == endpoint1 and set(portal.get_endpoints()) == {endpoint1, endpoint2}
+                 and portal not in loaded_portals]
+        return min(found, key=itemgetter(0))[1] if found else None
+
+    def has_portals(self) -> bool:
+        """checks if there are portals on the board"""
+        return bool(self.__portales)
+
+    def is_segment_blocked(self, src_position: Position, dst_position: Position) -> bool:
+        """
+        checks if a straight move, that does not go through portals, would be blocked by an obstacle
+        :param src_position: the beginning of the move
+        :param dst_position: the end of the move
+        :return: True if the move passes an obstacle
+        """
+        return self.__if_segment_passed_obstacle(src_position, dst_position) is not None
+
+    def set_recorder(self, recorder: Optional[TrajectoryRecorder]) -> None:
+        """
+        sets the recorder every step is appended to, None to stop recording. the board does not close it
+        :param recorder: the trajectory recorder
+        """
+        self.__recorder = recorder
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """
+        turns the counters and timers of the phases of every step on or off. turning them on starts them from zero
+        :param enabled: True to count and time the steps
+        """
+        self.__metrics = StepMetrics() if enabled else None
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        returns a snapshot of the counters and timers of the steps, see StepMetrics.snapshot. it is empty when
+        metrics are off
+        """
+        return self.__metrics.snapshot() if self.__metrics is not None else {}
+
+    def flush_statistics(self) -> None:
+        """writes the steps that the statistics keep in memory to the statistics file"""
+        self.__stats.flush()
 
-    def __get_obstacles_on_screen_locations(self, x_screen: int, y_screen: int) -> list[dict[str, Any]]:
-        """
-        Retrieves a list of obstacles that are located within the current screen bounds. The method calculates
-        the screen's boundaries based on the provided screen indexes and SCREEN_SIZE, then filters obstacles
-        that fall within these bounds. It returns a list of dictionaries detailing each obstacle's location
-        and size on the screen.
-
-        :param x_screen: The horizontal screen index.
-        :param y_screen: The vertical screen index.
-        :return: A list containing dictionaries for each obstacle visible on the current screen, with keys for
-                 'location' (tuple of x, y coordinates) and 'size'.
-        """
-        screen_obstacles = []
-        screen_x_start = x_screen * SCREEN_SIZE - SCREEN_SIZE / 2
-        screen_x_end = screen_x_start + SCREEN_SIZE
-        screen_y_start = y_screen * SCREEN_SIZE - SCREEN_SIZE / 2
-        screen_y_end = screen_y_start + SCREEN_SIZE
-
-        for obstacle in self.__obstacles:
-            obs_x = obstacle.position[X_INDEX]
-            obs_y = obstacle.position[Y_INDEX]
-            if screen_x_start <= obs_x < screen_x_end and screen_y_start <= obs_y < screen_y_end:
-                obs_x_on_screen = self.__get_location_on_screen(obs_x, x_screen)
-                obs_y_on_screen = self.__get_location_on_screen(obs_y, y_screen)
-                obstacle_dict = {"location": (obs_x_on_screen, obs_y_on_screen),
-                                 "size": obstacle.get_size()}
-                screen_obstacles.append(obstacle_dict)
-        return screen_obstacles
-
-    def __get_portals_on_screen_locations(self, x_screen: int, y_screen: int) -> list[dict[str, Any]]:
-        """
-        Retrieves a list of endpoints that are visible within the current screen boundaries. The method calculates
-        the boundaries using the provided screen indices and SCREEN_SIZE. It checks each endpoint of every portal
-        to see if it falls within these boundaries and returns a list of dictionaries with each portal's screen
-        location and size.
-
-        :param x_screen: The horizontal screen index indicating which screen section to check.
-        :param y_screen: The vertical screen index indicating which screen section to check.
-        :return: A list containing dictionaries for each visible portal, detailing the 'location' (x, y coordinates)
-                 and 'size' of the portals.
-        """
-        screen_portals = []
-        screen_x_start = x_screen * SCREEN_SIZE - SCREEN_SIZE / 2
-        screen_x_end = screen_x_start + SCREEN_SIZE
-        screen_y_start = y_screen * SCREEN_SIZE - SCREEN_SIZE / 2
-        screen_y_end = screen_y_start + SCREEN_SIZE
-
-        for portal in self.__portales:
-            for endp in portal.get_endpoints():
-                endp_x = endp[X_INDEX]
-                endp_y = endp[Y_INDEX]
-                if screen_x_start <= endp_x < screen_x_end and screen_y_start <= endp_y < screen_y_end:
-                    endp_x_on_screen = self.__get_location_on_screen(endp_x, x_screen)
-                    endp_y_on_screen = self.__get_location_on_screen(endp_y, y_screen)
-                    portal_data = {"location": (endp_x_on_screen, endp_y_on_screen),
-                                   "size": portal.get_size()}
-                    screen_portals.append(portal_data)
-        return screen_portals
+    def get_statistics(self) -> Statistics:
+        """public method to retrieve the statistics the board records its steps into"""
+        return self.__stats
 
     def set_walking_method(self, meathod: int) -> None:
         """public method to set the walking method of the walker"""
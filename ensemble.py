@@ -0,0 +1,131 @@
+import math
+from typing import Callable, Optional
+
+import numpy as np
+
+from walker import SIMPLE_WALK, RANDOM_SIZE_WALK, SQUARE_WALK, PREFERRED_WALK
+
+# same weights that Walker uses for the preferred walk
+BASE_PROBABILITY = 1
+PREFERRED_PROBABILITY = 10
+
+# index of each option in the preferred walk draw: a free angle, the 4 straight directions and the origin
+FREE_ANGLE_CHOICE = 0
+TOWARDS_ORIGIN_CHOICE = 5
+PREFERRED_WEIGHTS = np.array([BASE_PROBABILITY] + [PREFERRED_PROBABILITY] * 5, dtype=float)
+# cumulative weights, so a choice is drawn with one uniform number and a binary search
+PREFERRED_CUMULATIVE = np.cumsum(PREFERRED_WEIGHTS / PREFERRED_WEIGHTS.sum())[:-1]
+
+StepCallback = Callable[[int, np.ndarray, np.ndarray], None]
+
+
+class WalkerEnsemble:
+    """
+    Advances many independent walkers at once, keeping their positions in NumPy arrays instead of one
+    Walker object per walker. Every walking method of Walker is supported, with the same step distributions,
+    but each step is drawn for the whole ensemble in a few array operations.
+
+    The ensemble walks in free space: it knows nothing about obstacles and portals, which are handled by
+    the Board for a single walker.
+
+    Attributes:
+        __x (np.ndarray): The x-coordinates of all walkers.
+        __y (np.ndarray): The y-coordinates of all walkers.
+        __walking_method (int): The walking method shared by all walkers.
+        __rng (np.random.Generator): The random generator every step is drawn from. Giving a seeded one makes
+            the walk reproducible.
+    """
+    def __init__(self, walker_count: int, walking_method: int = SIMPLE_WALK,
+                 rng: Optional[np.random.Generator] = None):
+        if walker_count <= 0:
+            raise ValueError("Walker count must be positive")
+        self.__x: np.ndarray = np.zeros(walker_count)
+        self.__y: np.ndarray = np.zeros(walker_count)
+        self.__rng = rng if rng is not None else np.random.default_rng()
+        self.__walking_method = SIMPLE_WALK
+        self.set_walking_method(walking_method)
+
+    def walk(self) -> None:
+        """move every walker one step, according to the current walking method"""
+        if self.__walking_method == SIMPLE_WALK:
+            self.__simple_walk()
+        elif self.__walking_method == SQUARE_WALK:
+            self.__square_walk()
+        elif self.__walking_method == RANDOM_SIZE_WALK:
+            self.__random_size_walk()
+        elif self.__walking_method == PREFERRED_WALK:
+            self.__preferred_walk()
+
+    def run(self, steps: int, on_step: Optional[StepCallback] = None) -> None:
+        """
+        moves every walker the given number of steps
+        :param steps: how many steps to advance the ensemble
+        :param on_step: optional function called after every step with the step number (starting at 1)
+                        and the x and y arrays of the positions. the arrays are live, copy them to keep them
+        """
+        for step in range(1, steps + 1):
+            self.walk()
+            if on_step is not None:
+                on_step(step, self.__x, self.__y)
+
+    def __simple_walk(self) -> None:
+        """move every walker one step in any direction"""
+        angles = self.__rng.uniform(0, 2 * math.pi, self.size)
+        self.__x += np.cos(angles)
+        self.__y += np.sin(angles)
+
+    def __square_walk(self) -> None:
+        """move every walker one step in one of the 4 straight directions"""
+        on_x_axis = self.__rng.random(self.size) < 0.5
+        signs = self.__rng.integers(0, 2, self.size) * 2.0 - 1.0  # -1 or 1
+        self.__x += np.where(on_x_axis, signs, 0.0)
+        self.__y += np.where(on_x_axis, 0.0, signs)
+
+    def __random_size_walk(self) -> None:
+        """move every walker to any direction, a length between 0.5 to 1.5"""
+        angles = self.__rng.uniform(0, 2 * math.pi, self.size)
+        step_lengths = self.__rng.uniform(0.5, 1.5, self.size)
+        self.__x += np.cos(angles) * step_lengths
+        self.__y += np.sin(angles) * step_lengths
+
+    def __preferred_walk(self) -> None:
+        """move every walker one step to any direction, with a bigger probability for the
+        4 straight directions and for the direction towards the origin of that walker"""
+        choices = np.searchsorted(PREFERRED_CUMULATIVE, self.__rng.random(self.size), side='right')
+        free_angles = self.__rng.uniform(0, 2 * math.pi, self.size)
+        straight_angles = (choices - 1) * (math.pi / 2)  # right, up, left, down for choices 1 to 4
+        towards_origin = np.arctan2(-self.__y, -self.__x)
+
+        angles = np.where(choices == FREE_ANGLE_CHOICE, free_angles, straight_angles)
+        angles = np.where(choices == TOWARDS_ORIGIN_CHOICE, towards_origin, angles)
+        self.__x += np.cos(angles)
+        self.__y += np.sin(angles)
+
+    @property
+    def size(self) -> int:
+        """the number of walkers in the ensemble"""
+        return int(self.__x.shape[0])
+
+    def get_positions(self) -> np.ndarray:
+        """return a (size, 2) array with a copy of the positions of all walkers"""
+        return np.column_stack((self.__x, self.__y))
+
+    def get_distances(self) -> np.ndarray:
+        """return the distance of every walker from the origin"""
+        return np.hypot(self.__x, self.__y)
+
+    def reset(self) -> None:
+        """move all the walkers back to the origin"""
+        self.__x.fill(0)
+        self.__y.fill(0)
+
+    def walking_method(self) -> int:
+        """get the current walking method"""
+        return self.__walking_method
+
+    def set_walking_method(self, method: int) -> None:
+        """change the walking method of all walkers"""
+        if method in [SIMPLE_WALK, RANDOM_SIZE_WALK, SQUARE_WALK, PREFERRED_WALK]:
+            self.__walking_method = method
+        else:
+            raise ValueError("Invalid walking method")
@@ -0,0 +1,141 @@
+import argparse
+import json
+import time
+from typing import Any, Optional
+
+from board import *
+from random_streams import new_root_seed, run_seed_sequence, make_random
+
+CONFIG_PATH = "config.json"
+DEFAULT_STEPS = 1000
+DEFAULT_RUNS = 1
+
+
+def load_config(filename: str) -> Any:
+    """loads the configuration file, an empty configuration is used if the file does not exist"""
+    try:
+        with open(filename, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print("Configuration file not found. Using an empty configuration.")
+        return {}
+
+
+def build_board(config_path: str = CONFIG_PATH, statistics: Optional[Statistics] = None) -> Board:
+    """
+    builds a board with the obstacles, portals and walking method saved in the configuration file,
+    the same way the simulation window does, but without touching tkinter
+    :param config_path: the path of the configuration file
+    :param statistics: the statistics the board records into, the statistics file by default
+    :return: the loaded board
+    """
+    config = load_config(config_path)
+    board = Board(Walker(), statistics)
+    board.load_game_elements(config)
+    board.set_walking_method(int(config.get('walk_method', SIMPLE_WALK)))
+    return board
+
+
+def run_batch(board: Board, runs: int, steps: int, seed: Optional[int] = None, first_run: int = 0) -> int:
+    """
+    runs the simulation as fast as possible. every run starts from the origin and makes the given number of steps
+    :param board: the board to run on
+    :param runs: how many runs to make
+    :param steps: how many steps to make in every run
+    :param seed: the root seed of the job. when given, every run draws its steps from its own stream, picked by
+    its index in the job, and the seed is recorded in the statistics
+    :param first_run: the index in the job of the first run of this batch
+    :return: the number of steps that were made. a run stops early if the walker can't move
+    """
+    if seed is not None:
+        board.get_statistics().record_seed(seed, first_run, runs)
+    steps_done = 0
+    for run_index in range(first_run, first_run + runs):
+        board.reset_game(None if seed is None else make_random(run_seed_sequence(seed, run_index)))
+        for _ in range(steps):
+            if not board.do_move():
+                break
+            steps_done += 1
+    board.flush_statistics()
+    return steps_done
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+    """adds the arguments that make a job reproducible"""
+    parser.add_argument("--seed", type=int, help="the root seed of the job, a new one is drawn and printed if not given")
+    parser.add_argument("--first-run", type=int, default=0,
+                        help="the index of the first run, to replay or continue runs of a seeded job")
+
+
+def add_radii_argument(parser: argparse.ArgumentParser) -> None:
+    """adds the argument of the radii whose first passage steps are counted"""
+    parser.add_argument("--radii", type=float, nargs="+", default=DEFAULT_PASSAGE_RADII,
+                        help="the radii whose first passage steps are counted, 1 to 1000 log spaced by default")
+
+
+def check_radii(parser: argparse.ArgumentParser, args: argparse.Namespace, statistics: Statistics) -> None:
+    """
+    a statistics file that already exists keeps the radii it counts, so asking for other radii stops the job with
+    an error instead of being ignored
+    """
+    if args.radii is DEFAULT_PASSAGE_RADII:  # not given, whatever radii the file has are used
+        return
+    radii = statistics.get_passage_radii()
+    if not np.array_equal(np.sort(args.radii), radii):
+        parser.error(f"the statistics file counts the radii {radii.tolist()}, --radii can't change them. "
+                     f"use another file for other radii")
+
+
+def get_seed(args: argparse.Namespace) -> int:
+    """returns the seed given in the arguments, or draws a new one. it is printed so the job can be replayed"""
+    seed = args.seed if args.seed is not None else new_root_seed()
+    print(f"seed: {seed}")
+    return seed
+
+
+def print_report(steps_done: int, elapsed: float, statistics: Statistics) -> None:
+    """prints the throughput of a batch and the main numbers of the statistics"""
+    print(f"{steps_done} steps in {elapsed:.3f} seconds ({steps_done / max(elapsed, 1e-9):.1f} steps/sec)")
+    for key, value in statistics.summary().items():
+        print(f"{key}: {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the random walker simulator without a window")
+    parser.add_argument("--config", default=CONFIG_PATH, help="the configuration file to build the board from")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="number of steps in every run")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="number of runs, each starts at the origin")
+    add_seed_arguments(parser)
+    add_radii_argument(parser)
+    parser.add_argument("--record", help="a trajectory file to record every step into")
+    parser.add_argument("--metrics", help="a file to append the counters and timers of the steps to, a json line "
+                                          "every --metrics-interval seconds")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_DUMP_SECONDS,
+                        help="seconds between two dumps of the metrics")
+    args = parser.parse_args()
+    statistics = make_board_statistics(args.radii)
+    check_radii(parser, args, statistics)
+    seed = get_seed(args)
+
+    board = build_board(args.config, statistics)
+    recorder = TrajectoryRecorder(args.record) if args.record else None
+    board.set_recorder(recorder)
+    dumper = None
+    if args.metrics:
+        board.enable_metrics()
+        dumper = MetricsDumper(board.metrics, args.metrics, args.metrics_interval)
+        dumper.start()
+    start = time.perf_counter()
+    try:
+        steps_done = run_batch(board, args.runs, args.steps, seed, args.first_run)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if dumper is not None:
+            dumper.stop()
+    elapsed = time.perf_counter() - start
+    print_report(steps_done, elapsed, board.get_statistics())
+
+
+if __name__ == '__main__':
+    main()
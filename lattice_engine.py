@@ -0,0 +1,249 @@
+import argparse
+import math
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from headless import build_board, CONFIG_PATH, DEFAULT_STEPS
+from board import *
+
+# the moves of the square walk, as (dx, dy)
+SQUARE_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+INITIAL_HALF_SIZE = 64  # the first window covers the lattice points with |x|, |y| <= INITIAL_HALF_SIZE
+DISTANCE_FIELDS = ("average_distance", "average_x_axis", "average_y_axis")
+
+
+class LatticeEngine:
+    """
+    Computes the exact distribution of a square walk on a board, step by step, instead of sampling it. The square
+    walk moves 1 up, down, left or right with the same probability, so after k steps the walker is on a lattice
+    point with |x| + |y| <= k, and the probability of every point is propagated from the step before.
+
+    A move into an obstacle is drawn again by the board, so the probability of a point is split evenly between
+    the moves that are not blocked from it. The blocked moves are found with the same check the board uses. A
+    point that has no free move keeps its probability, the walker can't leave it. Portals move the walker off
+    the lattice, so boards with portals are not supported, and neither are generated fields, whose obstacles are only
+    known near the walker.
+
+    The probabilities are kept in a dense window around the origin that covers the points that can be reached,
+    and grows by doubling. Every step only works on the part of the window that the walk could reach so far.
+
+    For every radius of a set, the engine also propagates the probability of the walks that did not pass it yet,
+    inside that radius only, so the probability of passing it for the first time at every step is exact too.
+
+    Attributes:
+        __board (Board): The board whose obstacles block the moves.
+        __passage_radii (np.ndarray): The radii whose first passage probabilities are computed, in increasing order.
+        __steps (int): The number of steps that were propagated.
+        __half_size (int): The window covers the lattice points with |x|, |y| <= __half_size.
+        __probabilities (np.ndarray): The probability of every lattice point of the window, indexed
+            [x + __half_size, y + __half_size].
+        __stay (np.ndarray): The probability of staying on every point, 1 where all the moves are blocked.
+        __move_weights (list[np.ndarray]): For every move of SQUARE_MOVES, its probability from every point.
+        __distances (dict[str, np.ndarray]): The distance of every point for every field of DISTANCE_FIELDS.
+        __not_passed (list[Optional[np.ndarray]]): For every radius, the probability of every point inside it, of
+            the walks that did not pass it yet. Its window covers the points with |x|, |y| <= ceil(radius) + 1.
+            Until the walk can reach a radius, no walk passed it and it is None.
+        __columns (dict[str, list[float]]): The expected distances of every propagated step.
+        __first_passages (list[list[float]]): For every radius, the probability to pass it for the first time at
+            every propagated step.
+    """
+    def __init__(self, board: Board, passage_radii: Sequence[float] = DEFAULT_PASSAGE_RADII):
+        if board.get_walking_method() != SQUARE_WALK:
+            raise ValueError("Only the square walk moves on the lattice")
+        if board.has_portals():
+            raise ValueError("Portals move the walker off the lattice, boards with portals are not supported")
+        if board.get_field() is not None:
+            raise ValueError("The obstacles of generated fields are not known ahead, they are not supported")
+        self.__board = board
+        self.__passage_radii = np.array(sorted(passage_radii), dtype=np.float64)
+        self.__steps = 0
+        self.__half_size = 0
+        self.__probabilities = np.ones((1, 1))
+        self.__grow_window(INITIAL_HALF_SIZE)
+        self.__not_passed: list[Optional[np.ndarray]] = [None] * len(self.__passage_radii)
+        self.__columns: dict[str, list[float]] = {field: [] for field in DISTANCE_FIELDS}
+        self.__first_passages: list[list[float]] = [[] for _ in self.__passage_radii]
+
+    @property
+    def steps(self) -> int:
+        return self.__steps
+
+    def __grow_window(self, half_size: int) -> None:
+        """makes the window bigger, keeping the probabilities, and finds the blocked moves of all of it"""
+        old_half_size = self.__half_size
+        size = 2 * half_size + 1
+        probabilities = np.zeros((size, size))
+        offset = half_size - old_half_size
+        probabilities[offset:offset + 2 * old_half_size + 1, offset:offset + 2 * old_half_size + 1] = \
+            self.__probabilities
+        self.__probabilities = probabilities
+        self.__half_size = half_size
+
+        coordinates = np.arange(-half_size, half_size + 1, dtype=np.float64)
+        x, y = np.meshgrid(coordinates, coordinates, indexing='ij')
+        # the same distances Statistics records: from the origin, from the x axis and from the y axis
+        self.__distances = {"average_distance": np.sqrt(x * x + y * y), "average_x_axis": np.abs(y),
+                            "average_y_axis": np.abs(x)}
+
+        allowed = [np.ones((size, size)) for _ in SQUARE_MOVES]
+        for x_index, y_index, move_index in self.__find_blocked_moves():
+            allowed[move_index][x_index, y_index] = 0
+        allowed_count = np.count_nonzero(allowed, axis=0)  # the free moves from every point
+        self.__stay = (allowed_count == 0).astype(np.float64)
+        self.__move_weights = [np.divide(move_allowed, allowed_count, out=np.zeros((size, size)),
+                                         where=allowed_count > 0) for move_allowed in allowed]
+
+    def __find_blocked_moves(self) -> list[tuple[int, int, int]]:
+        """
+        finds the moves of the window that pass an obstacle. only the lattice points around every obstacle are
+        checked, with the check of the board
+        :return: the window indexes of the point and the index of the move in SQUARE_MOVES of every blocked move
+        """
+        half_size = self.__half_size
+        checked: set[tuple[int, int]] = set()
+        blocked = []
+        for obstacle in self.__board.get_obstacles():
+            center_x, center_y = obstacle.position
+            reach = obstacle.get_size() + 1  # a move that starts further than this can't reach the obstacle
+            for x in range(max(math.floor(center_x - reach), -half_size),
+                           min(math.ceil(center_x + reach), half_size) + 1):
+                for y in range(max(math.floor(center_y - reach), -half_size),
+                               min(math.ceil(center_y + reach), half_size) + 1):
+                    if (x, y) in checked:
+                        continue
+                    checked.add((x, y))
+                    for move_index, (dx, dy) in enumerate(SQUARE_MOVES):
+                        if self.__board.is_segment_blocked((x, y), (x + dx, y + dy)):
+                            blocked.append((x + half_size, y + half_size, move_index))
+        return blocked
+
+    def __spread(self, probabilities: np.ndarray, half_size: int) -> np.ndarray:
+        """
+        makes one step of the walk
+        :param probabilities: the probabilities of the points with |x|, |y| <= half_size. the points on the edge
+        must have no probability, so no move leaves the array
+        :param half_size: the half size of the array
+        :return: the probabilities after the step, an array of the same shape
+        """
+        window = slice(self.__half_size - half_size, self.__half_size + half_size + 1)
+        spread = probabilities * self.__stay[window, window]
+        for (dx, dy), weights in zip(SQUARE_MOVES, self.__move_weights):
+            moved = probabilities * weights[window, window]
+            if dx == 1:
+                spread[1:, :] += moved[:-1, :]
+            elif dx == -1:
+                spread[:-1, :] += moved[1:, :]
+            elif dy == 1:
+                spread[:, 1:] += moved[:, :-1]
+            else:
+                spread[:, :-1] += moved[:, 1:]
+        return spread
+
+    def step(self) -> None:
+        """propagates the probabilities by one step, and records the expected distances and the first passages"""
+        reach = self.__steps + 1  # after this step, the walk is on points with |x|, |y| <= reach
+        if reach + 1 > self.__half_size:
+            self.__grow_window(2 * self.__half_size)
+
+        for radius_index, radius in enumerate(self.__passage_radii):
+            self.__step_not_passed(radius_index, radius, reach)
+
+        window = slice(self.__half_size - reach - 1, self.__half_size + reach + 2)
+        probabilities = self.__spread(self.__probabilities[window, window], reach + 1)
+        self.__probabilities[window, window] = probabilities
+        for field in DISTANCE_FIELDS:
+            self.__columns[field].append(float((probabilities * self.__distances[field][window, window]).sum()))
+
+        self.__steps += 1
+
+    def __step_not_passed(self, radius_index: int, radius: float, reach: int) -> None:
+        """
+        propagates the walks that did not pass a radius by one step, and records the probability to pass it now.
+        has to be called before the step of the whole distribution
+        """
+        first_passages = self.__first_passages[radius_index]
+        not_passed = self.__not_passed[radius_index]
+        if not_passed is None:
+            if reach < radius:
+                first_passages.append(0.0)  # the walk can't get this far yet
+                return
+            # until now no walk passed the radius, so the walks that did not pass it are all the walks
+            radius_half_size = math.ceil(radius) + 1
+            not_passed = np.zeros((2 * radius_half_size + 1, 2 * radius_half_size + 1))
+            main_window = slice(self.__half_size - radius_half_size, self.__half_size + radius_half_size + 1)
+            not_passed[:, :] = self.__probabilities[main_window, main_window]
+            self.__not_passed[radius_index] = not_passed
+
+        radius_half_size = (len(not_passed) - 1) // 2
+        half_size = min(reach + 1, radius_half_size)
+        radius_window = slice(radius_half_size - half_size, radius_half_size + half_size + 1)
+        window = slice(self.__half_size - half_size, self.__half_size + half_size + 1)
+        spread = self.__spread(not_passed[radius_window, radius_window], half_size)
+        passed = self.__distances["average_distance"][window, window] >= radius
+        first_passages.append(float(spread[passed].sum()))
+        spread[passed] = 0
+        not_passed[radius_window, radius_window] = spread
+
+    def run(self, steps: int) -> None:
+        """propagates the given number of steps"""
+        for _ in range(steps):
+            self.step()
+
+    def get_distribution(self) -> tuple[np.ndarray, int]:
+        """
+        returns the probability of every lattice point after the propagated steps
+        :return: a read only view of the probabilities indexed [x + offset, y + offset], and the offset
+        """
+        probabilities = self.__probabilities.view()
+        probabilities.flags.writeable = False
+        return probabilities, self.__half_size
+
+    def get_column(self, field: str) -> np.ndarray:
+        """
+        returns the exact expected value of a distance at every propagated step, the value Statistics estimates
+        :param field: one of DISTANCE_FIELDS
+        :return: the expected values, index i holds step i + 1
+        """
+        return np.array(self.__columns[field])
+
+    def get_passage_radii(self) -> np.ndarray:
+        """returns the radii whose first passage probabilities are computed, in increasing order"""
+        return self.__passage_radii
+
+    def get_first_passage_probability(self, radius_index: int) -> np.ndarray:
+        """
+        returns the probability to pass a radius for the first time at every propagated step
+        :param radius_index: the index of the radius in get_passage_radii()
+        :return: the probabilities, index i holds step i + 1
+        """
+        return np.array(self.__first_passages[radius_index])
+
+    def get_passage_probability(self, radius_index: int) -> np.ndarray:
+        """returns the probability to have passed a radius by every propagated step, what
+        Statistics.get_passage_probability estimates"""
+        return np.cumsum(self.get_first_passage_probability(radius_index))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute the exact statistics of the square walk on a board")
+    parser.add_argument("--config", default=CONFIG_PATH, help="the configuration file to build the board from")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="number of steps to propagate")
+    args = parser.parse_args()
+
+    board = build_board(args.config, Statistics(None))
+    board.set_walking_method(SQUARE_WALK)  # the obstacles of the configuration, whatever walk it is set to
+
+    start = time.perf_counter()
+    engine = LatticeEngine(board)
+    engine.run(args.steps)
+    print(f"{args.steps} steps propagated in {time.perf_counter() - start:.3f} seconds")
+    for field in DISTANCE_FIELDS:
+        print(f"{field}: {engine.get_column(field)[-1]}")
+    for index, radius in enumerate(engine.get_passage_radii().tolist()):
+        print(f"passage_probability of radius {radius}: {engine.get_passage_probability(index)[-1]}")
+
+
+if __name__ == '__main__':
+    main()
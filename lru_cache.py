@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+Value = TypeVar('Value')
+
+
+class LRUCache(Generic[Value]):
+    """
+    Keeps the values that were already made, so a value that is expensive to make is made only the first time it is
+    needed. When the cache is full, the value that was used least recently is dropped, so the cache holds a bounded
+    number of values however many keys are asked for.
+
+    Attributes:
+        __capacity (int): The number of values the cache keeps at most.
+        __values (OrderedDict): The values by their key, from the least to the most recently used.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.__capacity = capacity
+        self.__values: OrderedDict[Hashable, Value] = OrderedDict()
+
+    def get(self, key: Hashable, make_value: Callable[[], Value]) -> Value:
+        """
+        returns the value of the given key, and makes it if it is not in the cache
+        :param key: identifies the value
+        :param make_value: makes the value, called only when the value is not in the cache
+        :return: the value
+        """
+        value = self.__values.get(key)
+        if value is not None:
+            self.__values.move_to_end(key)
+            return value
+        value = make_value()
+        self.__values[key] = value
+        if len(self.__values) > self.__capacity:
+            self.__values.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """drops all the values"""
+        self.__values.clear()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__values
@@ -1,7 +1,15 @@
+import argparse
+
 import simulation
 
 
 # Create an instance of the Simulation class and show the window
 if __name__ == '__main__':
-    sim = simulation.Simulation()
+    parser = argparse.ArgumentParser(description="Random walker simulator")
+    parser.add_argument("--replay", help="a recorded trajectory file to play back instead of simulating")
+    parser.add_argument("--frame-skip", type=int, default=1, help="when playing back, steps to move on every frame")
+    parser.add_argument("--seek", type=int, default=0, help="when playing back, the step to start from")
+    args = parser.parse_args()
+
+    sim = simulation.Simulation(args.replay, args.frame_skip, args.seek)
     sim.show()
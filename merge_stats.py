@@ -0,0 +1,56 @@
+import argparse
+import os
+
+from statistics import Statistics
+
+LEGACY_SUFFIX = ".json"
+
+
+def load_statistics(path: str) -> Statistics:
+    """loads a statistics file into memory only, a .json file is read as the legacy format"""
+    if path.endswith(LEGACY_SUFFIX):
+        return Statistics(None, legacy_file_path=path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Statistics file not found: {path}")
+    statistics = Statistics(path)
+    statistics.file_path = None  # never write back to an input
+    return statistics
+
+
+def merge_files(output_path: str, input_paths: list[str], append: bool = False) -> Statistics:
+    """
+    folds statistics files, for example of different machines, into one file
+    :param output_path: the file to save the merged statistics to
+    :param input_paths: the files to merge, in order
+    :param append: if True and the output file exists, the inputs are merged into it instead of replacing it
+    :return: the merged statistics. they count the first passages of the radii of the output file when appending
+    to it, otherwise of the radii of the first input
+    """
+    merged = Statistics(output_path) if append and os.path.exists(output_path) else None
+    for path in input_paths:
+        statistics = load_statistics(path)
+        if merged is None:
+            merged = Statistics(None, passage_radii=statistics.get_passage_radii().tolist())
+        merged.merge(statistics)
+    if merged is None:
+        merged = Statistics(None)
+    merged.file_path = output_path
+    merged.save_data()
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge statistics files of the random walker simulator into one")
+    parser.add_argument("output", help="the statistics file to write")
+    parser.add_argument("inputs", nargs="+", help="the statistics files to merge, .npz or legacy .json")
+    parser.add_argument("--append", action="store_true", help="merge into the output file if it already exists")
+    args = parser.parse_args()
+
+    merged = merge_files(args.output, args.inputs, args.append)
+    print(f"Merged {len(args.inputs)} files into {args.output}")
+    for key, value in merged.summary().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Optional
+
+WALK_PHASE = "walk"  # drawing the step of the walker
+PORTALS_PHASE = "portals"  # cutting the step where it goes through portals
+OBSTACLES_PHASE = "obstacles"  # checking the cut step against the obstacles
+STATISTICS_PHASE = "statistics"  # recording the step, with the writes of the statistics file
+RECORDER_PHASE = "recorder"  # appending the step to the trajectory file
+PHASES = (WALK_PHASE, PORTALS_PHASE, OBSTACLES_PHASE, STATISTICS_PHASE, RECORDER_PHASE)
+DEFAULT_DUMP_SECONDS = 5.0
+
+
+class StepMetrics:
+    """
+    Counters and timers of the phases of the steps of a board. Every phase keeps how many times it ran, its total
+    time and its slowest time, so a phase that is slow every time is told apart from one with rare spikes, like the
+    writes of the statistics file.
+
+    The timers use a lap clock: start() reads the clock, and every lap() records the time since the previous reading
+    under a phase and returns the new reading, so every phase costs one clock reading.
+
+    Attributes:
+        steps (int): The steps that were made.
+        failed_steps (int): The steps that were given up on, because the walker couldn't move.
+        obstacle_retries (int): The times a step was drawn again because it passed an obstacle.
+        portal_hop_retries (int): The times a step was drawn again because it went through too many portals.
+        portal_steps (int): The steps that went through at least one portal.
+        __counts (dict[str, int]): The times every phase ran.
+        __total_ns (dict[str, int]): The total time of every phase, in nanoseconds.
+        __max_ns (dict[str, int]): The slowest time of every phase, in nanoseconds.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """clears all the counters and timers"""
+        self.steps = 0
+        self.failed_steps = 0
+        self.obstacle_retries = 0
+        self.portal_hop_retries = 0
+        self.portal_steps = 0
+        self.__counts = dict.fromkeys(PHASES, 0)
+        self.__total_ns = dict.fromkeys(PHASES, 0)
+        self.__max_ns = dict.fromkeys(PHASES, 0)
+
+    @staticmethod
+    def start() -> int:
+        """reads the clock before the first phase"""
+        return time.perf_counter_ns()
+
+    def lap(self, phase: str, since: int) -> int:
+        """
+        records the time of a phase
+        :param phase: one of PHASES
+        :param since: the clock reading when the phase began
+        :return: the clock reading now, when the next phase begins
+        """
+        now = time.perf_counter_ns()
+        elapsed = now - since
+        self.__counts[phase] += 1
+        self.__total_ns[phase] += elapsed
+        if elapsed > self.__max_ns[phase]:
+            self.__max_ns[phase] = elapsed
+        return now
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        returns a copy of the counters and timers that can be saved as json. for every phase, its share is the part
+        of the time of all the phases it took
+        """
+        all_ns = sum(self.__total_ns.values())
+        phases = {phase: {"count": self.__counts[phase], "total_ns": self.__total_ns[phase],
+                          "mean_ns": self.__total_ns[phase] / self.__counts[phase] if self.__counts[phase] else 0.0,
+                          "max_ns": self.__max_ns[phase],
+                          "share": self.__total_ns[phase] / all_ns if all_ns else 0.0}
+                  for phase in PHASES}
+        return {"steps": self.steps, "failed_steps": self.failed_steps, "obstacle_retries": self.obstacle_retries,
+                "portal_hop_retries": self.portal_hop_retries, "portal_steps": self.portal_steps, "phases": phases}
+
+
+class MetricsDumper:
+    """
+    Appends snapshots of metrics to a file, one json line for each, with the time it was taken. It can dump on
+    demand, or every so many seconds from a thread of its own.
+
+    Attributes:
+        __source (Callable[[], dict[str, Any]]): Returns the snapshot to dump, for example Board.metrics.
+        __path (str): The file the snapshots are appended to.
+        __interval (float): The seconds between two dumps of the thread.
+        __stop_event (threading.Event): Set to stop the thread.
+        __thread (Optional[threading.Thread]): The thread, None when it was not started.
+    """
+    def __init__(self, source: Callable[[], dict[str, Any]], path: str, interval: float = DEFAULT_DUMP_SECONDS):
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self.__source = source
+        self.__path = path
+        self.__interval = interval
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def dump(self) -> None:
+        """appends one snapshot to the file"""
+        line = json.dumps({"time": time.time(), **self.__source()})
+        with open(self.__path, 'a') as file:
+            file.write(line + "\n")
+
+    def start(self) -> None:
+        """starts dumping every interval on a thread"""
+        self.__thread = threading.Thread(target=self.__run, name="metrics-dumper", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """stops the thread, and dumps the last snapshot"""
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.dump()
+
+    def __run(self) -> None:
+        while not self.__stop_event.wait(self.__interval):
+            self.dump()
@@ -1,4 +1,6 @@
-from board import Position
+from walker import Position
+
+DEAFULT_OBSTICLE_SIZE = 0.2
 
 class Obstacle:
     """
@@ -8,7 +10,7 @@ class Obstacle:
     The position is defined in the coordinate space of the simulation,
     and the size determines its scale relative to other elements.
     """
-    def __init__(self, x: float = 0.0, y: float = 0.0, size: float = 0.2):
+    def __init__(self, x: float = 0.0, y: float = 0.0, size: float = DEAFULT_OBSTICLE_SIZE):
         self.__x = x
         self.__y = y
         self.__size = size
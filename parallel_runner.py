@@ -0,0 +1,91 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from board import STATISTICS_FILE_PATH, LEGACY_STATISTICS_FILE_PATH
+from headless import CONFIG_PATH, DEFAULT_STEPS, DEFAULT_RUNS, build_board, run_batch, add_seed_arguments, \
+    add_radii_argument, check_radii, get_seed, print_report
+from statistics import Statistics, DEFAULT_PASSAGE_RADII
+
+
+def split_runs(runs: int, workers: int) -> list[int]:
+    """splits the runs between the workers as evenly as possible, workers that get no runs are left out"""
+    shares = [runs // workers + (1 if i < runs % workers else 0) for i in range(workers)]
+    return [share for share in shares if share > 0]
+
+
+def run_shard(config_path: str, runs: int, steps: int, seed: Optional[int] = None, first_run: int = 0,
+              passage_radii: Sequence[float] = DEFAULT_PASSAGE_RADII) -> tuple[int, Statistics]:
+    """
+    the work of one worker process: builds its own board from the configuration file and makes its runs,
+    recording them into statistics that are kept in memory
+    :param config_path: the path of the configuration file
+    :param runs: how many runs to make
+    :param steps: how many steps to make in every run
+    :param seed: the root seed of the whole job
+    :param first_run: the index in the whole job of the first run of this shard
+    :param passage_radii: the radii whose first passage steps are counted
+    :return: the number of steps that were made, and the statistics of the runs
+    """
+    statistics = Statistics(None, track_quantiles=True, passage_radii=passage_radii)
+    board = build_board(config_path, statistics)
+    steps_done = run_batch(board, runs, steps, seed, first_run)
+    return steps_done, statistics
+
+
+def run_parallel(config_path: str, runs: int, steps: int, workers: int,
+                 statistics: Statistics, seed: Optional[int] = None, first_run: int = 0) -> int:
+    """
+    splits independent runs between worker processes, and merges the statistics of all of them into the given
+    statistics. the workers are merged in a fixed order, so the result does not depend on which finished first.
+    the workers count the first passages of the radii of the given statistics.
+    with a seed, every run uses the stream of its index in the whole job, so the results do not depend on the
+    number of workers either
+    :param config_path: the path of the configuration file every worker builds its board from
+    :param runs: how many runs to make in total
+    :param steps: how many steps to make in every run
+    :param workers: how many worker processes to use
+    :param statistics: the statistics to merge the results into
+    :param seed: the root seed of the job
+    :param first_run: the index of the first run of the job
+    :return: the number of steps that were made by all the workers
+    """
+    shards = split_runs(runs, workers)
+    shard_starts = [first_run + sum(shards[:i]) for i in range(len(shards))]
+    passage_radii = statistics.get_passage_radii().tolist()
+    steps_done = 0
+    with ProcessPoolExecutor(max_workers=len(shards) or 1) as pool:
+        futures = [pool.submit(run_shard, config_path, shard_runs, steps, seed, shard_start, passage_radii)
+                   for shard_runs, shard_start in zip(shards, shard_starts)]
+        for future in futures:
+            shard_steps, shard_statistics = future.result()
+            steps_done += shard_steps
+            statistics.merge(shard_statistics)
+    return steps_done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the random walker simulator on several processes")
+    parser.add_argument("--config", default=CONFIG_PATH, help="the configuration file to build the board from")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="number of steps in every run")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="number of runs, each starts at the origin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--output", default=STATISTICS_FILE_PATH, help="the statistics file to merge the results into")
+    add_seed_arguments(parser)
+    add_radii_argument(parser)
+    args = parser.parse_args()
+    statistics = Statistics(args.output, legacy_file_path=LEGACY_STATISTICS_FILE_PATH, passage_radii=args.radii)
+    check_radii(parser, args, statistics)
+    seed = get_seed(args)
+
+    start = time.perf_counter()
+    steps_done = run_parallel(args.config, args.runs, args.steps, args.workers, statistics, seed, args.first_run)
+    statistics.flush()
+    elapsed = time.perf_counter() - start
+    print_report(steps_done, elapsed, statistics)
+
+
+if __name__ == '__main__':
+    main()
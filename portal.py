@@ -1,7 +1,7 @@
-DEAFULT_PORTAL_SIZE = 0.3
-
 from walker import Position
 
+DEAFULT_PORTAL_SIZE = 0.3
+
 class Portal:
     """
     Represents a portal in the simulation environment. Portals connect two distinct endpoints, allowing for
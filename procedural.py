@@ -0,0 +1,93 @@
+import math
+from typing import Any, Mapping, NamedTuple
+
+from obstacle import Obstacle, DEAFULT_OBSTICLE_SIZE
+from portal import Portal, DEAFULT_PORTAL_SIZE
+from random_streams import tile_seed_sequence, make_generator
+from lru_cache import LRUCache
+from walker import Position
+
+DEFAULT_OBSTACLE_DENSITY = 0.05  # obstacles per square unit
+DEFAULT_PORTAL_DENSITY = 0.005  # portals per square unit
+DEFAULT_CACHE_TILES = 256
+CLEAR_RADIUS = 2.0  # nothing is placed this close to the origin, so the walker can always start
+
+
+class FieldChunk(NamedTuple):
+    """the obstacles and the portals that were generated for one tile"""
+    obstacles: tuple[Obstacle, ...]
+    portals: tuple[Portal, ...]
+
+
+class ProceduralField:
+    """
+    An endless field of obstacles and portals, made one tile at a time. The elements of a tile depend only on the
+    seed of the field, the index of the tile and the densities, so a tile looks the same every time the walker gets
+    there, in any run and in any process. Tile (i, j) covers the points whose x is within tile_size / 2 of
+    i * tile_size, and whose y is within tile_size / 2 of j * tile_size, the way screens cover the board.
+
+    The number of obstacles and of portals of a tile is drawn from a poisson distribution with the densities, and
+    they are placed uniformly in the tile. The first endpoint of a portal is in its tile, and the second is up to
+    half a tile away from it. The tiles that were made last are kept in an LRU cache, so a walker that goes back
+    and forth over the border of two tiles doesn't make them again, and the memory stays bounded however far it
+    goes.
+
+    Attributes:
+        seed (int): The seed of the field.
+        obstacle_density (float): The average number of obstacles per square unit.
+        portal_density (float): The average number of portals per square unit.
+        tile_size (float): The length of the side of a tile.
+        __chunks (LRUCache[FieldChunk]): The tiles that were made last, by their index.
+    """
+    def __init__(self, seed: int, tile_size: float, obstacle_density: float = DEFAULT_OBSTACLE_DENSITY,
+                 portal_density: float = DEFAULT_PORTAL_DENSITY, cache_tiles: int = DEFAULT_CACHE_TILES):
+        if obstacle_density < 0 or portal_density < 0:
+            raise ValueError("Densities can't be negative")
+        self.seed = seed
+        self.obstacle_density = obstacle_density
+        self.portal_density = portal_density
+        self.tile_size = tile_size
+        self.__chunks: LRUCache[FieldChunk] = LRUCache(cache_tiles)
+
+    @classmethod
+    def from_config(cls, field_data: Mapping[str, Any], tile_size: float) -> "ProceduralField":
+        """makes a field from the "procedural" part of the configuration file, every key but the seed is optional"""
+        return cls(int(field_data['seed']), tile_size,
+                   float(field_data.get('obstacle_density', DEFAULT_OBSTACLE_DENSITY)),
+                   float(field_data.get('portal_density', DEFAULT_PORTAL_DENSITY)),
+                   int(field_data.get('cache_tiles', DEFAULT_CACHE_TILES)))
+
+    def get_chunk(self, tile: tuple[int, int]) -> FieldChunk:
+        """
+        returns the elements of a tile, from the cache if it was made lately
+        :param tile: the horizontal and vertical indexes of the tile
+        :return: the obstacles and the portals of the tile
+        """
+        return self.__chunks.get(tile, lambda: self.__make_chunk(tile))
+
+    def __make_chunk(self, tile: tuple[int, int]) -> FieldChunk:
+        """generates the elements of a tile from its own random stream"""
+        generator = make_generator(tile_seed_sequence(self.seed, tile))
+        area = self.tile_size * self.tile_size
+        low_x, low_y = (index * self.tile_size - self.tile_size / 2 for index in tile)
+
+        obstacle_count = generator.poisson(self.obstacle_density * area)
+        centers = generator.uniform(0, self.tile_size, (obstacle_count, 2)) + (low_x, low_y)
+        obstacles = tuple(Obstacle(x, y, DEAFULT_OBSTICLE_SIZE) for x, y in centers.tolist()
+                          if self.__is_clear((x, y), DEAFULT_OBSTICLE_SIZE))
+
+        portal_count = generator.poisson(self.portal_density * area)
+        entries = generator.uniform(0, self.tile_size, (portal_count, 2)) + (low_x, low_y)
+        angles = generator.uniform(0, 2 * math.pi, portal_count)
+        lengths = generator.uniform(0, self.tile_size / 2, portal_count)
+        portals = []
+        for (x, y), angle, length in zip(entries.tolist(), angles.tolist(), lengths.tolist()):
+            exit_position = (x + length * math.cos(angle), y + length * math.sin(angle))
+            if self.__is_clear((x, y), DEAFULT_PORTAL_SIZE) and self.__is_clear(exit_position, DEAFULT_PORTAL_SIZE):
+                portals.append(Portal((x, y), exit_position, DEAFULT_PORTAL_SIZE))
+        return FieldChunk(obstacles, tuple(portals))
+
+    @staticmethod
+    def __is_clear(position: Position, size: float) -> bool:
+        """checks that an element placed there does not reach the clear area around the origin"""
+        return math.hypot(*position) > CLEAR_RADIUS + size
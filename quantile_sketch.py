@@ -0,0 +1,101 @@
+import math
+from typing import Any, Mapping
+
+DEFAULT_RELATIVE_ACCURACY = 0.01  # a quantile is estimated within 1% of its true value
+DEFAULT_MAX_BUCKETS = 2048
+
+
+class QuantileSketch:
+    """
+    A streaming sketch of the quantiles of positive values, with logarithmic buckets in the way of DDSketch: a value
+    x is counted in bucket ceil(log(x) / log(gamma)), where gamma = (1 + a) / (1 - a) for a relative accuracy a, and
+    every quantile is then estimated within a relative error of a. Zero is counted on its own.
+
+    Unlike P² or t-digest, two sketches of the same accuracy are merged exactly by adding their bucket counts, so
+    sketches of different runs, processes or machines can be reduced in any order. The memory is bounded by
+    max_buckets: when there are more buckets, the lowest ones are collapsed into one, which keeps the upper
+    quantiles accurate.
+
+    Attributes:
+        relative_accuracy (float): The relative error every quantile is estimated within.
+        max_buckets (int): The number of buckets the sketch keeps at most.
+        count (int): The number of values that were added.
+        zero_count (int): The number of values that were zero.
+        __buckets (dict[int, int]): The number of values in every bucket, by its index.
+    """
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.__log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.count = 0
+        self.zero_count = 0
+        self.__buckets: dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """adds one value, values must not be negative"""
+        if value < 0:
+            raise ValueError("Only values that are not negative can be added")
+        self.count += 1
+        if value == 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.__log_gamma)
+        self.__buckets[index] = self.__buckets.get(index, 0) + 1
+        if len(self.__buckets) > self.max_buckets:
+            self.__collapse()
+
+    def __collapse(self) -> None:
+        """folds the lowest buckets into one, until there are max_buckets"""
+        indexes = sorted(self.__buckets)
+        extra = len(indexes) - self.max_buckets + 1
+        folded = sum(self.__buckets.pop(index) for index in indexes[:extra])
+        self.__buckets[indexes[extra]] += folded
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """adds the values of another sketch into this one, the other sketch is not changed"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can't merge sketches of different accuracies")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, bucket_count in other.__buckets.items():
+            self.__buckets[index] = self.__buckets.get(index, 0) + bucket_count
+        if len(self.__buckets) > self.max_buckets:
+            self.__collapse()
+
+    def quantile(self, q: float) -> float:
+        """
+        estimates a quantile of the values that were added
+        :param q: the quantile, between 0 and 1, for example 0.5 for the median
+        :return: the estimate, or nan if no value was added
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        index = 0
+        for index in sorted(self.__buckets):
+            seen += self.__buckets[index]
+            if seen > rank:
+                break
+        # the middle of the bucket in relative terms, which is within the accuracy of all of it
+        return 2 * math.exp(index * self.__log_gamma) / (1 + math.exp(self.__log_gamma))
+
+    def to_dict(self) -> dict[str, Any]:
+        """the json form of the sketch"""
+        return {"relative_accuracy": self.relative_accuracy, "max_buckets": self.max_buckets, "count": self.count,
+                "zero_count": self.zero_count, "buckets": {str(index): n for index, n in self.__buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "QuantileSketch":
+        """reads a sketch saved by to_dict"""
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.count = data["count"]
+        sketch.zero_count = data["zero_count"]
+        sketch.__buckets = {int(index): n for index, n in data["buckets"].items()}
+        return sketch
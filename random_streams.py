@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+STATE_WORDS = 4  # 128 bits of state taken from a seed sequence to seed a python generator
+TILE_STREAM = 1  # the first word of the spawn key of a tile, its keys are longer than run keys so they never meet
+
+
+def new_root_seed() -> int:
+    """
+    draws a fresh root seed from the operating system's entropy, to be printed or saved for replaying. the seed is
+    the entropy of a new seed sequence, so SeedSequence(seed) is exactly the sequence that was drawn, and the runs
+    seeded from it can be made again from the printed number alone
+    """
+    entropy = np.random.SeedSequence().entropy
+    if not isinstance(entropy, int):  # a sequence made without entropy always draws a single int
+        raise TypeError(f"Unexpected seed sequence entropy: {entropy!r}")
+    return entropy
+
+
+def run_seed_sequence(root_seed: int, run_index: int) -> np.random.SeedSequence:
+    """
+    returns the seed sequence of one run. it is the same child that SeedSequence(root_seed).spawn would give
+    as its run_index'th one, so every run has its own independent stream no matter which process makes it,
+    and any run can be replayed alone from the root seed and its index
+    :param root_seed: the seed of the whole job
+    :param run_index: the index of the run in the job
+    :return: the seed sequence of the run
+    """
+    return np.random.SeedSequence(root_seed, spawn_key=(run_index,))
+
+
+def tile_seed_sequence(root_seed: int, tile: tuple[int, int]) -> np.random.SeedSequence:
+    """
+    returns the seed sequence of one tile of a generated field, so every tile is made the same way every time,
+    whatever order the tiles are visited in
+    :param root_seed: the seed of the field
+    :param tile: the horizontal and vertical indexes of the tile
+    :return: the seed sequence of the tile
+    """
+    # spawn keys can't be negative, so the indexes are folded to 0, -1, 1, -2, 2... -> 0, 1, 2, 3, 4...
+    x, y = (2 * index if index >= 0 else -2 * index - 1 for index in tile)
+    return np.random.SeedSequence(root_seed, spawn_key=(TILE_STREAM, x, y))
+
+
+def make_random(seed_sequence: np.random.SeedSequence) -> random.Random:
+    """returns a python random generator seeded from the seed sequence, for the Walker"""
+    state = seed_sequence.generate_state(STATE_WORDS, np.uint32)
+    return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+
+def make_generator(seed_sequence: np.random.SeedSequence) -> np.random.Generator:
+    """returns a numpy random generator seeded from the seed sequence, for the WalkerEnsemble"""
+    return np.random.default_rng(seed_sequence)
@@ -0,0 +1,159 @@
+import multiprocessing
+import queue
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from statistics import Statistics
+
+GRAPH_SIZE = (15, 5)  # inches
+DEFAULT_GRAPH_POINTS = 2000  # the points every line is decimated to, more than a graph of this size can show
+PROGRESS_MESSAGE = "progress"
+DONE_MESSAGE = "done"
+ERROR_MESSAGE = "error"
+
+# reports how far a graph got: the part that is done, between 0 and 1, and what is done now
+ProgressCallback = Callable[[float, str], None]
+
+
+def decimate(values: np.ndarray, max_points: int = DEFAULT_GRAPH_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    picks at most max_points of a series that look like all of it when drawn as a line, with the largest triangle
+    three buckets method (LTTB): the first and the last points are kept, the rest is split into equal buckets, and
+    from every bucket the point that makes the largest triangle with the point picked before it and the average of
+    the next bucket is kept. spikes are kept, unlike with a plain stride
+    :param values: the series, a value per index
+    :param max_points: the number of points to keep, at least 3
+    :return: the indexes of the kept points, and their values
+    """
+    if max_points < 3:
+        raise ValueError("At least 3 points have to be kept")
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count), values
+    # the edges of the buckets between the first and the last point, every bucket has at least one point
+    edges = np.linspace(1, count - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (count - 1, count)
+        average_x = (next_start + next_end - 1) / 2
+        average_y = values[next_start:next_end].mean()
+        previous_y = values[previous]
+        candidates = np.arange(start, end)
+        areas = np.abs((previous - average_x) * (values[start:end] - previous_y) -
+                       (previous - candidates) * (average_y - previous_y))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected, values[selected]
+
+
+def make_graph(statistics: Statistics, path: str, max_points: int = DEFAULT_GRAPH_POINTS,
+               progress: Optional[ProgressCallback] = None) -> None:
+    """
+    draws the average distances and the y axis crossings of every step, and saves them as an image
+    matplotlib is imported only here, the first time a graph is made, so importing the simulation stays fast. the
+    figure is drawn without pyplot, so no gui backend is loaded and nothing is shown
+    :param statistics: the statistics to draw
+    :param path: the image file to save, its type is taken from its extension
+    :param max_points: every line is decimated to this many points, see decimate
+    :param progress: called as the graph is made
+    """
+    def report(done: float, stage: str) -> None:
+        if progress is not None:
+            progress(done, stage)
+
+    report(0.1, "decimating")
+    # Extract data for plotting
+    lines = {}
+    for field in ('average_distance', 'average_x_axis', 'average_y_axis', 'average_crossing_y'):
+        lines[field] = decimate(statistics.get_column(field), max_points)
+    # the points of short series are marked, in long ones the markers would hide the line
+    marker = 'o' if statistics.recorded_steps <= max_points else None
+
+    report(0.3, "drawing")
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=GRAPH_SIZE)
+
+    # Plot average distances
+    axes = figure.add_subplot(1, 3, 1)
+    axes.plot(*lines['average_distance'], marker=marker, linestyle='-', color='b', label='Distance from origin')
+    axes.plot(*lines['average_x_axis'], marker=marker, linestyle='--', color='g', label='X-Axis Distance')
+    axes.plot(*lines['average_y_axis'], marker=marker, linestyle=':', color='r', label='Y-Axis Distance')
+    axes.set_title('Distance Comparisons per Step')
+    axes.set_xlabel('Step Number')
+    axes.set_ylabel('Distance')
+    axes.legend(loc='best', shadow=True, fancybox=True)
+
+    # Plot y-axis crossings
+    axes = figure.add_subplot(1, 3, 2)
+    axes.plot(*lines['average_crossing_y'], marker=marker, linestyle='-', color='r')
+    axes.set_title('Y-Axis Crossings per Step')
+    axes.set_xlabel('Step Number')
+    axes.set_ylabel('Crossings')
+    axes.set_ylim(bottom=0)  # Ensure y-axis starts at 0
+
+    report(0.6, "saving")
+    figure.tight_layout()
+    figure.savefig(path)
+    report(1.0, "done")
+
+
+def export_graph(statistics_path: str, legacy_path: Optional[str], image_path: str,
+                 messages: "multiprocessing.Queue[tuple[Any, ...]]", max_points: int = DEFAULT_GRAPH_POINTS) -> None:
+    """
+    the work of the export process: loads the statistics file and saves its graph. every stage is put on the
+    messages queue as (PROGRESS_MESSAGE, done, stage), and the end as (DONE_MESSAGE, image_path) or
+    (ERROR_MESSAGE, text)
+    """
+    try:
+        messages.put((PROGRESS_MESSAGE, 0.0, "loading statistics"))
+        statistics = Statistics(statistics_path, legacy_file_path=legacy_path)
+        make_graph(statistics, image_path, max_points,
+                   lambda done, stage: messages.put((PROGRESS_MESSAGE, done, stage)))
+        messages.put((DONE_MESSAGE, image_path))
+    except Exception as error:
+        messages.put((ERROR_MESSAGE, f"{type(error).__name__}: {error}"))
+
+
+class GraphExport:
+    """
+    Saves the graph of a statistics file in a process of its own, so a window that asked for it is never frozen,
+    however many steps the statistics have. The process is started with spawn, so it shares nothing with the
+    window and its tkinter state. The window polls the messages of the process from its own loop.
+
+    Attributes:
+        image_path (str): The image file the graph is saved to.
+        __messages (multiprocessing.Queue): The messages of the export process, see export_graph.
+        __process (multiprocessing.Process): The export process.
+    """
+    def __init__(self, statistics_path: str, image_path: str, legacy_path: Optional[str] = None,
+                 max_points: int = DEFAULT_GRAPH_POINTS):
+        self.image_path = image_path
+        context = multiprocessing.get_context("spawn")
+        self.__messages = context.Queue()
+        self.__process = context.Process(target=export_graph, daemon=True, name="graph-export",
+                                         args=(statistics_path, legacy_path, image_path, self.__messages, max_points))
+        self.__process.start()
+
+    def poll(self) -> list[tuple[Any, ...]]:
+        """returns the messages the process sent since the last poll, without waiting for more"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.__messages.get_nowait())
+            except queue.Empty:
+                break
+        if not messages and not self.__process.is_alive() and self.__process.exitcode not in (None, 0):
+            # the process died before it could say why, for example it was killed
+            messages.append((ERROR_MESSAGE, f"export process exited with code {self.__process.exitcode}"))
+        return messages
+
+    def is_running(self) -> bool:
+        return self.__process.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """waits for the process to end"""
+        self.__process.join(timeout)
@@ -1,17 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, colorchooser, messagebox
 from datetime import datetime
-from typing import Callable, Any
+from typing import Callable, Any, NamedTuple, Optional
 import os
 import json
 
-from board import STATISTICS_FILE_PATH
+from board import STATISTICS_FILE_PATH, LEGACY_STATISTICS_FILE_PATH
 from statistics import *
+from reporting import GraphExport, PROGRESS_MESSAGE, DONE_MESSAGE
 from walker import SIMPLE_WALK, RANDOM_SIZE_WALK, SQUARE_WALK, PREFERRED_WALK
+from obstacle import DEAFULT_OBSTICLE_SIZE
+from portal import DEAFULT_PORTAL_SIZE
 
 CONFIGURATION_FILE = "config.json"
-DEAFULT_OBSTICLE_SIZE = 0.2
-DEAFULT_PORTAL_SIZE = 0.3
+MAX_STEPS_PER_FRAME = 1000
+EXPORT_POLL_MS = 100  # how often the progress of a graph export is checked
 
 CANVAS_DEFAULT_COLOR = "#28094d"
 OBSTACLE_DEFAULT_COLOR = "black"
@@ -25,6 +28,21 @@ DEFAULT_COLORS = {
     'walker_color': WALKER_DEFAULT_COLOR
 }
 
+ADD_CHANGE = "add"
+REMOVE_CHANGE = "remove"
+RESET_CHANGE = "reset"
+OBSTACLE_KIND = "obstacle"
+PORTAL_KIND = "portal"
+STATISTICS_KIND = "statistics"
+
+
+class BoardChange(NamedTuple):
+    """one change the settings made to the board, sent to the simulation so it applies it to the live board"""
+    action: str  # ADD_CHANGE or REMOVE_CHANGE of an obstacle or a portal, or RESET_CHANGE of the statistics
+    kind: str  # OBSTACLE_KIND, PORTAL_KIND or STATISTICS_KIND
+    data: dict[str, Any]  # the obstacle or the portal, as it is saved in the configuration file
+
+
 WALKING_METHODS = {
     "Simple Walk": SIMPLE_WALK,
     "Random Size Walk": RANDOM_SIZE_WALK,
@@ -42,13 +60,21 @@ class SettingsWindow:
     The SettingsWindow is organized into tabs for different categories, including Walker, Board, and Statistics,
     allowing users to navigate through settings intuitively. Each tab contains specific controls related to the
     category, ensuring a clean and organized user experience.
+
+    The configuration file is written once, when the window is closed, or when the simulation asks for it with
+    save_changes before it reads the file. Obstacles and portals that are added or
+    removed, and resets of the statistics, are also sent right away as BoardChange objects to on_board_change, so
+    the simulation applies them to its board without loading the whole configuration again.
     """
 
-    def __init__(self, master: tk.Toplevel, on_close_callback: Callable[[], None]):
+    def __init__(self, master: tk.Toplevel, on_close_callback: Callable[[], None],
+                 on_board_change: Optional[Callable[[BoardChange], None]] = None):
         """ Initialize the Settings window with tabs """
         self.load_config()
+        self.__config_changed = False  # the configuration is saved on close only if something changed
 
         self.on_close_callback = on_close_callback  # Store the callback function
+        self.on_board_change = on_board_change
         self.master = master
         self.master.title("Settings")
         self.master.geometry("350x560")  # Adjust size as needed
@@ -87,7 +113,7 @@ class SettingsWindow:
     def create_board_tab(self) -> None:
         """ Populate the 'Board' tab with widgets and settings for obstacles and portals """
         # Frame for adding obstacles
-        self.board_label = tk.Label(self.board_tab, text="object on board (sets when simulator starts)", padx=10,
+        self.board_label = tk.Label(self.board_tab, text="objects on board", padx=10,
                                     pady=10)
         self.board_label.pack()
 
@@ -190,16 +216,23 @@ class SettingsWindow:
             values = item['values']
             if values[0] == 'Obstacle':
                 x, y = map(float, values[1].split(', '))
+                for obs in self.config['obstacles']:
+                    if obs['x'] == x and obs['y'] == y:
+                        self.__send_board_change(REMOVE_CHANGE, OBSTACLE_KIND, obs)
                 self.config['obstacles'] = [obs for obs in self.config['obstacles'] if
                                             not (obs['x'] == x and obs['y'] == y)]
             elif values[0] == 'Portal':
                 coords = values[1].replace(' -> ', ', ').split(', ')
                 x1, y1, x2, y2 = map(float, coords)
+                for portal in self.config['portals']:
+                    if portal['endpoint1']['x'] == x1 and portal['endpoint1']['y'] == y1 and \
+                            portal['endpoint2']['x'] == x2 and portal['endpoint2']['y'] == y2:
+                        self.__send_board_change(REMOVE_CHANGE, PORTAL_KIND, portal)
                 self.config['portals'] = [portal for portal in self.config['portals'] if not (
                         portal['endpoint1']['x'] == x1 and portal['endpoint1']['y'] == y1 and portal['endpoint2'][
                     'x'] == x2 and portal['endpoint2']['y'] == y2)]
             self.tree.delete(selection)
-        self.save_config()
+        self.__mark_config_changed()
 
     def __create_statistics_tab(self) -> None:
         """ Populate the 'Statistics' tab with widgets and settings """
@@ -222,6 +255,12 @@ class SettingsWindow:
         self.export_button = tk.Button(self.statistics_tab, text="Export Graph", command=self.__export_graph)
         self.export_button.pack(pady=20)
 
+        # Progress of the export, which is made in the background
+        self.export_progress = ttk.Progressbar(self.statistics_tab, length=200, maximum=1.0)
+        self.export_progress.pack()
+        self.export_status_label = tk.Label(self.statistics_tab, text="", padx=10)
+        self.export_status_label.pack()
+
         # Add more widgets as needed for statistics settings
         self.reset_stats_button = tk.Button(self.statistics_tab, text="Reset Statistics",
                                             command=self.on_click_reset_statistics, padx=5, pady=5)
@@ -237,8 +276,10 @@ class SettingsWindow:
             self.master.focus_set()
 
     def __export_graph(self) -> None:
-        """ Trigger the graph export function with automatic filename generation """
-        stats = Statistics(STATISTICS_FILE_PATH)
+        """
+        Trigger the graph export function with automatic filename generation. The graph is made in a process of its
+        own, and its progress is shown until it is saved
+        """
         directory = self.file_path_entry.get()
         if directory:
             # Generate a filename based on current date and time
@@ -246,11 +287,34 @@ class SettingsWindow:
             file_path: str = os.path.join(directory, filename)  # Combine directory and filename
 
             print("Exporting graph to:", file_path)
-            stats.make_graph(file_path)
+            self.__graph_export = GraphExport(STATISTICS_FILE_PATH, file_path, LEGACY_STATISTICS_FILE_PATH)
+            self.export_button.config(state=tk.DISABLED)  # one export at a time
+            self.export_progress['value'] = 0
+            self.export_status_label.configure(text="starting")
+            self.master.after(EXPORT_POLL_MS, self.__poll_export)
 
         else:
             print("No directory provided.")
 
+    def __poll_export(self) -> None:
+        """shows the progress the export process reported, and checks again later until it is done"""
+        if not self.master.winfo_exists():  # the window was closed, the export goes on without it
+            return
+        for message in self.__graph_export.poll():
+            if message[0] == PROGRESS_MESSAGE:
+                self.export_progress['value'] = message[1]
+                self.export_status_label.configure(text=message[2])
+                continue
+            self.export_button.config(state=tk.NORMAL)
+            if message[0] == DONE_MESSAGE:
+                self.export_progress['value'] = 1.0
+                self.export_status_label.configure(text=f"saved to {message[1]}")
+            else:
+                self.export_status_label.configure(text="export failed")
+                messagebox.showerror("Export Graph", message[1])
+            return
+        self.master.after(EXPORT_POLL_MS, self.__poll_export)
+
     def add_obstacle(self) -> None:
         """add an obstacle to the configuration file"""
         x_str: str = self.obstacle_x.get()
@@ -271,7 +335,8 @@ class SettingsWindow:
             self.config["obstacles"].append(new_obstacle)
             self.tree.insert('', 'end',
                              values=('Obstacle', f"{new_obstacle['x']}, {new_obstacle['y']}", new_obstacle['size']))
-            self.save_config()
+            self.__mark_config_changed()
+            self.__send_board_change(ADD_CHANGE, OBSTACLE_KIND, new_obstacle)
         except ValueError as e:
             messagebox.showerror("Input Error", f"Invalid input: {e}")
 
@@ -310,7 +375,9 @@ class SettingsWindow:
             "size": size
         }
         self.config["portals"].append(new_portal)
-        self.save_config()
+        self.tree.insert('', 'end', values=('Portal', f"{x1}, {y1} -> {x2}, {y2}", size))
+        self.__mark_config_changed()
+        self.__send_board_change(ADD_CHANGE, PORTAL_KIND, new_portal)
 
     def load_config(self) -> None:
         """ Load the existing configuration from a JSON file """
@@ -325,6 +392,16 @@ class SettingsWindow:
         """ Save the updated configuration back to the JSON file """
         with open(CONFIGURATION_FILE, 'w') as file:
             json.dump(self.config, file, indent=4)
+        self.__config_changed = False
+
+    def __mark_config_changed(self) -> None:
+        """the configuration changed, it is saved when the window is closed"""
+        self.__config_changed = True
+
+    def __send_board_change(self, action: str, kind: str, data: dict[str, Any]) -> None:
+        """sends a change of the board to the simulation, if it listens to them"""
+        if self.on_board_change is not None:
+            self.on_board_change(BoardChange(action, kind, data))
 
     def __create_walker_tab(self) -> None:
         """ Populate the 'Walker' tab with widgets and settings """
@@ -338,6 +415,16 @@ class SettingsWindow:
         self.speed_scale.set(self.config.get('speed', 500))  # Default to 500ms if not set
         self.speed_scale.pack()
 
+        # Steps made before the walker is drawn again, to watch long runs
+        tk.Label(self.walker_tab, text="Steps Per Frame:", padx=10, pady=2).pack()
+        self.steps_per_frame_scale = tk.Scale(self.walker_tab, from_=1, to=MAX_STEPS_PER_FRAME, orient='horizontal',
+                                              command=self.update_steps_per_frame)
+        self.steps_per_frame_scale.set(self.config.get('steps_per_frame', 1))
+        self.steps_per_frame_scale.pack()
+        self.show_trail_var = tk.BooleanVar(value=bool(self.config.get('show_trail', False)))
+        tk.Checkbutton(self.walker_tab, text="Show the path between frames", variable=self.show_trail_var,
+                       command=self.update_show_trail).pack()
+
         # Walker Color Setting
         tk.Label(self.walker_tab, text="Current Walker Color:", padx=10, pady=2).pack()
         self.color_display = tk.Label(self.walker_tab, text="       ",
@@ -362,19 +449,35 @@ class SettingsWindow:
     def update_walking_speed(self, event: Any = None) -> None:
         """ Update the walking speed setting in the configuration """
         self.config['speed'] = self.speed_scale.get()
-        self.save_config()
+        self.__mark_config_changed()
         print("speed changed")
 
+    def update_steps_per_frame(self, event: Any = None) -> None:
+        """ Update the number of steps made in every frame in the configuration """
+        self.config['steps_per_frame'] = self.steps_per_frame_scale.get()
+        self.__mark_config_changed()
+
+    def update_show_trail(self) -> None:
+        """ Update whether the path of the steps of a frame is drawn in the configuration """
+        self.config['show_trail'] = self.show_trail_var.get()
+        self.__mark_config_changed()
+
     def change_walker_color(self) -> None:
         """ Open a color picker dialog to select a new color and update the config """
         color_code = colorchooser.askcolor(title="Choose a color")[1]
         if color_code:
             self.config['walker_color'] = color_code
             self.color_display.configure(bg=color_code)
+            self.__mark_config_changed()
+
+    def save_changes(self) -> None:
+        """saves the configuration if something changed since it was last saved"""
+        if self.__config_changed:
             self.save_config()
 
     def on_close(self) -> None:
-        """Handle the close event by calling the callback function."""
+        """Handle the close event by saving the configuration once, and calling the callback function."""
+        self.save_changes()
         self.on_close_callback()
         self.master.destroy()
 
@@ -464,7 +567,7 @@ class SettingsWindow:
         else:
             button.config(state=tk.NORMAL)
         self.config[f"{key}_use_image"] = use_image
-        self.save_config()
+        self.__mark_config_changed()
 
     def __change_color(self, color_key: str, display_label: tk.Label) -> None:
         """ Open a color picker dialog to select a new color and update the config and display label """
@@ -474,7 +577,7 @@ class SettingsWindow:
         if color_code:
             self.config[color_key] = color_code
             display_label.configure(bg=str(color_code))
-            self.save_config()
+            self.__mark_config_changed()
         # on purpose no else, because its when he closes without picking a color, we dont want anything to happen
 
     def __reset_to_default_colors(self) -> None:
@@ -483,16 +586,20 @@ class SettingsWindow:
             self.config[key] = default
             display_label = getattr(self, f"{key}_display")
             display_label.configure(bg=default)
-        self.save_config()
+        self.__mark_config_changed()
         messagebox.showinfo("Reset Colors", "All colors have been reset to default settings.")
 
     def __set_initial_walking_method(self, event: Any) -> None:
         meathod = WALKING_METHODS[self.walking_method_var.get()]
         self.config['walk_method'] = meathod
-        self.save_config()
+        self.__mark_config_changed()
 
     def on_click_reset_statistics(self) -> None:
-        s = Statistics(STATISTICS_FILE_PATH)
-        s.erase_statistics()
+        if self.on_board_change is not None:
+            # the board keeps its statistics in memory, it erases them itself, so they don't overwrite the file
+            self.__send_board_change(RESET_CHANGE, STATISTICS_KIND, {})
+        else:
+            s = Statistics(STATISTICS_FILE_PATH)
+            s.erase_statistics()
         messagebox.showinfo("reset stats", "statistics file is now empty")
 
@@ -1,34 +1,62 @@
+import ctypes
+import sys
 import tkinter
 
 import PIL
 from board import *
 from help_window import *
 from settings_window import *
+from sprite_cache import SpriteCache
+from trajectory import TrajectoryReader, TrajectoryPlayer
+from stepper import BoardStepper
 import json
 from tkinter import PhotoImage, ttk, messagebox
 import tkinter as tk
 from PIL import Image, ImageTk, ImageOps, ImageDraw
-from typing import Any, Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Mapping, Sequence, Optional
 
 CANVAS_HEIGHT = 400
 CANVAS_WIDTH = 400
 SPACE_FOR_CONTROLS = 60
+SPACE_FOR_REPLAY_CONTROLS = 45
 SCREEN_SIZE_IN_PIXELS = "400x360"
 
 WINDOW_DEFAULT_COLOR = "#6724b5"
 PORTAL_RING_COLOR = "#f27e0a"
 WALKER_DEFAULT_COLOR = "red"
 DOT_SIZE = 8
+TRAIL_WIDTH = 1
 
 WINDOW_TITLE = "Random Walker"
 START_BUTTON_TEXT = "start"
 CONTROL_TEXT_COLOR = "white"
 
 CONFIG_PATH = "config.json"
+METRICS_FILE_PATH = "metrics.jsonl"
+MIN_METRICS_INTERVAL = 0.1  # seconds, shorter intervals are stretched to it so the dumps don't flood the window
 SETTINGS_ICON_PATH = "settings_icon.png"
 STONE_WALL_TEXTURE_PATH = "stone2.jpg"
 PORTAL_TEXTURE_PATH = "portal.png"
 BIDEN_HEAD_TEXTURE_PATH = "biden.png"
+FRAME_INTERVAL_MS = 33  # about 30 frames a second, when the steps are made in the background
+SPRITE_CACHE_SIZE = 64  # textures ready in the sizes they were shown in, a few sizes for every texture
+PROCESS_SYSTEM_DPI_AWARE = 1  # the window is drawn in the resolution of the screen, and not scaled up by windows
+
+
+def enable_dpi_awareness() -> None:
+    """
+    on windows, tells the system the window draws itself in the real resolution of the screen, so it is not scaled
+    up and blurred on high dpi screens. it has to be called before the window is created. this used to happen as a
+    side effect of the graph statistics.py drew with matplotlib when it was imported, which is why the window looked
+    better with it
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(PROCESS_SYSTEM_DPI_AWARE)
+    except (AttributeError, OSError):  # shcore is only on windows 8.1 and later
+        ctypes.windll.user32.SetProcessDPIAware()
+
 
 class Simulation:
     """
@@ -38,24 +66,60 @@ class Simulation:
     It initializes the main window, user controls, and the canvas where the simulation is displayed.
     The class is responsible for setting up the UI components, configuring their properties, and handling
     the interactions between the user inputs and the simulation's logic.
+
+    Given a trajectory file, the simulation plays the recorded steps back instead of making new ones. The
+    obstacles and portals are still taken from the configuration file, and a slider seeks to any step.
+
+    With "background_stepping" set in the configuration file, the steps are made by a BoardStepper on a worker
+    thread, and the window draws the latest state of the board at a fixed frame rate. Then "speed" is the wait
+    between steps, 0 to step as fast as possible, instead of the wait between frames. The stepper makes its own
+    batches of steps, so "steps_per_frame" and "show_trail" are not used then.
+
+    Otherwise every frame makes "steps_per_frame" steps and shows only where the last of them ended, so long runs
+    can be watched. With "show_trail" set, the path of the steps of the frame is drawn, and a jump through a
+    portal breaks the line.
+
+    With "metrics_interval" set to a number of seconds, the phases of the steps are counted and timed, and a
+    snapshot of them is appended to METRICS_FILE_PATH every that many seconds while the walker moves.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, replay_path: Optional[str] = None, frame_skip: int = 1, start_step: int = 0) -> None:
+        """
+        :param replay_path: a trajectory file to play back, None to run the simulation
+        :param frame_skip: when playing back, every frame moves this many steps and shows only the last one
+        :param start_step: when playing back, the step to start from
+        """
+        self.__player: Optional[TrajectoryPlayer] = None
+        self.__start_step = start_step
+        self.__replay_position: Optional[Position] = None  # the played back position shown, None before the first
+        if replay_path is not None:
+            self.__player = TrajectoryPlayer(TrajectoryReader(replay_path), frame_skip)
+            self.__replay_position = self.__player.seek(start_step)
+        self.__stepper: Optional[BoardStepper] = None  # makes the steps while the window only draws them
+        self.__settings_window: Optional[SettingsWindow] = None  # the open settings window, its changes are saved late
+        self.__drawn_steps = 0  # the steps of the stepper snapshot that is shown
         self.previous_arguments: dict[str, Any] = {}
         self.__obstacles: List[int] = []
         self.__portals: List[int] = []
+        self.__trail: list[int] = []  # the lines of the path of the last frame
         self.keep_moving: bool = False  # indicates when to stop and when to go on
         self.reset_screen = False  # to be used after the user changes settings and we want to load them
 
         self.__init_board()  # important to be called before init window, because the window shows the loaded board
+        self.__metrics_dumper = MetricsDumper(lambda: self.__board.metrics(), METRICS_FILE_PATH)
+        self.__metrics_job: Optional[str] = None  # the scheduled metrics dump, None when the dumps are stopped
         self.__init_window()
+        self.__schedule_metrics_dump()
 
     def __init_window(self) -> None:
         """Initialize the main window using Tkinter."""
+        enable_dpi_awareness()
         self.window = tk.Tk()
         self.window.title(WINDOW_TITLE)
+        self.window.protocol("WM_DELETE_WINDOW", self.__on_close)  # the open settings are saved before closing
         # Adjust the window size, needs to contain canvas where the simulation runs, and additional space for controls
-        screen_size_str = str(CANVAS_WIDTH) + 'x' + str(CANVAS_HEIGHT + SPACE_FOR_CONTROLS)
+        controls_height = SPACE_FOR_CONTROLS + (SPACE_FOR_REPLAY_CONTROLS if self.__player is not None else 0)
+        screen_size_str = str(CANVAS_WIDTH) + 'x' + str(CANVAS_HEIGHT + controls_height)
         self.window.geometry(screen_size_str)
         # Set the background color
         self.window.configure(bg=WINDOW_DEFAULT_COLOR)
@@ -78,6 +142,18 @@ class Simulation:
         self.__init_help_button()
         self.__init_screen_index_label()
         self.init_walking_method_menu()
+        if self.__player is not None:
+            self.__init_seek_scale(self.__player)
+
+    def __init_seek_scale(self, player: TrajectoryPlayer) -> None:
+        """sets a slider to seek to a step of the played back trajectory, the playing goes on from there"""
+        self.seek_scale = tk.Scale(self.window, from_=0, to=max(len(player.reader) - 1, 0),
+                                   orient=tk.HORIZONTAL, length=CANVAS_WIDTH - 20, bg=CANVAS_DEFAULT_COLOR,
+                                   fg=CONTROL_TEXT_COLOR, highlightthickness=0)
+        self.__set_seek_scale(player)
+        # only a step the user chose is seeked to, not every value the slider passes while it is dragged
+        self.seek_scale.bind("<ButtonRelease-1>", self.__on_seek)
+        self.seek_scale.pack()
 
     def __init_setting_button(self) -> None:
         """sets a gear icon as settings button"""
@@ -124,11 +200,16 @@ class Simulation:
                                 highlightthickness=0)
         self.canvas.pack()
 
-        self.item_ref: List[PIL.ImageTk.PhotoImage] = []  # needed only so the garbage collector wont erase the pictures
+        # the picture of every image item on the canvas, needed only so the garbage collector wont erase the pictures.
+        # a picture is dropped when its item is deleted, so it holds only what is on the canvas
+        self.item_ref: Dict[int, PIL.ImageTk.PhotoImage] = {}
+        # the textures are cut and resized once for every size, instead of on every step
+        self.sprite_cache: SpriteCache[ImageTk.PhotoImage] = SpriteCache(SPRITE_CACHE_SIZE)
         self.biden_texture = Image.open(BIDEN_HEAD_TEXTURE_PATH)
         # sets the dot initially because every step the simulation erases the previous position and puts it the new one
         self.dot = self.canvas.create_oval(0, 0, 0, 0, fill=self.__walker_color,
                                            outline=WALKER_DEFAULT_COLOR)
+        self.__dot_is_image = False
 
         # Load the obstacles and portals images
         self.stone_texture: PIL.Image.Image = Image.open(STONE_WALL_TEXTURE_PATH)
@@ -143,9 +224,11 @@ class Simulation:
         self.__board = Board(walker)
         self.__load_config(CONFIG_PATH)
 
-    def __load_config(self, filename: str) -> None:
+    def __load_config(self, filename: str, load_elements: bool = True) -> None:
         """loads the settings and the data that is saved in the configuration file, and handles it
-        if the files are not saved correctly, we save a deafult value"""
+        if the files are not saved correctly, we save a deafult value
+        the obstacles and portals are loaded only with load_elements. the settings window sends their changes to
+        the live board, so they are never loaded again after the board was made"""
         try:
             file_exists = True
             try:
@@ -159,12 +242,14 @@ class Simulation:
             # Track if the configuration is missing any expected keys
             config_updated = False
 
-            if self.load_game_elements(config):  # if the config was updated in one of the functions
+            if load_elements and self.load_game_elements(config):  # if the config was updated in one of the functions
                 config_updated = True
             if self.__load_walker_settings(config):
                 config_updated = True
             if self.__load_colors(config):
                 config_updated = True
+            if self.__load_metrics_settings(config):
+                config_updated = True
 
             # Save the config back if it was missing keys
             if config_updated or not file_exists:
@@ -182,35 +267,7 @@ class Simulation:
         :param config: the data talen from the configuration file
         :return: whether we changed the data because something wasn't set right or not
         """
-        config_updated = False
-
-        # Load obstacles if they exist, otherwise initialize with an empty list
-        if 'obstacles' not in config:
-            config['obstacles'] = []
-            config_updated = True
-        for obstacle_data in config['obstacles']:
-            x = obstacle_data.get('x', 0)  # Default x coordinate if not specified
-            y = obstacle_data.get('y', 0)  # Default y coordinate if not specified
-            if 'size' not in obstacle_data:
-                obstacle_data['size'] = DEAFULT_OBSTICLE_SIZE
-                config_updated = True
-            size = obstacle_data.get('size')
-            self.__board.add_obstacle(Obstacle(x, y, size))
-
-        # Load portals if they exist, otherwise initialize with an empty list
-        if 'portals' not in config:
-            config['portals'] = []
-            config_updated = True
-        for portal_data in config['portals']:
-            endpoint1 = (portal_data['endpoint1'].get('x', 0), portal_data['endpoint1'].get('y', 0))
-            endpoint2 = (portal_data['endpoint2'].get('x', 0), portal_data['endpoint2'].get('y', 0))
-            if 'size' not in portal_data:
-                portal_data['size'] = 0.3
-                config_updated = True
-            size = portal_data.get('size')
-            self.__board.add_portal(Portal(endpoint1, endpoint2, size))
-
-        return config_updated
+        return self.__board.load_game_elements(config)
 
     def __load_walker_settings(self, config: Any) -> bool:
         """
@@ -232,6 +289,35 @@ class Simulation:
             config_updated = True
         self.__speed = int(config['speed'])
 
+        if 'background_stepping' not in config:
+            config['background_stepping'] = False
+            config_updated = True
+        self.__background_stepping = bool(config['background_stepping'])
+
+        if 'steps_per_frame' not in config or int(config['steps_per_frame']) < 1:
+            config['steps_per_frame'] = 1
+            config_updated = True
+        self.__steps_per_frame = int(config['steps_per_frame'])
+
+        if 'show_trail' not in config:
+            config['show_trail'] = False
+            config_updated = True
+        self.__show_trail = bool(config['show_trail'])
+
+        return config_updated
+
+    def __load_metrics_settings(self, config: Any) -> bool:
+        """
+        loads the seconds between two dumps of the metrics of the steps, and turns the metrics on if they are dumped
+        :param config: the data taken from the configuration file
+        :return:  whether we changed the data because something wasn't set right or not
+        """
+        config_updated = False
+        if 'metrics_interval' not in config:
+            config['metrics_interval'] = 0
+            config_updated = True
+        self.__metrics_interval = float(config['metrics_interval'])
+        self.__board.enable_metrics(self.__metrics_interval > 0)
         return config_updated
 
     def __load_colors(self, config: Any) -> bool:
@@ -339,23 +425,33 @@ class Simulation:
         new_x, new_y = location
         x_on_screen = self.__get_position_on_screen(new_x, bool(X_INDEX))
         y_on_screen = self.__get_position_on_screen(new_y, bool(Y_INDEX))
-        self.canvas.delete(self.dot)  # delete the previous one
-        if self.use_walker_image:  # the user decided to see the walker as an image of joe biden's head
-            self.dot = self.__place_circular_png((0, 0), DOT_SIZE, self.biden_texture)
+        # the walker item is only moved. it is replaced only when the way it is presented may have changed
+        if self.reset_screen or self.__dot_is_image != self.use_walker_image:
+            self.__delete_item(self.dot)  # delete the previous one
+            if self.use_walker_image:  # the user decided to see the walker as an image of joe biden's head
+                self.dot = self.__place_circular_png((0, 0), DOT_SIZE, self.biden_texture)
+            else:  # the walker will be presented as a colored circle
+                self.dot = self.canvas.create_oval(0, 0, 0, 0, fill=self.__walker_color,
+                                                   outline=WALKER_DEFAULT_COLOR)
+            self.__dot_is_image = self.use_walker_image
+        if self.__dot_is_image:
             self.canvas.coords(self.dot, x_on_screen, y_on_screen)
-        else:  # the walker will be presented as a colored circle
-            self.dot = self.canvas.create_oval(0, 0, 0, 0, fill=self.__walker_color,
-                                               outline=WALKER_DEFAULT_COLOR)
+        else:
             self.canvas.coords(self.dot, x_on_screen - DOT_SIZE, y_on_screen - DOT_SIZE, x_on_screen + DOT_SIZE,
                                y_on_screen + DOT_SIZE)
 
+    def __delete_item(self, item: int) -> None:
+        """deletes an item from the canvas, together with the reference to its picture if it has one"""
+        self.canvas.delete(item)
+        self.item_ref.pop(item, None)
+
     def remove_all_obstacles(self) -> None:
         """removes all obstacles from board and clears the list"""
         for i in self.__obstacles:
-            self.canvas.delete(i)
+            self.__delete_item(i)
         self.__obstacles.clear()
 
-    def place_obstacle(self, obs_dict: dict[str, Any]) -> None:
+    def place_obstacle(self, obs_dict: Mapping[str, Any]) -> None:
         """
         places a new obstacle on the board according to choise of obstacle is image or color
         :param obs_dict: data about the wanted obstacle. location (key: 'location') and size (key 'size')
@@ -375,25 +471,27 @@ class Simulation:
                                                y_on_screen + y_size, fill=self.__obstacle_color, outline="blue")
         self.__obstacles.append(obs_widg)
 
-    def __set_obstacles_on_screen(self, obs_data: list[dict[str, Any]]) -> None:
+    def __set_obstacles_on_screen(self, obs_data: Sequence[Mapping[str, Any]], version: Any) -> None:
         """
         if there is change is the obstacles to present from the previous turn, remove all the obstacles, and
         replaces the new ones
         :param obs_data: list of dictionaries, each one containing data about an obstacle
+        :param version: the version of the obstacles from the board, it changes only when the obstacles change
         """
-        if obs_data == self.previous_arguments.get("o") and not self.reset_screen:
+        if version == self.previous_arguments.get("ov") and not self.reset_screen:
             return
         self.remove_all_obstacles()
         for i in obs_data:
             self.place_obstacle(i)
 
-    def __set_portals_on_screen(self, portals_data: list[dict[str,Any]]) -> None:
+    def __set_portals_on_screen(self, portals_data: Sequence[Mapping[str, Any]], version: Any) -> None:
         """
         if there is change is the portals to present from the previous turn, remove all the obstacles, and
         replaces the new ones
         :param portals_data: list of dictionaries, each one containing data about a portal
+        :param version: the version of the portals from the board, it changes only when the portals change
         """
-        if portals_data == self.previous_arguments.get("p") and not self.reset_screen:
+        if version == self.previous_arguments.get("pv") and not self.reset_screen:
             return
         self.remove_all_portals()
         for location in portals_data:
@@ -402,10 +500,10 @@ class Simulation:
     def remove_all_portals(self) -> None:
         """removes all portals from board and clears the list"""
         for portal in self.__portals:
-            self.canvas.delete(portal)
+            self.__delete_item(portal)
         self.__portals.clear()
 
-    def place_portal(self, portal_data: dict[str,Any]) -> None:
+    def place_portal(self, portal_data: Mapping[str, Any]) -> None:
         """
         places one portal
         :param portal_data: a dictionary conaning data about a portal (size and position)
@@ -430,9 +528,14 @@ class Simulation:
         Continues moving as long as keep_moving is True.
         """
         try:
-            if self.keep_moving:
-                if self.__board.do_move():
-                    self.__set_screen()  # gets the new data, after the move was done, from the board
+            if self.keep_moving and self.__player is not None:
+                self.__play_frame(self.__player)
+            elif self.keep_moving:
+                # the trail starts where the walker was shown in the previous frame
+                trail = [[self.__board.get_walker_position()]] if self.__show_trail else None
+                if self.__board.do_moves(self.__steps_per_frame, trail) == self.__steps_per_frame:
+                    # gets the new data, after the moves were done, from the board
+                    self.__set_screen(self.__board.get_screen(trail=trail))
                     self.window.after(self.__speed, self.__start_moving)
                 else: # board didn't manage to make a move
                     self.__on_click_restart()
@@ -440,24 +543,119 @@ class Simulation:
             messagebox.showerror("error", "error accured, restarting")
             self.__on_click_restart()
 
-    def __set_screen(self) -> None:
+    def __draw_frame(self) -> None:
+        """
+        draws the latest state the stepper published, and schedules the next frame. it never waits for steps,
+        a frame with no new steps draws nothing
+        """
+        if not self.keep_moving or self.__stepper is None:
+            return
+        snapshot = self.__stepper.get_snapshot()
+        if snapshot.error is not None:
+            messagebox.showerror("error", "error accured, restarting")
+            self.__on_click_restart()
+            return
+        if snapshot.stopped:  # board didn't manage to make a move
+            self.__on_click_restart()
+            return
+        if snapshot.screen is not None and (snapshot.steps != self.__drawn_steps or self.reset_screen):
+            self.__set_screen(snapshot.screen)
+            self.__drawn_steps = snapshot.steps
+        self.window.after(FRAME_INTERVAL_MS, self.__draw_frame)
+
+    def __dump_metrics(self) -> None:
+        """appends the metrics of the board to the metrics file while the walker moves, and schedules the next dump"""
+        self.__metrics_job = None
+        if self.keep_moving and self.__metrics_interval > 0:
+            self.__metrics_dumper.dump()
+        self.__schedule_metrics_dump()
+
+    def __schedule_metrics_dump(self) -> None:
+        """
+        schedules the next dump of the metrics if they are on, and no dump is scheduled yet. called whenever the
+        settings are loaded, so metrics that are turned on later are dumped too
+        """
+        if self.__metrics_interval <= 0 or self.__metrics_job is not None:
+            return
+        delay_ms = int(max(self.__metrics_interval, MIN_METRICS_INTERVAL) * 1000)
+        self.__metrics_job = self.window.after(delay_ms, self.__dump_metrics)
+
+    def __stop_stepper(self) -> None:
+        """stops the background steps, if they are made"""
+        if self.__stepper is not None:
+            self.__stepper.stop()
+            self.__stepper = None
+
+    def __flush_statistics(self) -> None:
+        """writes the statistics of the board to the file, between two batches of background steps if needed"""
+        if self.__stepper is not None:
+            with self.__stepper.paused() as board:
+                board.flush_statistics()
+        else:
+            self.__board.flush_statistics()
+
+    def __play_frame(self, player: TrajectoryPlayer) -> None:
+        """shows the next frame of the played back trajectory, and schedules the one after it"""
+        position = player.next_position()
+        if position is None:  # the whole trajectory was played
+            self.keep_moving = False
+            return
+        self.__replay_position = position
+        self.__set_seek_scale(player)
+        self.__set_screen()
+        self.window.after(self.__speed, self.__start_moving)
+
+    def __on_seek(self, event: Any) -> None:
+        """shows the step the user chose on the slider, the playing goes on from the step after it"""
+        player = self.__player
+        if player is None:  # the slider is made only when a trajectory is played back
+            return
+        position = player.seek(int(self.seek_scale.get()) + 1)
+        if position is not None:
+            self.__replay_position = position
+            self.__set_seek_scale(player)
+            self.__set_screen()
+
+    def __set_seek_scale(self, player: TrajectoryPlayer) -> None:
+        """sets the slider to the played back step that is shown"""
+        self.seek_scale.set(max(player.step - 1, 0))
+
+    def __set_screen(self, args: Optional[dict[str, Any]] = None) -> None:
         """
         Updates the display based on the current state of the board. It sets labels, moves the walker,
         and places obstacles and portals. Ensures the walker dot remains visible by raising its layer.
+        When a trajectory is played back, the played back position is shown instead of the walker of the board.
+        :param args: the screen to show, as returned by the board. taken from the board when not given
         """
-        args: dict[str, Any] = self.__board.get_screen()  # gets a dictionary with all data needed to set the board
+        if args is None:
+            # gets a dictionary with all data needed to set the board
+            args = self.__board.get_screen(self.__replay_position)
         self._set_screen_label(str(args.get("s")))
         walker_location = tuple[float, float](args.get("w", (0.0, 0.0)))
         self.__move_walker(walker_location)
-        obstacles = list(args.get("o", []))
-        self.__set_obstacles_on_screen(obstacles)
-        portals = list(args.get("p", []))
-        self.__set_portals_on_screen(portals)
+        self.__set_obstacles_on_screen(args.get("o", ()), args.get("ov"))
+        self.__set_portals_on_screen(args.get("p", ()), args.get("pv"))
+        self.__set_trail(args.get("t", ()))
 
         self.canvas.tag_raise(self.dot)  # makes the dot in front of other objects.
         self.reset_screen = False  # this is true only one step after settings window was closed, and after we close it
         self.previous_arguments = args  # save the last dictionary so we can compare it
 
+    def __set_trail(self, trail: Sequence[Sequence[Position]]) -> None:
+        """
+        replaces the lines of the path of the walker, every jump through a portal starts a new line
+        :param trail: the lines of the path, as positions on the screen. no line is drawn for less than two
+        """
+        for line_item in self.__trail:
+            self.canvas.delete(line_item)
+        self.__trail = []
+        for line in trail:
+            if len(line) < 2:
+                continue
+            coordinates = [(self.__get_position_on_screen(x, bool(X_INDEX)),
+                            self.__get_position_on_screen(y, bool(Y_INDEX))) for x, y in line]
+            self.__trail.append(self.canvas.create_line(coordinates, fill=self.__walker_color, width=TRAIL_WIDTH))
+
     def _set_screen_label(self, screen_index: str) -> None:
         """sets the label indicating where the walker is on the surface, by the given index"""
         self.screen_index_label.configure(text=screen_index)
@@ -466,12 +664,29 @@ class Simulation:
         """called when the user presses the stsrt button. runs the game and changes the button accordingly"""
         self.start_button.configure(text="restart", command=self.__on_click_restart)
         self.keep_moving = True
-        self.__start_moving()
+        if self.__background_stepping and self.__player is None:
+            self.__stepper = BoardStepper(self.__board, self.__speed / 1000)
+            self.__drawn_steps = 0
+            self.__stepper.start()
+            self.__draw_frame()
+        else:
+            self.__start_moving()
 
     def __on_click_restart(self) -> None:
         """resets the game, and changes the button accordingly"""
         self.keep_moving = False
-        self.__init_board()
+        self.__stop_stepper()
+        if self.__metrics_interval > 0:
+            self.__metrics_dumper.dump()  # the last metrics of the run, loading the settings starts them from zero
+        # the board already has the obstacles and portals, only the walker starts again, with the current settings
+        self.__board.reset_game()
+        if self.__settings_window is not None:
+            self.__settings_window.save_changes()  # the settings that were changed so far are used in the new run
+        self.__load_config(CONFIG_PATH, load_elements=False)
+        self.__schedule_metrics_dump()
+        if self.__player is not None:
+            self.__replay_position = self.__player.seek(self.__start_step)
+            self.__set_seek_scale(self.__player)
         self.walking_method_selector.current(self.__board.get_walking_method())
         self.start_button.configure(text="start", command=self.__on_click_start)
         self.__set_screen()
@@ -483,29 +698,69 @@ class Simulation:
 
     def __on_click_settings(self) -> None:
         """ Handle the settings button click """
+        self.__flush_statistics()  # so graphs exported from the settings include the latest steps
         settings_window = tk.Toplevel(self.window)  # Create a new top-level window
         # Initialize the settings window with the new top-level window
-        SettingsWindow(settings_window, self.__on_settings_close)
+        self.__settings_window = SettingsWindow(settings_window, self.__on_settings_close, self.__on_board_change)
 
     def __on_settings_close(self) -> None:
         """handles the configuration of settings that were changes when the settings window was open"""
+        self.__settings_window = None
         self.reset_screen = True
         if not self.keep_moving:
-            self.__init_board()
+            self.__load_config(CONFIG_PATH, load_elements=False)
+            self.__schedule_metrics_dump()
             self.__set_screen()
         self.canvas.configure(bg=self.background_color)
 
+    def __on_board_change(self, change: BoardChange) -> None:
+        """applies a change the settings window made to the live board, between two batches of background steps"""
+        if self.__stepper is not None:
+            with self.__stepper.paused() as board:
+                self.__apply_board_change(board, change)
+        else:
+            self.__apply_board_change(self.__board, change)
+        if not self.keep_moving:  # otherwise the next frame shows it
+            self.__set_screen()
+
+    @staticmethod
+    def __apply_board_change(board: Board, change: BoardChange) -> None:
+        """adds or removes an obstacle or a portal, or erases the statistics of the board"""
+        if change.kind == STATISTICS_KIND:
+            board.get_statistics().erase_statistics()
+        elif change.kind == OBSTACLE_KIND:
+            obstacle = obstacle_from_config(change.data)
+            if change.action == ADD_CHANGE:
+                board.add_obstacle(obstacle)
+                return
+            found_obstacle = board.get_obstacle_at(obstacle.position)
+            if found_obstacle is not None:
+                board.remove_obstacle(found_obstacle)
+        else:
+            portal = portal_from_config(change.data)
+            if change.action == ADD_CHANGE:
+                board.add_portal(portal)
+                return
+            found_portal = board.get_portal_at(*portal.get_endpoints())
+            if found_portal is not None:
+                board.remove_portal(found_portal)
+
     def __change_walking_method(self, event:Any) -> None:
         """ Update the walker's walking method based on the selected option in the dropdown """
         method_name = self.walking_method_var.get()
         method = WALKING_METHODS[method_name]
-        self.__board.set_walking_method(method)
+        if self.__stepper is not None:
+            with self.__stepper.paused() as board:
+                board.set_walking_method(method)
+        else:
+            self.__board.set_walking_method(method)
         print(f"Changed walking method to {method_name}")
 
     def __place_jpg(self, position: Position, radius: int, image: PIL.Image.Image) -> int:
         """
         places a picture in given position in given size
         picture is places as circle, and is cropped  from the original jpg in the given size
+        the cropped picture is prepared once for every size, and is taken from the sprite cache after that
         :param position: the position to place the image
         :param radius: the size by radios
         :param image: the image needed to be placed
@@ -515,6 +770,25 @@ class Simulation:
         x, y = int(x), int(y)
         radius = int(radius)
 
+        tk_image = self.sprite_cache.get(("jpg", id(image), radius), lambda: self.__make_circular_jpg(image, radius))
+
+        # Create the canvas image
+        item_on_screen = self.canvas.create_image(x, y, image=tk_image, anchor='center')
+        # Draw an outer circle border
+        # self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, outline='blue')
+
+        self.item_ref[item_on_screen] = tk_image
+
+        return int(item_on_screen)
+
+    @staticmethod
+    def __make_circular_jpg(image: PIL.Image.Image, radius: int) -> ImageTk.PhotoImage:
+        """
+        cuts a circle in the given size from the original jpg
+        :param image: the image to cut from
+        :param radius: the size by radios
+        :return: the circle, ready to be placed on the canvas
+        """
         # Crop the image to the size of the obstacle plus a little extra for the border
         cropped_image = image.crop((0, 0, 2 * radius, 2 * radius))
 
@@ -528,21 +802,13 @@ class Simulation:
         circle_image.putalpha(mask)
 
         # Convert the PIL image to a Tkinter PhotoImage
-        tk_image = ImageTk.PhotoImage(circle_image)
-
-        # Create the canvas image
-        item_on_screen = self.canvas.create_image(x, y, image=tk_image, anchor='center')
-        # Draw an outer circle border
-        # self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, outline='blue')
-
-        self.item_ref.append(tk_image)
-
-        return int(item_on_screen)
+        return ImageTk.PhotoImage(circle_image)
 
     def __place_circular_png(self, position: Position, radius: int, image: Image.Image) -> int:
         """
         places a picture in given position in given size
         picture is placed as circle, it resizes the entire original png
+        the resized picture is prepared once for every size, and is taken from the sprite cache after that
         :param position: the position to place the image
         :param radius: the size by radios
         :param image: the image needed to be placed
@@ -552,16 +818,34 @@ class Simulation:
         x, y = int(x), int(y)
         radius = int(radius)
 
-        # Resize the image to fit within the specified radius
-        resized_image = image.resize((2 * radius, 2 * radius), Image.Resampling.LANCZOS)
-        # Convert the PIL image to a Tkinter PhotoImage
-        tk_image = ImageTk.PhotoImage(resized_image)
+        tk_image = self.sprite_cache.get(("png", id(image), radius), lambda: self.__make_resized_png(image, radius))
 
         # Create the canvas image
         item_on_screen = self.canvas.create_image(x, y, image=tk_image, anchor='center')
-        self.item_ref.append(tk_image)
+        self.item_ref[item_on_screen] = tk_image
         return item_on_screen
 
+    @staticmethod
+    def __make_resized_png(image: Image.Image, radius: int) -> ImageTk.PhotoImage:
+        """
+        resizes the entire original png to the given size
+        :param image: the image to resize
+        :param radius: the size by radios
+        :return: the resized image, ready to be placed on the canvas
+        """
+        # Resize the image to fit within the specified radius
+        resized_image = image.resize((2 * radius, 2 * radius), Image.Resampling.LANCZOS)
+        # Convert the PIL image to a Tkinter PhotoImage
+        return ImageTk.PhotoImage(resized_image)
+
+    def __on_close(self) -> None:
+        """closes the simulation, and saves the changes of the settings window if it is still open"""
+        self.keep_moving = False
+        self.__stop_stepper()
+        if self.__settings_window is not None:
+            self.__settings_window.on_close()
+        self.window.destroy()
+
     def show(self) -> None:
         """public method to stert the simulation"""
         self.window.mainloop()
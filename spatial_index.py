@@ -0,0 +1,156 @@
+import math
+from itertools import count
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+from walker import Position, X_INDEX, Y_INDEX
+
+DEFAULT_CELL_SIZE = 1.0  # about the length of one step, and the size of the biggest obstacles
+
+Item = TypeVar('Item', bound=Hashable)
+View = TypeVar('View')
+Cell = tuple[int, int]
+TileVersion = tuple[Cell, int]  # a tile and the number of the last change made to it
+
+
+class SpatialHash(Generic[Item]):
+    """
+    A uniform grid over the infinite plane, that finds the items near a point or a segment without going over
+    all of them. Every item is a circle, given by its center and radius, and is listed in every cell that the
+    square around the circle touches. A query collects the items of the cells that the queried area touches,
+    so its cost depends on how crowded the area is, not on how many items there are.
+
+    Only the cells that hold items are stored, so the grid has no bounds.
+
+    Attributes:
+        __cell_size (float): The length of the side of one cell.
+        __cells (dict): The items listed in every non empty cell.
+        __item_cells (dict): The cells every item is listed in, so it can be removed.
+    """
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.__cell_size = cell_size
+        self.__cells: dict[Cell, list[Item]] = {}
+        self.__item_cells: dict[Item, list[Cell]] = {}
+
+    def __cell_index(self, location: float) -> int:
+        """returns the index of the cell that a coordinate falls in"""
+        return math.floor(location / self.__cell_size)
+
+    def __cells_in_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterable[Cell]:
+        """goes over the cells that the given axis aligned box touches"""
+        for cell_x in range(self.__cell_index(min_x), self.__cell_index(max_x) + 1):
+            for cell_y in range(self.__cell_index(min_y), self.__cell_index(max_y) + 1):
+                yield cell_x, cell_y
+
+    def insert(self, item: Item, center: Position, radius: float) -> None:
+        """
+        adds an item to the grid
+        :param item: the item, it has to be hashable and can be in the grid only once
+        :param center: the center of the item
+        :param radius: the distance from the center the item reaches
+        """
+        if item in self.__item_cells:
+            raise ValueError("Item is already in the grid")
+        x, y = center[X_INDEX], center[Y_INDEX]
+        cells = list(self.__cells_in_box(x - radius, y - radius, x + radius, y + radius))
+        for cell in cells:
+            self.__cells.setdefault(cell, []).append(item)
+        self.__item_cells[item] = cells
+
+    def remove(self, item: Item) -> None:
+        """removes an item from the grid, does nothing if it is not there"""
+        for cell in self.__item_cells.pop(item, []):
+            items = self.__cells[cell]
+            items.remove(item)
+            if not items:
+                del self.__cells[cell]
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[Item]:
+        """
+        returns the items that may touch the given axis aligned box, each one once, in the order they were added
+        to their cell. the caller still has to check the exact distance, because a cell is bigger than the box
+        """
+        found: dict[Item, None] = {}  # a dictionary keeps the order and removes duplicates
+        for cell in self.__cells_in_box(min_x, min_y, max_x, max_y):
+            items = self.__cells.get(cell)
+            if items:
+                found.update(dict.fromkeys(items))
+        return list(found)
+
+    def query_segment(self, src_position: Position, dst_position: Position) -> list[Item]:
+        """returns the items that may touch the segment between the given positions"""
+        return self.query_box(min(src_position[X_INDEX], dst_position[X_INDEX]),
+                              min(src_position[Y_INDEX], dst_position[Y_INDEX]),
+                              max(src_position[X_INDEX], dst_position[X_INDEX]),
+                              max(src_position[Y_INDEX], dst_position[Y_INDEX]))
+
+    def query_point(self, position: Position) -> list[Item]:
+        """returns the items that may touch the given position"""
+        return self.query_box(position[X_INDEX], position[Y_INDEX], position[X_INDEX], position[Y_INDEX])
+
+    def __len__(self) -> int:
+        return len(self.__item_cells)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.__item_cells
+
+
+class TileIndex(Generic[Item, View]):
+    """
+    Groups items by the tile they are in, and keeps a ready view of every tile that was asked for. The view is
+    built once, by the given function, and is returned again until an item of its tile is added or removed.
+    Every change gets a new number, so comparing the version of a tile tells if its view changed, without
+    comparing the views themselves.
+
+    Attributes:
+        __make_view (Callable): Builds the view of a tile from the tile and its items. The views are shared, so
+            they should be immutable.
+        __tiles (dict): The items of every non empty tile.
+        __views (dict): The views that were built and are still up to date.
+        __versions (dict): The number of the last change of every tile that changed.
+    """
+    __changes = count(1)  # shared by all indexes, so a version number is never reused
+
+    def __init__(self, make_view: Callable[[Cell, list[Item]], View]):
+        self.__make_view = make_view
+        self.__tiles: dict[Cell, list[Item]] = {}
+        self.__views: dict[Cell, View] = {}
+        self.__versions: dict[Cell, int] = {}
+
+    def __changed(self, tile: Cell) -> None:
+        """throws away the view of a tile, and gives it a new version"""
+        self.__views.pop(tile, None)
+        self.__versions[tile] = next(TileIndex.__changes)
+
+    def add(self, tile: Cell, item: Item) -> None:
+        """adds an item to a tile"""
+        self.__tiles.setdefault(tile, []).append(item)
+        self.__changed(tile)
+
+    def remove(self, tile: Cell, item: Item) -> None:
+        """removes an item from a tile, raises ValueError if it is not there"""
+        items = self.__tiles.get(tile, [])
+        items.remove(item)
+        if not items:
+            del self.__tiles[tile]
+        self.__changed(tile)
+
+    def get_items(self, tile: Cell) -> tuple[Item, ...]:
+        """returns the items of a tile, in the order they were added"""
+        return tuple(self.__tiles.get(tile, ()))
+
+    def get_view(self, tile: Cell) -> View:
+        """returns the view of the items of a tile, building it only if it changed since it was last built"""
+        view = self.__views.get(tile)
+        if view is None:
+            items = self.__tiles.get(tile)
+            if items is None:  # empty tiles are not kept, so walking far away does not fill the memory
+                return self.__make_view(tile, [])
+            view = self.__make_view(tile, items)
+            self.__views[tile] = view
+        return view
+
+    def get_version(self, tile: Cell) -> TileVersion:
+        """returns a value that changes every time an item of the tile is added or removed"""
+        return tile, self.__versions.get(tile, 0)
@@ -0,0 +1,20 @@
+from typing import TypeVar
+
+from lru_cache import LRUCache
+
+DEFAULT_CAPACITY = 64
+
+Sprite = TypeVar('Sprite')
+
+
+class SpriteCache(LRUCache[Sprite]):
+    """
+    Keeps the images that were already prepared for the canvas, so a texture is cut, masked or resized only the
+    first time it is needed in a given size. When the cache is full, the image that was used least recently is
+    dropped, see LRUCache.
+
+    The cache only holds its own reference to an image. An image that is dropped while it is still shown on the
+    canvas has to be kept alive by whoever placed it.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
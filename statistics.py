@@ -1,126 +1,320 @@
+import atexit
 import json
 import os
+import tempfile
+import time
+import weakref
 from math import sqrt
-from typing import Union, Any
+from typing import Union, Any, Optional, Sequence
+
+import numpy as np
 
 from walker import Position, X_INDEX, Y_INDEX
-import matplotlib.pyplot as plt
+from accumulators import StepAccumulator, RunningMoments, PassageHistogram, COUNT_FIELD, M2_SUFFIX, \
+    INITIAL_CAPACITY, PASSAGE_RADII_KEY
+from quantile_sketch import QuantileSketch
 
 BEGINNING_STAGE = 0
 POSOTIVE_SIDE = 1
 NEGETIVE_SIDE = -1
 
+# the fields that are accumulated for every step, each one has a mean column and an M2 column
+VALUE_FIELDS = ("average_distance", "average_x_axis", "average_y_axis", "average_crossing_y")
+STEP_FIELDS = (COUNT_FIELD,) + VALUE_FIELDS
+RADIUS_PASS_KEY = "steps_to_pass_radius_10"
+DISTANCE_QUANTILES_KEY = "distance_quantiles"  # quantile sketches of the distance, by their checkpoint step
+CONFIDENCE_Z = 1.96  # the normal quantile of a 95% confidence interval
+# the radii whose first passage steps are counted, log spaced from 1 to 1000
+DEFAULT_PASSAGE_RADII = tuple(np.geomspace(1, 1000, 13).round(3).tolist())
+META_KEY = "meta"  # the key in the file of everything that is not a per step column, saved as json text
+STATISTICS_FILE_MODE = 0o644  # the permissions of a new statistics file
+MAX_SAVE_TIME_SHARE = 0.05  # the timed writes are spread out so that writing takes at most this share of the time
+
+# statistics objects that may still hold steps that were not written to their file yet
+_unsaved_statistics: "weakref.WeakSet[Statistics]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_unsaved_statistics() -> None:
+    """writes every statistics object's buffered steps when the program shuts down"""
+    for stats in list(_unsaved_statistics):
+        stats.flush()
+
 
 class Statistics:
     """
     Manages and records statistical data for the Random Walker simulation. This class tracks the walker's movement,
     calculates various metrics such as distance from the origin and number of crossings over the y-axis, and
-    monitors when the walker passes a predefined radius threshold. It stores all statistics in a JSON file and
-    provides functionality to generate graphical representations of these metrics.
+    monitors when the walker passes a predefined radius threshold. It stores all statistics in a NumPy .npz file
+    and provides functionality to generate graphical representations of these metrics.
+
+    The per step values are kept in a StepAccumulator: for every field of VALUE_FIELDS a column of means and a
+    column of M2, and one column of counts, where index i holds the data of step i + 1. Recording a step is a few
+    array writes, saving or loading is one binary copy per column, and statistics of separate runs, processes or
+    machines can be merged exactly.
 
     Attributes:
-        file_path (str): Path to the JSON file where statistical data is stored and loaded from.
+        file_path (Optional[str]): Path to the .npz file where statistical data is stored and loaded from. If None,
+            the statistics are kept only in memory, for example in a worker process that hands them back to be
+            merged.
+        legacy_file_path (Optional[str]): Path of a JSON statistics file of the old format. If the .npz file does
+            not exist yet, the JSON file is imported once and saved in the new format.
         turn_count (int): Counter for the number of steps taken by the walker.
         initial_position (tuple[float, float]): The starting position of the walker, used as a reference for distance calculations.
-        data (dict): Container for all the statistical data collected during the simulation.
+        data (dict): Container for the statistical data that is not per step, such as the radius pass block.
+        recorded_steps (int): The number of steps that have data in the columns.
+        __steps (StepAccumulator): The per step counts, means and M2 of the fields.
+        __run_values (list[tuple[float, ...]]): The values of the current run that were not added to __steps yet.
+            They are added all at once when the steps are read, saved, merged or the run ends, which is much
+            faster than updating the columns on every step.
+        __run_start (int): The index of the step of the first value in __run_values.
         radius_threshold (int): The distance threshold from the origin at which certain statistics start being recorded.
         has_passed_threshold (bool): Flag to indicate whether the radius threshold has been crossed.
         y_axis_side (int): Indicator of the walker's last position relative to the y-axis to track crossings.
         crossing_count (int): Counter for the number of times the walker crosses the y-axis.
+        flush_steps (int): How many recorded steps are kept in memory before the file is written.
+        flush_seconds (Optional[float]): If set, the file is also written when this much time passed since the
+            last write.
+        flush_growth (float): The steps kept in memory before the file is written grow to this share of the
+            recorded steps, so the file is written less often as it grows.
+        track_quantiles (bool): If True, the distribution of the distance is sketched at the checkpoint steps,
+            the powers of 2, so its quantiles can be estimated there.
+        __distance_sketches (dict[int, QuantileSketch]): The quantile sketches of the distance by checkpoint step.
+        __passages (PassageHistogram): The histograms of the first passage steps of the passage radii. A file
+            that already has histograms keeps its own radii.
+        __next_radius (int): The index of the smallest passage radius the current run did not pass yet.
+
+    By default every step is written to the file. With a bigger flush_steps or with flush_seconds the file is
+    written behind: the data is kept in memory and saved only on the intervals, when the statistics are reset
+    and when the program shuts down. The file is replaced atomically, so it is never left half written.
+
+    Every write rewrites the whole file, which takes time in proportion to the recorded steps. With flush_growth the
+    step interval grows with the file, so the total writing time stays proportional to the steps however long the
+    runs are, and the time interval is stretched so that writing takes at most MAX_SAVE_TIME_SHARE of the time.
 
     The class handles the loading and saving of data, updates statistical measurements upon each walker step,
-    and can reset statistics for new simulation runs. It also includes methods to visualize data through graphs,
-    aiding in the analysis of the walker's behavior over time.
+    and can reset statistics for new simulation runs. Graphs of the statistics are drawn by reporting.py.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: Optional[str], flush_steps: int = 1, flush_seconds: Optional[float] = None,
+                 legacy_file_path: Optional[str] = None, track_quantiles: bool = False,
+                 passage_radii: Sequence[float] = DEFAULT_PASSAGE_RADII, flush_growth: float = 0.0):
         self.file_path = file_path
+        self.legacy_file_path = legacy_file_path
+        self.flush_steps = flush_steps
+        self.flush_seconds = flush_seconds
+        self.flush_growth = flush_growth
+        self.__unsaved_steps = 0
+        self.__last_flush_time = time.monotonic()
+        self.__flush_step_interval = flush_steps  # grows with the file, see flush_growth
+        self.__flush_time_interval = flush_seconds  # grows if writing the file gets slow
         self.turn_count = 0
         self.initial_position = (0, 0)  # Assuming starting at origin; update if starting position can change
+        self.__steps = StepAccumulator(VALUE_FIELDS)
+        self.__run_values: list[tuple[float, ...]] = []
+        self.__run_start = 0
+        self.track_quantiles = track_quantiles
+        self.__distance_sketches: dict[int, QuantileSketch] = {}
+        self.__passages = PassageHistogram(passage_radii)
+        self.__next_radius = 0
         self.data = self.load_data()
+        self.__distance_sketches = {int(step): QuantileSketch.from_dict(sketch)
+                                    for step, sketch in self.data[DISTANCE_QUANTILES_KEY].items()}
         self.radius_threshold = 10  # Threshold radius
         self.has_passed_threshold = False  # Track if the threshold has been passed already
         self.y_axis_side: int = BEGINNING_STAGE
         self.crossing_count = 0
 
+    @property
+    def recorded_steps(self) -> int:
+        return max(self.__steps.steps, self.__run_start + len(self.__run_values))
+
+    def __add_run_values(self) -> None:
+        """adds the values of the current run that are kept aside into the per step columns"""
+        if self.__run_values:
+            self.__steps.add_run(self.__run_start, np.array(self.__run_values))
+            self.__run_start += len(self.__run_values)
+            self.__run_values.clear()
+
+    def __default_data(self) -> dict[str, Any]:
+        """the data of statistics that have no steps yet"""
+        return {
+            "initial_position": list(self.initial_position),
+            RADIUS_PASS_KEY: RunningMoments().to_dict(),
+            "seeds": [],
+            DISTANCE_QUANTILES_KEY: {}
+        }
+
     def load_data(self) -> Any:
-        """Load data from the JSON file, or initialize if the file does not exist or is empty."""
-        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
-            with open(self.file_path, 'r') as file:
-                data = json.load(file)
-                # Ensure all expected keys are present
-                data.setdefault("initial_position", list(self.initial_position))
-                data.setdefault("average_distance", [])
-                data.setdefault("steps_to_pass_radius_10", {"total_counts": 0, "sum_steps": 0, "average_steps": 0})
-                return data
+        """Load data from the .npz file, or from the legacy JSON file the first time, or initialize if neither
+        exists. The columns are loaded as a side effect, the returned value is the rest of the data."""
+        if self.file_path and os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            with np.load(self.file_path) as file:
+                data = json.loads(str(file[META_KEY]))
+                self.__steps = StepAccumulator.from_arrays(VALUE_FIELDS, file)
+                if PASSAGE_RADII_KEY in file:
+                    self.__passages = PassageHistogram.from_arrays(file)
+        elif self.legacy_file_path and os.path.exists(self.legacy_file_path) and \
+                os.path.getsize(self.legacy_file_path) > 0:
+            data = self.__import_legacy_file(self.legacy_file_path)
         else:
-            return {
-                "initial_position": list(self.initial_position),
-                "average_distance": [],
-                "steps_to_pass_radius_10": {
-                    "total_counts": 0,
-                    "sum_steps": 0,
-                    "average_steps": 0
-                }
-            }
+            self.__steps = StepAccumulator(VALUE_FIELDS)
+            return self.__default_data()
+
+        # Ensure all expected keys are present
+        for key, value in self.__default_data().items():
+            data.setdefault(key, value)
+        return data
+
+    def __import_legacy_file(self, legacy_file_path: str) -> Any:
+        """reads a statistics JSON file of the old format, where every step was a dictionary, and saves it in the
+        new format so it is imported only once"""
+        with open(legacy_file_path, 'r') as file:
+            data = json.load(file)
+        steps = data.pop("average_distance", [])
+        self.__steps = StepAccumulator.from_arrays(
+            VALUE_FIELDS, {field: np.array([step.get(field, 0) for step in steps]) for field in STEP_FIELDS})
+        print(f"Imported {len(steps)} steps of statistics from {legacy_file_path}")
+
+        self.data = data
+        self.save_data()
+        return data
+
+    def get_column(self, field: str) -> np.ndarray:
+        """
+        returns the values of one per step field for all the recorded steps
+        :param field: one of STEP_FIELDS for the counts and the averages, or one of VALUE_FIELDS + M2_SUFFIX for
+        the sums of squared differences from the averages
+        :return: a read only view of the column, index i holds step i + 1
+        """
+        self.__add_run_values()
+        return self.__steps.column(field)
+
+    def get_variance(self, field: str) -> np.ndarray:
+        """
+        returns the sample variance of a field between the runs, at every recorded step
+        :param field: one of VALUE_FIELDS
+        :return: the variances, nan at steps that were reached by less than 2 runs
+        """
+        counts = self.get_column(COUNT_FIELD)
+        return np.divide(self.get_column(field + M2_SUFFIX), counts - 1,
+                         out=np.full(len(counts), np.nan), where=counts > 1)
+
+    def get_standard_error(self, field: str) -> np.ndarray:
+        """returns the standard error of the average of a field at every recorded step"""
+        return np.sqrt(self.get_variance(field) / self.get_column(COUNT_FIELD))
+
+    def get_confidence_interval(self, field: str, z: float = CONFIDENCE_Z) -> tuple[np.ndarray, np.ndarray]:
+        """
+        returns a normal approximation confidence interval of the average of a field at every recorded step
+        :param field: one of VALUE_FIELDS
+        :param z: the normal quantile of the confidence level, 95% by default
+        :return: the low and the high ends of the intervals
+        """
+        averages = self.get_column(field)
+        margin = z * self.get_standard_error(field)
+        return averages - margin, averages + margin
+
+    def get_passage_radii(self) -> np.ndarray:
+        """returns the radii whose first passages are counted, in increasing order"""
+        return self.__passages.radii
+
+    def get_passage_histogram(self, radius_index: int) -> np.ndarray:
+        """
+        returns how many runs passed a radius for the first time at every recorded step
+        :param radius_index: the index of the radius in get_passage_radii()
+        :return: the counts, index i holds step i + 1
+        """
+        self.__add_run_values()
+        return self.__passages.get_histogram(radius_index, self.recorded_steps)
+
+    def get_passage_probability(self, radius_index: int) -> np.ndarray:
+        """
+        returns the estimated probability that a run passed a radius by every recorded step, out of the runs
+        that started
+        :param radius_index: the index of the radius in get_passage_radii()
+        :return: the probabilities, index i holds step i + 1
+        """
+        runs = self.get_column(COUNT_FIELD)[0] if self.recorded_steps else 0
+        return np.cumsum(self.get_passage_histogram(radius_index)) / max(runs, 1)
+
+    def get_quantile_checkpoints(self) -> list[int]:
+        """returns the steps that have a sketch of the distance, in order"""
+        return sorted(self.__distance_sketches)
+
+    def get_distance_quantile(self, step: int, q: float) -> float:
+        """
+        estimates a quantile of the distance from the origin between the runs at a checkpoint step
+        :param step: one of the checkpoint steps
+        :param q: the quantile, between 0 and 1
+        :return: the estimate, within the relative accuracy of the sketch
+        """
+        return self.__distance_sketches[step].quantile(q)
 
     def record_step(self, position: Position) -> None:
         """Record the position of the walker, update turn count, and calculate distances."""
         self.turn_count += 1
-        self.__update_avrage_distance(position)
-        self.__update_radius_pass(position)
-
-        # Save the updated data back to the file
-        self.save_data()
-
-    def __update_avrage_distance(self, position: Position) -> None:
-        """updates the in the stats file the avarage distance to the origin for the current step number"""
         distance = sqrt((position[0] - self.initial_position[0]) ** 2 +
                         (position[1] - self.initial_position[1]) ** 2)
-
+        self.__update_avrage_distance(position, distance)
+        self.__update_radius_pass(distance)
+
+        # Save the updated data back to the file, if it is time to
+        self.__mark_unsaved(1)
+        if self.__is_flush_due():
+            self.flush()
+
+    def __mark_unsaved(self, steps: int) -> None:
+        """remembers that steps were changed in memory and not written to the file yet"""
+        if self.file_path is None:
+            return
+        self.__unsaved_steps += steps
+        _unsaved_statistics.add(self)
+
+    def __is_flush_due(self) -> bool:
+        """checks if one of the write intervals was reached"""
+        if self.__unsaved_steps >= self.__flush_step_interval:
+            return True
+        return (self.__flush_time_interval is not None and
+                time.monotonic() - self.__last_flush_time >= self.__flush_time_interval)
+
+    def flush(self) -> None:
+        """writes the steps that are kept in memory to the file, if there are any"""
+        if self.__unsaved_steps > 0:
+            self.save_data()
+
+    def __update_avrage_distance(self, position: Position, distance: float) -> None:
+        """updates the avarage distances to the origin and the y crossings for the current step number"""
         distance_from_x_axis = abs(position[1] - self.initial_position[1])
         distance_from_y_axis = abs(position[0] - self.initial_position[0])
 
-        # Update average distances
-        if len(self.data["average_distance"]) < self.turn_count:
-            # First time this step is reached
-            self.data["average_distance"].append({
-                "count": 1,
-                "average_distance": distance,
-                "average_x_axis": distance_from_x_axis,
-                "average_y_axis": distance_from_y_axis,
-                "average_crossing_y": 0
-            })
-        else:
-            # Update existing data
-            step_data = self.data["average_distance"][self.turn_count - 1]
-            old_count = step_data["count"]
-            step_data["count"] += 1
-
-            # Update the overall average distance
-            step_data["average_distance"] += (distance - step_data["average_distance"]) / step_data["count"]
-            # Update the average distance from the x-axis
-            step_data["average_x_axis"] += (distance_from_x_axis - step_data["average_x_axis"]) / step_data["count"]
-            # Update the average distance from the y-axis
-            step_data["average_y_axis"] += (distance_from_y_axis - step_data["average_y_axis"]) / step_data["count"]
-
-        self.__update_y_crossing_average(position)
-
-
-    def __update_radius_pass(self, position: Position) -> None:
-        """Check and update statistics for passing the threshold radius."""
-        distance = sqrt((position[0] - self.initial_position[0]) ** 2 +
-                        (position[1] - self.initial_position[1]) ** 2)
+        self.__update_y_crossing_count(position)
+        self.__run_values.append((distance, distance_from_x_axis, distance_from_y_axis, self.crossing_count))
+
+        # the checkpoints are the powers of 2, so a run of n steps is sketched log2(n) times
+        if self.track_quantiles and self.turn_count & (self.turn_count - 1) == 0:
+            sketch = self.__distance_sketches.get(self.turn_count)
+            if sketch is None:
+                sketch = self.__distance_sketches[self.turn_count] = QuantileSketch()
+            sketch.add(distance)
+
+    def __update_radius_pass(self, distance: float) -> None:
+        """Check and update statistics for passing the threshold radius, and the first passages of the passage
+        radii. only the next radius that was not passed is compared, so a step costs one comparison unless it
+        passes radii"""
+        radii = self.__passages.radii
+        while self.__next_radius < len(radii) and distance >= radii[self.__next_radius]:
+            self.__passages.add(self.__next_radius, self.turn_count - 1)
+            self.__next_radius += 1
 
         if not self.has_passed_threshold and distance >= self.radius_threshold:
             self.has_passed_threshold = True  # Mark that the threshold has been passed
             steps_to_pass = self.turn_count  # Use turn_count to determine the steps taken to pass the threshold
-            radius_stats = self.data["steps_to_pass_radius_10"]
-            radius_stats["total_counts"] += 1
-            radius_stats["sum_steps"] += steps_to_pass
-            radius_stats["average_steps"] = radius_stats["sum_steps"] / radius_stats["total_counts"]
+            radius_stats = RunningMoments.from_dict(self.data[RADIUS_PASS_KEY])
+            radius_stats.add(steps_to_pass)
+            self.data[RADIUS_PASS_KEY] = radius_stats.to_dict()
 
-    def __update_y_crossing_average(self, position: Position) -> None:
-        """has to be called after average distance"""
+    def __update_y_crossing_count(self, position: Position) -> None:
+        """counts the crossings of the y axis in the current run"""
         didpass: bool = False
         if self.y_axis_side > 0:
             if position[X_INDEX] < 0:
@@ -139,60 +333,111 @@ class Statistics:
         if didpass:
             self.crossing_count += 1
 
-        # upload to data
-        step_data = self.data["average_distance"][self.turn_count - 1]
-        step_data["average_crossing_y"] += (self.crossing_count - step_data["average_crossing_y"]) / step_data["count"]
-
     def save_data(self) -> None:
-        """Save the statistical data to a JSON file."""
-        with open(self.file_path, 'w') as file:
-            json.dump(self.data, file, indent=4)
+        """Save the statistical data to a .npz file. the data is written to a temporary file, synced to the disk,
+        that then replaces the old one, so a crash or a power loss in the middle of writing never leaves a truncated
+        file. if writing fails, the temporary file is deleted and the old file is kept"""
+        if self.file_path is None:
+            return
+        start_time = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        self.__add_run_values()
+        self.data[DISTANCE_QUANTILES_KEY] = {str(step): sketch.to_dict()
+                                             for step, sketch in self.__distance_sketches.items()}
+        arrays = {**self.__steps.to_arrays(), **self.__passages.to_arrays()}
+        with tempfile.NamedTemporaryFile('wb', dir=directory, suffix=".tmp", delete=False) as file:
+            try:
+                np.savez(file, **arrays, **{META_KEY: np.array(json.dumps(self.data))})
+                file.flush()
+                os.fsync(file.fileno())  # the data is on the disk before the name points at it
+                # temporary files are made readable by their owner only, the statistics file keeps its permissions
+                try:
+                    mode = os.stat(self.file_path).st_mode & 0o777
+                except FileNotFoundError:
+                    mode = STATISTICS_FILE_MODE
+                os.chmod(file.name, mode)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self.file_path)
+        self.__unsaved_steps = 0
+        self.__last_flush_time = time.monotonic()
+        self.__flush_step_interval = max(self.flush_steps, int(self.recorded_steps * self.flush_growth))
+        if self.flush_seconds is not None:
+            self.__flush_time_interval = max(self.flush_seconds,
+                                             (self.__last_flush_time - start_time) / MAX_SAVE_TIME_SHARE)
+        _unsaved_statistics.discard(self)
+
+    def merge(self, other: "Statistics") -> None:
+        """
+        adds the data of other statistics into these ones, as if the runs recorded there were recorded here.
+        the moments of every step are combined with the parallel formulas, so merging is associative
+        :param other: the statistics to add, they are not changed
+        """
+        self.__add_run_values()
+        other.__add_run_values()
+        self.__steps.merge(other.__steps)
+        self.__passages.merge(other.__passages)
+
+        radius_stats = RunningMoments.from_dict(self.data[RADIUS_PASS_KEY])
+        radius_stats.merge(RunningMoments.from_dict(other.data[RADIUS_PASS_KEY]))
+        self.data[RADIUS_PASS_KEY] = radius_stats.to_dict()
+        self.data["seeds"].extend(dict(seed) for seed in other.data["seeds"])
+        for step, other_sketch in other.__distance_sketches.items():
+            sketch = self.__distance_sketches.setdefault(step, QuantileSketch(other_sketch.relative_accuracy,
+                                                                              other_sketch.max_buckets))
+            sketch.merge(other_sketch)
+
+        self.__mark_unsaved(other.recorded_steps)
+
+    def record_seed(self, seed: int, first_run: int, runs: int) -> None:
+        """
+        keeps the seed of a batch of runs next to the steps it made, so the batch can be replayed exactly
+        :param seed: the root seed of the batch
+        :param first_run: the index of the first run of the batch, the runs use the streams from it on
+        :param runs: how many runs the batch made
+        """
+        self.data["seeds"].append({"seed": seed, "first_run": first_run, "runs": runs})
+        self.__mark_unsaved(1)  # counted as a change, so the next flush writes it even if no step was made
 
     def reset_statistics(self) -> None:
         """Reset the statistics for a new simulation run."""
+        self.__add_run_values()
+        self.__run_start = 0
+        self.flush()
         self.has_passed_threshold = False
+        self.__next_radius = 0
         self.turn_count = 0  # Reset turn count for accurate tracking in each new simulation
+        self.y_axis_side = BEGINNING_STAGE  # a new run starts on the y axis, with no crossings yet
+        self.crossing_count = 0
 
-
-
-    def make_graph(self, path: str) -> None:
-        """Generate and save plots based on the distances and y-axis crossings."""
-        # Extract data for plotting
-        distances = [step['average_distance'] for step in self.data['average_distance']]
-        x_distances = [step['average_x_axis'] for step in self.data['average_distance']]
-        y_distances = [step['average_y_axis'] for step in self.data['average_distance']]
-        y_crossings = [step.get('average_crossing_y', 0) for step in self.data['average_distance']]
-
-        plt.figure(figsize=(15, 5))
-
-        # Plot average distances
-        plt.subplot(1, 3, 1)
-        plt.plot(distances, marker='o', linestyle='-', color='b', label='Distance from origin')
-        plt.plot(x_distances, marker='o', linestyle='--', color='g', label='X-Axis Distance')
-        plt.plot(y_distances, marker='o', linestyle=':', color='r', label='Y-Axis Distance')
-        plt.title('Distance Comparisons per Step')
-        plt.xlabel('Step Number')
-        plt.ylabel('Distance')
-        plt.legend(loc='best', shadow=True, fancybox=True)
-
-        # Plot y-axis crossings
-        plt.subplot(1, 3, 2)
-        plt.plot(y_crossings, marker='o', linestyle='-', color='r')
-        plt.title('Y-Axis Crossings per Step')
-        plt.xlabel('Step Number')
-        plt.ylabel('Crossings')
-        plt.ylim(bottom=0)  # Ensure y-axis starts at 0
-
-        # Save the plot to a file or show
-        plt.tight_layout()
-        plt.savefig(path)  # Adjust path as needed
-        plt.close()
+    def summary(self) -> dict[str, Any]:
+        """returns the main numbers of the collected statistics, taken at the last recorded step"""
+        last_step = self.recorded_steps - 1
+        summary: dict[str, Any] = {"steps": self.recorded_steps}
+        for field in STEP_FIELDS:
+            key = "runs_at_last_step" if field == COUNT_FIELD else field
+            summary[key] = self.get_column(field)[last_step].item() if self.recorded_steps else 0
+        summary["average_distance_standard_error"] = \
+            self.get_standard_error("average_distance")[last_step].item() if self.recorded_steps else 0
+        summary["average_steps_to_pass_radius_10"] = self.data[RADIUS_PASS_KEY]["average_steps"]
+        summary["passage_probability_by_radius"] = {
+            radius: self.get_passage_probability(index)[-1].item() if self.recorded_steps else 0
+            for index, radius in enumerate(self.get_passage_radii().tolist())}
+        if self.__distance_sketches:
+            checkpoint = max(self.__distance_sketches)
+            summary["quantile_checkpoint_step"] = checkpoint
+            summary["distance_median"] = self.get_distance_quantile(checkpoint, 0.5)
+            summary["distance_90th_percentile"] = self.get_distance_quantile(checkpoint, 0.9)
+        return summary
 
     def erase_statistics(self) -> None:
-        self.data = {}
+        self.data = self.__default_data()
+        self.__steps = StepAccumulator(VALUE_FIELDS)
+        self.__run_values.clear()
+        self.__distance_sketches.clear()
+        self.__passages = PassageHistogram(self.__passages.radii.tolist())
+        self.__run_start = self.turn_count  # the rest of the current run is recorded from its next step
         self.save_data()
 
-
-# no idea why, but these lines make the window in a much better quality. do not remove them!!
-a = Statistics("stats.json")
-a.make_graph("plot_output.png")
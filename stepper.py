@@ -0,0 +1,108 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, NamedTuple, Optional
+
+from board import Board
+
+DEFAULT_BATCH_STEPS = 1000  # steps made between two snapshots when there is no wait between steps
+PAUSE_POLL_SECONDS = 0.001
+
+
+class StepperSnapshot(NamedTuple):
+    """the latest state the stepper published"""
+    steps: int  # the number of steps made since the stepper started
+    screen: Optional[dict[str, Any]]  # the screen of the board after the last step, None before the first
+    stopped: bool  # True if the walker could not move, and the stepper stopped
+    error: Optional[BaseException]  # the error that stopped the stepper, if one did
+
+
+class BoardStepper:
+    """
+    Makes the steps of a board on a worker thread, so the simulation does not wait for the window to be drawn.
+    After every batch of steps, the stepper publishes the screen of the board into a snapshot. The window reads
+    the latest snapshot at its own frame rate, and never waits for steps to be made.
+
+    While the stepper runs, the board belongs to the worker thread. Anything else that uses the board has to
+    do it inside paused(), which waits for the current batch to end.
+
+    Attributes:
+        __board (Board): The board to step.
+        __step_interval (float): Seconds to wait after every step, 0 to step as fast as possible.
+        __batch_steps (int): The steps made between two snapshots when there is no wait between steps.
+        __board_lock (threading.Lock): Held while the board is used.
+        __snapshot_lock (threading.Lock): Held only while the snapshot is read or replaced.
+        __pause_requested (threading.Event): Set while someone waits in paused(), so the worker lets them in
+            before its next batch instead of taking the board lock again right away.
+        __snapshot (StepperSnapshot): The latest published state.
+        __stop_event (threading.Event): Set to stop the worker thread.
+        __thread (Optional[threading.Thread]): The worker thread, None before start.
+    """
+    def __init__(self, board: Board, step_interval: float = 0.0, batch_steps: int = DEFAULT_BATCH_STEPS):
+        self.__board = board
+        self.__step_interval = step_interval
+        self.__batch_steps = batch_steps if step_interval <= 0 else 1
+        self.__board_lock = threading.Lock()
+        self.__snapshot_lock = threading.Lock()
+        self.__pause_requested = threading.Event()
+        self.__snapshot = StepperSnapshot(0, None, False, None)
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """starts making steps on the worker thread"""
+        if self.__thread is not None:
+            raise RuntimeError("Stepper was already started")
+        self.__thread = threading.Thread(target=self.__run, name="board-stepper", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """stops making steps, and waits for the current batch to end"""
+        self.__stop_event.set()
+        if self.__thread is not None and self.__thread is not threading.current_thread():
+            self.__thread.join()
+
+    def is_running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def get_snapshot(self) -> StepperSnapshot:
+        """returns the latest published state, without waiting for steps"""
+        with self.__snapshot_lock:
+            return self.__snapshot
+
+    @contextmanager
+    def paused(self) -> Iterator[Board]:
+        """gives the board to the caller between two batches of steps"""
+        self.__pause_requested.set()
+        try:
+            with self.__board_lock:
+                yield self.__board
+        finally:
+            self.__pause_requested.clear()
+
+    def __publish(self, steps: int, stopped: bool = False) -> None:
+        """replaces the snapshot, has to be called with the board lock held"""
+        snapshot = StepperSnapshot(steps, self.__board.get_screen(), stopped, None)
+        with self.__snapshot_lock:
+            self.__snapshot = snapshot
+
+    def __run(self) -> None:
+        """the worker thread: makes batches of steps and publishes a snapshot after every one of them"""
+        steps = 0
+        while not self.__stop_event.is_set():
+            with self.__board_lock:
+                try:
+                    for _ in range(self.__batch_steps):
+                        if not self.__board.do_move():
+                            self.__publish(steps, stopped=True)
+                            return
+                        steps += 1
+                    self.__publish(steps)
+                except Exception as error:
+                    with self.__snapshot_lock:
+                        self.__snapshot = self.__snapshot._replace(error=error)
+                    return
+            if self.__step_interval > 0:
+                self.__stop_event.wait(self.__step_interval)
+            while self.__pause_requested.is_set() and not self.__stop_event.is_set():
+                time.sleep(PAUSE_POLL_SECONDS)
@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+from accumulators import *
+
+class TestRunningMoments(unittest.TestCase):
+    def test_add(self):
+        values = [3.0, 5.0, 10.0, 2.0]
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+        self.assertEqual(moments.count, 4)
+        self.assertAlmostEqual(moments.mean, np.mean(values))
+        self.assertAlmostEqual(moments.m2, np.var(values) * len(values))
+
+    def test_merge(self):
+        values = [3.0, 5.0, 10.0, 2.0, 7.0]
+        first, second = RunningMoments(), RunningMoments()
+        for value in values[:2]:
+            first.add(value)
+        for value in values[2:]:
+            second.add(value)
+        first.merge(second)
+        self.assertAlmostEqual(first.mean, np.mean(values))
+        self.assertAlmostEqual(first.m2, np.var(values) * len(values))
+
+    def test_dict(self):
+        moments = RunningMoments(4, 2.5, 3.0)
+        loaded = RunningMoments.from_dict(moments.to_dict())
+        self.assertEqual((loaded.count, loaded.mean, loaded.m2), (4, 2.5, 3.0))
+        self.assertEqual(RunningMoments.from_dict({"total_counts": 2, "sum_steps": 10}).m2, 0,
+                         "Blocks saved without M2 should be read")
+
+class TestStepAccumulator(unittest.TestCase):
+    def make_accumulator(self, runs):
+        accumulator = StepAccumulator(("a", "b"))
+        for run in runs:
+            for step_index, value in enumerate(run):
+                accumulator.add(step_index, (value, -value))
+        return accumulator
+
+    def test_add(self):
+        accumulator = self.make_accumulator([[1, 2, 3], [3, 6]])
+        np.testing.assert_array_equal(accumulator.column(COUNT_FIELD), [2, 2, 1])
+        np.testing.assert_array_equal(accumulator.column("a"), [2, 4, 3])
+        np.testing.assert_array_equal(accumulator.column("b" + M2_SUFFIX), [2, 8, 0])
+        np.testing.assert_array_equal(accumulator.sum("a"), [4, 8, 3])
+
+    def test_grow(self):
+        accumulator = StepAccumulator(("a",))
+        accumulator.add(INITIAL_CAPACITY * 3, (1,))
+        self.assertEqual(accumulator.steps, INITIAL_CAPACITY * 3 + 1)
+
+    def test_merge_is_associative(self):
+        runs = [[1, 2, 3], [3, 6], [0, 1, 5, 8], [2]]
+        whole = self.make_accumulator(runs)
+        left = self.make_accumulator(runs[:1])
+        left.merge(self.make_accumulator(runs[1:2]))
+        left.merge(self.make_accumulator(runs[2:]))
+        right = self.make_accumulator(runs[2:])
+        right.merge(self.make_accumulator(runs[1:2]))
+        right.merge(self.make_accumulator(runs[:1]))
+        for accumulator in (left, right):
+            for name, column in whole.to_arrays().items():
+                np.testing.assert_allclose(accumulator.column(name), column)
+
+    def test_merge_different_fields(self):
+        with self.assertRaises(ValueError):
+            StepAccumulator(("a",)).merge(StepAccumulator(("b",)))
+
+    def test_from_arrays(self):
+        accumulator = StepAccumulator.from_arrays(("a",), {COUNT_FIELD: np.array([2, 1]), "a": np.array([1.5, 2])})
+        self.assertEqual(accumulator.steps, 2)
+        np.testing.assert_array_equal(accumulator.column("a" + M2_SUFFIX), [0, 0], "Missing M2 should be zeros")
+
+class TestPassageHistogram(unittest.TestCase):
+    def test_add_and_merge(self):
+        histogram, other = PassageHistogram((10, 1)), PassageHistogram((1, 10))
+        np.testing.assert_array_equal(histogram.radii, [1, 10], "Radii should be sorted")
+        histogram.add(0, 0)
+        other.add(0, 0)
+        other.add(1, INITIAL_CAPACITY + 5)
+        histogram.merge(other)
+        counts = histogram.get_counts()
+        self.assertEqual(counts.shape, (2, INITIAL_CAPACITY + 6))
+        self.assertEqual((counts[0, 0], counts[1, INITIAL_CAPACITY + 5]), (2, 1))
+
+    def test_merge_different_radii(self):
+        with self.assertRaises(ValueError):
+            PassageHistogram((1,)).merge(PassageHistogram((2,)))
+
+    def test_arrays(self):
+        histogram = PassageHistogram((1, 2))
+        histogram.add(1, 3)
+        loaded = PassageHistogram.from_arrays(histogram.to_arrays())
+        np.testing.assert_array_equal(loaded.get_counts(), histogram.get_counts())
+        self.assertEqual(histogram.to_arrays()[PASSAGE_ENTRIES_KEY].tolist(), [[1, 3, 1]],
+                         "Only the steps that were passed at should be saved")
+
+    def test_dense_arrays(self):
+        counts = np.array([[0, 2, 0], [0, 0, 1]])
+        loaded = PassageHistogram.from_arrays({PASSAGE_RADII_KEY: np.array([1.0, 2.0]), PASSAGE_COUNTS_KEY: counts})
+        np.testing.assert_array_equal(loaded.get_counts(), counts, "Files of older versions should still load")
+
+if __name__ == '__main__':
+    unittest.main()
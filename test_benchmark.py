@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from benchmark import *
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_measure(self):
+        kept = []
+        result = measure(lambda: kept.append(object()), 100, repeat=2)
+        self.assertGreater(result.ns_per_op, 0)
+        self.assertGreaterEqual(result.blocks_per_op, 1, "Objects that are kept should be counted as blocks")
+        self.assertGreater(result.peak_bytes, 0)
+
+    def test_make_field_board(self):
+        board = make_field_board(50, 5)
+        self.assertEqual(len(board.get_obstacles()), 50)
+        self.assertTrue(board.has_portals())
+        self.assertEqual(board.get_obstacles()[0].position, make_field_board(50, 5).get_obstacles()[0].position,
+                         "The field should be the same on every call")
+        self.assertTrue(board.do_move(), "The walker should be able to leave the origin")
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks("statistics_record_step", repeat=1, scale=0.01)
+        self.assertEqual(set(results), {"statistics_record_step[memory]", "statistics_record_step[persistent]"})
+
+    def test_every_benchmark_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for benchmark in BENCHMARKS:
+                operation = benchmark.setup(directory)
+                for _ in range(3):
+                    operation()
+
+    def test_save_and_compare(self):
+        baseline = {"fast": BenchmarkResult(100.0, 0.0, 10), "slow": BenchmarkResult(100.0, 0.0, 10)}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_results(path, baseline)
+            self.assertEqual(load_results(path), baseline)
+        results = {"fast": BenchmarkResult(110.0, 0.0, 10), "slow": BenchmarkResult(200.0, 0.0, 10),
+                   "new": BenchmarkResult(1000.0, 0.0, 10)}
+        self.assertEqual(find_regressions(baseline, results, 0.25), {"slow": 2.0},
+                         "Only benchmarks slower than the tolerance, that have a baseline, should be reported")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,30 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
-from board import Board, Walker, Obstacle, Portal
+import numpy as np
+from board import Board, Walker, Obstacle, Portal, Statistics, MAX_PORTAL_HOPS, MAX_STEP_RETRIES, \
+    obstacle_from_config, portal_from_config
+from trajectory import TrajectoryRecorder, TrajectoryReader
+
+
+class StepWalker(Walker):
+    """a walker that makes the given steps, one after the other, instead of random ones"""
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = list(steps)
+
+    def walk(self):
+        dx, dy = self.steps.pop(0)
+        x, y = self.get_position()
+        self.set_position((x + dx, y + dy))
+
+
+def portal_chain(board, length):
+    """adds portals on the x axis, where the rest of a step of 1 to the right from the origin enters the next one"""
+    for i in range(length):
+        # every portal takes 0.001 of the step, and leaves the walker 0.001 before the next portal
+        board.add_portal(Portal((100.0 * i + 0.001, 0.0), (100.0 * (i + 1), 0.0), 0.00001))
 
 class TestBoard(unittest.TestCase):
     def setUp(self):
@@ -39,6 +63,141 @@ class TestBoard(unittest.TestCase):
         self.walker.get_position.side_effect = [(0, 0), (1, 1), (1, 1)]  # Walker tries to move but can't
         self.assertFalse(self.board.do_move(), "Walker should not move successfully due to an obstacle")
 
+    def test_remove_obstacle(self):
+        self.board.add_obstacle(self.obstacle)
+        self.board.remove_obstacle(self.obstacle)
+        self.assertNotIn(self.obstacle, self.board._Board__obstacles, "Obstacle should be removed from the board")
+        self.assertEqual(self.board.get_screen()["o"], (), "Removed obstacle should not be on screen")
+
+    def test_get_screen(self):
+        self.board.add_obstacle(self.obstacle)
+        self.board.add_portal(Portal((2, -3), (10, 10)))
+        screen = self.board.get_screen()
+        self.assertEqual(screen["s"], (0, 0))
+        self.assertEqual(screen["w"], (4, 4), "Walker location should be relative to the screen")
+        self.assertEqual([dict(o) for o in screen["o"]], [{"location": (5, 5), "size": 0.5}])
+        self.assertEqual([dict(p) for p in screen["p"]], [{"location": (6, 1), "size": 0.3}],
+                         "Only the endpoint on the screen should be returned")
+
+    def test_get_screen_of_position(self):
+        self.board.add_portal(Portal((2, -3), (10, 10)))
+        screen = self.board.get_screen((9, 9))
+        self.assertEqual(screen["s"], (1, 1), "The screen of the given position should be returned")
+        self.assertEqual(screen["w"], (5, 5))
+        self.assertEqual([dict(p) for p in screen["p"]], [{"location": (6, 6), "size": 0.3}])
+
+    def test_get_screen_with_trail(self):
+        screen = self.board.get_screen(trail=[[(0, 0), (-1, 0)], [(5, 0)]])
+        self.assertEqual(screen["t"], (((4, 4), (3, 4)), ((9, 4),)), "The trail should be on the screen of the walker")
+        self.assertNotIn("t", self.board.get_screen(), "There should be no trail when none is given")
+
+    def test_do_moves(self):
+        board = Board(StepWalker([(0, 1), (1, 0), (0, 1)]), Statistics(None))
+        trail = [[board.get_walker_position()]]
+        self.assertEqual(board.do_moves(2, trail), 2)
+        self.assertEqual(trail, [[(0, 0), (0, 1), (1, 1)]], "The position after every step should be added")
+        self.assertEqual(board.do_moves(5), 1, "Moves should stop at the first step that can't be made")
+        self.assertEqual(board.get_statistics().recorded_steps, 3)
+
+    def test_do_moves_trail_through_portal(self):
+        board = Board(StepWalker([(1, 0), (0, 1)]), Statistics(None))
+        portal_chain(board, 1)
+        trail = []
+        self.assertEqual(board.do_moves(2, trail), 2)
+        self.assertEqual([[tuple(np.round(point, 6)) for point in line] for line in trail],
+                         [[(0, 0), (0.001, 0)], [(100, 0), (100.999, 0), (100.999, 1)]],
+                         "The jump through the portal should start a new line")
+
+    def test_stuck_walker_fails(self):
+        board = Board(StepWalker([(1, 0)] * MAX_STEP_RETRIES + [(0, 1)]), Statistics(None))
+        board.add_obstacle(Obstacle(1, 0, 0.5))
+        board.enable_metrics()
+        self.assertFalse(board.do_move(), "A walker whose every step is blocked should stop trying")
+        self.assertEqual(board.get_walker_position(), (0, 0))
+        self.assertEqual(board.metrics()["failed_steps"], 1)
+
+    def test_metrics(self):
+        board = Board(StepWalker([(0, 1), (1, 0), (0, 1)]), Statistics(None))
+        self.assertEqual(board.metrics(), {}, "Metrics should be off by default")
+        board.add_obstacle(Obstacle(1, 1, 0.5))
+        board.enable_metrics()
+        board.do_move()
+        board.do_move()  # (1, 0) passes the obstacle, and is retried with (0, 1)
+        board.do_move()  # no steps are left
+        metrics = board.metrics()
+        self.assertEqual((metrics["steps"], metrics["obstacle_retries"], metrics["failed_steps"]), (2, 1, 1))
+        self.assertEqual(metrics["phases"]["walk"]["count"], 3)
+        self.assertEqual(metrics["phases"]["statistics"]["count"], 2)
+        self.assertEqual(metrics["phases"]["recorder"]["count"], 0, "Nothing is recorded without a recorder")
+        board.enable_metrics(False)
+        self.assertEqual(board.metrics(), {})
+
+    def test_get_screen_is_cached(self):
+        self.board.add_obstacle(self.obstacle)
+        first, second = self.board.get_screen(), self.board.get_screen()
+        self.assertIs(first["o"], second["o"], "Unchanged screen should return the same obstacles")
+        self.assertEqual(first["ov"], second["ov"])
+        self.board.add_obstacle(Obstacle(2, 2, 0.5))
+        third = self.board.get_screen()
+        self.assertNotEqual(first["ov"], third["ov"], "Adding an obstacle should change the version")
+        self.assertEqual(len(third["o"]), 2)
+
+    def test_get_obstacle_at(self):
+        self.board.add_obstacle(self.obstacle)
+        self.board.add_obstacle(Obstacle(1, 1.2, 0.5))
+        self.assertIs(self.board.get_obstacle_at((1, 1)), self.obstacle)
+        self.assertIsNone(self.board.get_obstacle_at((1, 1.1)), "Only an obstacle centered there should be found")
+
+    def test_get_portal_at(self):
+        self.board.add_portal(self.portal)
+        self.assertIs(self.board.get_portal_at((5, 5), (10, 10)), self.portal)
+        self.assertIs(self.board.get_portal_at((10, 10), (5, 5)), self.portal, "Either direction should be found")
+        self.assertIsNone(self.board.get_portal_at((5, 5), (10, 11)))
+
+    def test_elements_from_config(self):
+        obstacle = obstacle_from_config({"x": 1, "y": 2})
+        self.assertEqual((obstacle.position, obstacle.get_size()), ((1, 2), 0.2), "Size should default")
+        portal = portal_from_config({"endpoint1": {"x": 1, "y": 2}, "endpoint2": {"x": 3, "y": 4}, "size": 0.5})
+        self.assertEqual((portal.get_endpoints(), portal.get_size()), (((1, 2), (3, 4)), 0.5))
+
+    def test_remove_portal(self):
+        self.board.add_portal(self.portal)
+        self.board.remove_portal(self.portal)
+        self.assertNotIn(self.portal, self.board._Board__portales, "Portal should be removed from the board")
+        self.assertEqual(self.board.get_screen()["p"], ())
+
+    def test_chained_portals(self):
+        board = Board(StepWalker([(1, 0)]))
+        portal_chain(board, 10)
+        self.assertTrue(board.do_move())
+        x, y = board.get_walker_position()
+        self.assertAlmostEqual(x, 1000 + 1 - 10 * 0.001, msg="The walker should go through the whole chain")
+
+    def test_too_many_chained_portals(self):
+        # with more portals than allowed the step is rejected, and the next step is taken instead
+        board = Board(StepWalker([(1, 0), (-1, 0)]))
+        portal_chain(board, MAX_PORTAL_HOPS + 1)
+        self.assertTrue(board.do_move())
+        self.assertEqual(board.get_walker_position(), (-1, 0))
+
+    def test_recorder(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.traj")
+            board = Board(StepWalker([(0, 1), (1, 0), (0, -1)]), Statistics(None))
+            portal_chain(board, 2)
+            with TrajectoryRecorder(path) as recorder:
+                board.set_recorder(recorder)
+                board.do_move()
+                board.reset_game()
+                board.do_move()
+                board.set_recorder(None)
+                board.do_move()
+            reader = TrajectoryReader(path)
+            np.testing.assert_array_equal(reader.get_runs(), [0, 1], "Steps after the recorder is removed are not kept")
+            self.assertEqual(len(reader.get_segments(0)), 0)
+            self.assertEqual(len(reader.get_segments(1)), 3, "The cuts of a portal step should be recorded")
+            np.testing.assert_allclose(reader.get_positions(1, 2), [[200 + 1 - 2 * 0.001, 0]])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from ensemble import *
+
+class TestWalkerEnsemble(unittest.TestCase):
+    def test_simple_walk(self):
+        ensemble = WalkerEnsemble(100, SIMPLE_WALK)
+        ensemble.walk()
+        np.testing.assert_allclose(ensemble.get_distances(), 1.0, err_msg="Simple walk should move a step of 1")
+
+    def test_square_walk(self):
+        ensemble = WalkerEnsemble(100, SQUARE_WALK)
+        ensemble.run(5)
+        positions = ensemble.get_positions()
+        np.testing.assert_array_equal(positions, np.round(positions), "Square walk should stay on the grid")
+        self.assertTrue(np.all(np.abs(positions).sum(axis=1) <= 5), "Square walk moves one unit per step")
+
+    def test_random_size_walk(self):
+        ensemble = WalkerEnsemble(100, RANDOM_SIZE_WALK)
+        ensemble.walk()
+        distances = ensemble.get_distances()
+        self.assertTrue(np.all((distances >= 0.5) & (distances <= 1.5)), "Step length should be in [0.5, 1.5]")
+
+    def test_preferred_walk(self):
+        ensemble = WalkerEnsemble(100, PREFERRED_WALK)
+        ensemble.walk()
+        np.testing.assert_allclose(ensemble.get_distances(), 1.0, err_msg="Preferred walk should move a step of 1")
+
+    def test_run_calls_back_every_step(self):
+        ensemble = WalkerEnsemble(10)
+        steps = []
+        ensemble.run(3, lambda step, x, y: steps.append(step))
+        self.assertEqual(steps, [1, 2, 3])
+
+    def test_reset(self):
+        ensemble = WalkerEnsemble(10)
+        ensemble.run(3)
+        ensemble.reset()
+        self.assertTrue(np.all(ensemble.get_distances() == 0), "Reset should bring walkers to the origin")
+
+    def test_invalid_walking_method(self):
+        with self.assertRaises(ValueError):
+            WalkerEnsemble(10, 42)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import unittest
+from headless import *
+
+class TestHeadless(unittest.TestCase):
+    def setUp(self):
+        # the board saves its statistics in the working directory, so keep the test inside a temporary one
+        self.previous_directory = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        with open(CONFIG_PATH, 'w') as file:
+            json.dump({"walk_method": SQUARE_WALK, "obstacles": [{"x": 50, "y": 50}],
+                       "portals": [{"endpoint1": {"x": 30, "y": 30}, "endpoint2": {"x": -30, "y": -30}}]}, file)
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+        self.directory.cleanup()
+
+    def test_build_board(self):
+        board = build_board(CONFIG_PATH)
+        self.assertEqual(board.get_walking_method(), SQUARE_WALK, "Walking method should be taken from the config")
+        self.assertEqual(len(board._Board__obstacles), 1, "Obstacles should be taken from the config")
+        self.assertEqual(len(board._Board__portales), 1, "Portals should be taken from the config")
+
+    def test_run_batch(self):
+        board = build_board(CONFIG_PATH)
+        self.assertEqual(run_batch(board, 2, 5), 10, "Every run should make all its steps")
+        summary = board.get_statistics().summary()
+        self.assertEqual(summary["steps"], 5)
+        self.assertEqual(summary["runs_at_last_step"], 2)
+
+    def test_seeded_runs_repeat(self):
+        first = build_board(CONFIG_PATH, Statistics(None))
+        second = build_board(CONFIG_PATH, Statistics(None))
+        run_batch(first, 3, 20, seed=7)
+        run_batch(second, 3, 20, seed=7)
+        np.testing.assert_array_equal(first.get_statistics().get_column("average_distance"),
+                                      second.get_statistics().get_column("average_distance"),
+                                      "Runs with the same seed should make the same steps")
+        self.assertEqual(first.get_statistics().data["seeds"], [{"seed": 7, "first_run": 0, "runs": 3}])
+
+    def test_replay_single_run(self):
+        whole = build_board(CONFIG_PATH, Statistics(None))
+        single = build_board(CONFIG_PATH, Statistics(None))
+        run_batch(whole, 3, 20, seed=7)
+        run_batch(single, 1, 20, seed=7, first_run=2)
+        self.assertEqual(whole.get_walker_position(), single.get_walker_position(),
+                         "A run should be replayable alone from the seed and its index")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from lattice_engine import *
+
+class TestLatticeEngine(unittest.TestCase):
+    def make_board(self, obstacles=()):
+        board = Board(Walker(SQUARE_WALK), Statistics(None))
+        for position in obstacles:
+            board.add_obstacle(Obstacle(*position))
+        return board
+
+    def test_free_walk(self):
+        engine = LatticeEngine(self.make_board(), passage_radii=(1, 2))
+        engine.run(2)
+        np.testing.assert_allclose(engine.get_column("average_distance"), [1, (0 + 4 * 2 + 8 * np.sqrt(2)) / 16])
+        np.testing.assert_allclose(engine.get_column("average_x_axis"), [0.5, 0.75])
+        np.testing.assert_allclose(engine.get_first_passage_probability(0), [1, 0])
+        np.testing.assert_allclose(engine.get_passage_probability(1), [0, 0.25])
+        probabilities, offset = engine.get_distribution()
+        self.assertAlmostEqual(probabilities.sum(), 1)
+        self.assertAlmostEqual(probabilities[offset, offset], 0.25)
+
+    def test_window_grows(self):
+        engine = LatticeEngine(self.make_board(), passage_radii=())
+        engine.run(INITIAL_HALF_SIZE + 5)
+        probabilities, offset = engine.get_distribution()
+        self.assertAlmostEqual(probabilities.sum(), 1)
+        self.assertGreater(offset, INITIAL_HALF_SIZE)
+
+    def test_blocked_moves_are_drawn_again(self):
+        engine = LatticeEngine(self.make_board([(1, 0), (0, 1), (0, -1)]), passage_radii=())
+        engine.run(1)
+        probabilities, offset = engine.get_distribution()
+        self.assertAlmostEqual(probabilities[offset - 1, offset], 1, msg="The only free move should be taken")
+
+    def test_walker_surrounded(self):
+        engine = LatticeEngine(self.make_board([(1, 0), (-1, 0), (0, 1), (0, -1)]), passage_radii=())
+        engine.run(3)
+        probabilities, offset = engine.get_distribution()
+        self.assertAlmostEqual(probabilities[offset, offset], 1, msg="A walker with no free move stays")
+
+    def test_other_walks_rejected(self):
+        with self.assertRaises(ValueError):
+            LatticeEngine(Board(Walker(SIMPLE_WALK), Statistics(None)))
+
+    def test_portals_rejected(self):
+        board = self.make_board()
+        board.add_portal(Portal((5, 5), (-5, -5)))
+        with self.assertRaises(ValueError):
+            LatticeEngine(board)
+
+    def test_generated_field_rejected(self):
+        board = self.make_board()
+        board.set_field(ProceduralField(1, SCREEN_SIZE, portal_density=0))
+        with self.assertRaises(ValueError):
+            LatticeEngine(board)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+from lru_cache import *
+
+class TestLRUCache(unittest.TestCase):
+    def test_made_once(self):
+        cache = LRUCache(2)
+        made = []
+        for key in [(0, 0), (0, 1), (0, 0)]:
+            cache.get(key, lambda: made.append(key) or len(made))
+        self.assertEqual(made, [(0, 0), (0, 1)], "A cached value should not be made again")
+        self.assertEqual(cache.get((0, 0), lambda: 0), 1)
+
+    def test_bounded(self):
+        cache = LRUCache(3)
+        for key in range(10):
+            cache.get(key, lambda: str(key))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual([key in cache for key in (6, 7, 8, 9)], [False, True, True, True])
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_capacity(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+if __name__ == '__main__':
+    unittest.main()
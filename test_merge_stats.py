@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from merge_stats import *
+from statistics import DEFAULT_PASSAGE_RADII
+
+class TestMergeStats(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_file(self, name, positions, passage_radii=DEFAULT_PASSAGE_RADII):
+        path = os.path.join(self.directory.name, name)
+        stats = Statistics(path, passage_radii=passage_radii)
+        for position in positions:
+            stats.record_step(position)
+        return path
+
+    def test_merge_files(self):
+        first = self.make_file("first.npz", [(1, 0), (2, 0)])
+        second = self.make_file("second.npz", [(3, 0)])
+        output = os.path.join(self.directory.name, "merged.npz")
+        merge_files(output, [first, second])
+        merged = Statistics(output)
+        np.testing.assert_array_equal(merged.get_column("count"), [2, 1])
+        np.testing.assert_array_equal(merged.get_column("average_distance"), [2, 2])
+        np.testing.assert_array_equal(merged.get_column("average_distance_m2"), [2, 0])
+        self.assertEqual(Statistics(first).recorded_steps, 2, "Inputs should not be changed")
+
+    def test_append(self):
+        output = self.make_file("merged.npz", [(1, 0)])
+        merge_files(output, [self.make_file("other.npz", [(3, 0)])], append=True)
+        self.assertEqual(Statistics(output).get_column("count")[0], 2)
+
+    def test_merge_other_radii(self):
+        first = self.make_file("first.npz", [(1, 0), (3, 0)], passage_radii=[2, 5])
+        second = self.make_file("second.npz", [(6, 0)], passage_radii=[2, 5])
+        output = os.path.join(self.directory.name, "merged.npz")
+        merge_files(output, [first, second])
+        merged = Statistics(output)
+        np.testing.assert_array_equal(merged.get_passage_radii(), [2, 5], "The radii of the inputs should be kept")
+        np.testing.assert_array_equal(merged.get_passage_histogram(0), [1, 1])
+        np.testing.assert_array_equal(merged.get_passage_histogram(1), [1, 0])
+
+        merge_files(output, [first], append=True)
+        np.testing.assert_array_equal(Statistics(output).get_passage_histogram(0), [1, 2],
+                                      "The radii of the output should be kept when appending")
+
+    def test_missing_input(self):
+        with self.assertRaises(FileNotFoundError):
+            merge_files(os.path.join(self.directory.name, "merged.npz"), ["missing.npz"])
+
+if __name__ == '__main__':
+    unittest.main()
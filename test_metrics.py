@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+from metrics import *
+
+
+class TestStepMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = StepMetrics()
+
+    def test_lap(self):
+        clock = self.metrics.start()
+        clock = self.metrics.lap(WALK_PHASE, clock - 100)
+        self.metrics.lap(WALK_PHASE, clock - 300)
+        walk = self.metrics.snapshot()["phases"][WALK_PHASE]
+        self.assertEqual(walk["count"], 2)
+        self.assertGreaterEqual(walk["total_ns"], 400)
+        self.assertGreaterEqual(walk["max_ns"], 300, "The slowest lap should be kept")
+        self.assertEqual(walk["share"], 1.0, "The only phase that ran should take all the time")
+        self.assertEqual(self.metrics.snapshot()["phases"][PORTALS_PHASE],
+                         {"count": 0, "total_ns": 0, "mean_ns": 0.0, "max_ns": 0, "share": 0.0})
+
+    def test_reset(self):
+        self.metrics.steps = 3
+        self.metrics.lap(STATISTICS_PHASE, self.metrics.start())
+        self.metrics.reset()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["steps"], 0)
+        self.assertEqual(snapshot["phases"][STATISTICS_PHASE]["count"], 0)
+
+    def test_dumper(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.jsonl")
+            dumper = MetricsDumper(self.metrics.snapshot, path, 60)
+            dumper.dump()
+            self.metrics.steps = 5
+            dumper.start()
+            dumper.stop()  # stopping dumps the last snapshot
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+        self.assertEqual([line["steps"] for line in lines], [0, 5])
+        self.assertIn("time", lines[0])
+
+    def test_dumper_interval(self):
+        with self.assertRaises(ValueError):
+            MetricsDumper(self.metrics.snapshot, "metrics.jsonl", 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from parallel_runner import *
+from statistics import Statistics
+from walker import SIMPLE_WALK
+
+class TestParallelRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.directory.name, "config.json")
+        with open(self.config_path, 'w') as file:
+            json.dump({"walk_method": SIMPLE_WALK, "obstacles": [], "portals": []}, file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_split_runs(self):
+        self.assertEqual(split_runs(10, 4), [3, 3, 2, 2])
+        self.assertEqual(split_runs(2, 4), [1, 1], "Workers without runs should be left out")
+
+    def test_run_parallel(self):
+        statistics = Statistics(os.path.join(self.directory.name, "stats.npz"))
+        self.assertEqual(run_parallel(self.config_path, 5, 20, 2, statistics), 100)
+        np.testing.assert_array_equal(statistics.get_column("count"), [5] * 20, "All runs should be merged")
+        np.testing.assert_allclose(statistics.get_column("average_distance")[0], 1.0)
+
+    def test_seeded_result_does_not_depend_on_workers(self):
+        two_workers, three_workers = Statistics(None), Statistics(None)
+        run_parallel(self.config_path, 5, 20, 2, two_workers, seed=11)
+        run_parallel(self.config_path, 5, 20, 3, three_workers, seed=11)
+        np.testing.assert_allclose(two_workers.get_column("average_distance"),
+                                   three_workers.get_column("average_distance"))
+        self.assertEqual(sum(seed["runs"] for seed in two_workers.data["seeds"]), 5, "Every shard records its seed")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import math
+import random
+import unittest
+from board import *
+from procedural import *
+
+
+class TestProceduralField(unittest.TestCase):
+    def setUp(self):
+        self.field = ProceduralField(7, SCREEN_SIZE, obstacle_density=0.1, portal_density=0.02)
+
+    @staticmethod
+    def describe(chunk):
+        return ([obstacle.position for obstacle in chunk.obstacles],
+                [portal.get_endpoints() for portal in chunk.portals])
+
+    def test_same_tile_same_elements(self):
+        other = ProceduralField(7, SCREEN_SIZE, obstacle_density=0.1, portal_density=0.02)
+        for tile in [(3, -2), (0, 0), (-1, 5)]:
+            self.assertEqual(self.describe(self.field.get_chunk(tile)), self.describe(other.get_chunk(tile)),
+                             "A tile should be made the same way whatever was made before it")
+        self.assertNotEqual(self.describe(self.field.get_chunk((3, -2))), self.describe(self.field.get_chunk((-3, 2))))
+        self.assertNotEqual(self.describe(self.field.get_chunk((3, -2))),
+                            self.describe(ProceduralField(8, SCREEN_SIZE, 0.1, 0.02).get_chunk((3, -2))))
+
+    def test_elements_in_their_tile(self):
+        for tile in [(2, 1), (-4, -3)]:
+            chunk = self.field.get_chunk(tile)
+            for obstacle in chunk.obstacles:
+                self.assertTrue(all(abs(location - index * SCREEN_SIZE) <= SCREEN_SIZE / 2
+                                    for location, index in zip(obstacle.position, tile)))
+            for portal in chunk.portals:
+                endpoint1, endpoint2 = portal.get_endpoints()
+                self.assertLessEqual(math.dist(endpoint1, endpoint2), SCREEN_SIZE / 2)
+
+    def test_density(self):
+        tiles = [(x, y) for x in range(10, 20) for y in range(10, 20)]
+        obstacles = sum(len(self.field.get_chunk(tile).obstacles) for tile in tiles)
+        expected = 0.1 * SCREEN_SIZE * SCREEN_SIZE * len(tiles)
+        self.assertLess(abs(obstacles - expected), 5 * math.sqrt(expected))
+
+    def test_origin_is_clear(self):
+        for tile in [(0, 0), (1, 0), (0, -1)]:
+            for obstacle in self.field.get_chunk(tile).obstacles:
+                self.assertGreater(math.hypot(*obstacle.position), CLEAR_RADIUS)
+
+    def test_cache_is_bounded(self):
+        field = ProceduralField(7, SCREEN_SIZE, cache_tiles=4)
+        first = field.get_chunk((0, 0))
+        self.assertIs(field.get_chunk((0, 0)), first, "A tile that was made lately should come from the cache")
+        for x in range(1, 5):
+            field.get_chunk((x, 0))
+        again = field.get_chunk((0, 0))
+        self.assertIsNot(again, first, "The least recently used tile should be dropped")
+        self.assertEqual(self.describe(again), self.describe(first))
+
+    def test_negative_density(self):
+        with self.assertRaises(ValueError):
+            ProceduralField(7, SCREEN_SIZE, obstacle_density=-1)
+
+
+class TestBoardField(unittest.TestCase):
+    def setUp(self):
+        self.walker = Walker(SIMPLE_WALK, random.Random(3))
+        self.board = Board(self.walker, Statistics(None))
+        self.field = ProceduralField(7, SCREEN_SIZE, obstacle_density=0.1, portal_density=0.02)
+
+    def loaded_obstacles(self, tiles):
+        return {obstacle for tile in tiles for obstacle in self.field.get_chunk(tile).obstacles}
+
+    def test_tiles_around_walker(self):
+        self.board.set_field(self.field)
+        near = [(x, y) for x in range(-1, 2) for y in range(-1, 2)]
+        self.assertEqual(set(self.board.get_obstacles()), self.loaded_obstacles(near))
+
+        self.walker.set_position((3 * SCREEN_SIZE, 0))  # as if it walked there
+        self.board.do_move()
+        tile_x, tile_y = (int((location + SCREEN_SIZE / 2) // SCREEN_SIZE)
+                          for location in self.board.get_walker_position())
+        near = [(tile_x + x, tile_y + y) for x in range(-1, 2) for y in range(-1, 2)]
+        self.assertEqual(set(self.board.get_obstacles()), self.loaded_obstacles(near),
+                         "Only the tiles around the walker should be on the board")
+
+    def test_screen_away_from_walker(self):
+        obstacle = Obstacle(5 * SCREEN_SIZE + 1, 1)
+        self.board.add_obstacle(obstacle)
+        self.board.set_field(self.field)
+        for tile in [(5, 0), (1, 0), (-3, 2)]:
+            screen = self.board.get_screen((tile[0] * SCREEN_SIZE, tile[1] * SCREEN_SIZE))
+            chunk = self.field.get_chunk(tile)
+            expected = [obstacle.position for obstacle in chunk.obstacles]
+            if tile == (5, 0):
+                expected.insert(0, obstacle.position)
+            self.assertEqual(sorted(tuple(view[LOCATION_KEY]) for view in screen["o"]),
+                             sorted((x - (tile[0] - 0.5) * SCREEN_SIZE, y - (tile[1] - 0.5) * SCREEN_SIZE)
+                                    for x, y in expected),
+                             "A screen away from the walker should show the obstacles of the field there")
+            neighbours = [(tile[0] + dx, tile[1] + dy) for dx in range(-1, 2) for dy in range(-1, 2)]
+            endpoints = [endpoint for neighbour in neighbours for portal in self.field.get_chunk(neighbour).portals
+                         for endpoint in portal.get_endpoints()
+                         if all(abs(location / SCREEN_SIZE - index) <= 0.5 for location, index in zip(endpoint, tile))]
+            self.assertEqual(len(screen["p"]), len(endpoints))
+        self.assertTrue(self.field.get_chunk((5, 0)).obstacles, "The test should have obstacles to show")
+        self.assertIs(self.board.get_screen()["o"], self.board.get_screen()["o"],
+                      "The screen of the walker should still come ready from the screen index")
+
+    def test_elements_added_by_hand_stay(self):
+        obstacle = Obstacle(1, 1)
+        self.board.add_obstacle(obstacle)
+        self.board.set_field(self.field)
+        self.board.set_field(None)
+        self.assertEqual(self.board.get_obstacles(), (obstacle,))
+        self.assertFalse(self.board.has_portals())
+
+    def test_long_walk(self):
+        self.board.set_field(ProceduralField(7, SCREEN_SIZE, cache_tiles=16))
+        self.assertEqual(self.board.do_moves(2000), 2000)
+        tile_x, tile_y = (int((location + SCREEN_SIZE / 2) // SCREEN_SIZE)
+                          for location in self.board.get_walker_position())
+        self.assertTrue(all(self.board.get_obstacle_at(obstacle.position) is None
+                            for obstacle in self.board.get_obstacles()),
+                        "The obstacles of the field should not be found as added by hand")
+        for obstacle in self.board.get_obstacles():
+            self.assertTrue(all(abs(location / SCREEN_SIZE - index) <= 1.5
+                                for location, index in zip(obstacle.position, (tile_x, tile_y))))
+
+    def test_find_elements_added_by_hand(self):
+        self.board.set_field(self.field)
+        field_obstacle = self.board.get_obstacles()[0]
+        self.assertIsNone(self.board.get_obstacle_at(field_obstacle.position))
+        obstacle = Obstacle(*field_obstacle.position)
+        self.board.add_obstacle(obstacle)
+        self.assertIs(self.board.get_obstacle_at(field_obstacle.position), obstacle,
+                      "Only the obstacle added by hand should be found")
+        field_portal = next(portal for chunk in (self.field.get_chunk((x, y)) for x in range(-1, 2)
+                                                 for y in range(-1, 2)) for portal in chunk.portals)
+        self.assertIsNone(self.board.get_portal_at(*field_portal.get_endpoints()))
+
+    def test_from_config(self):
+        config = {'obstacles': [], 'portals': [], 'procedural': {'seed': 7, 'obstacle_density': 0.1}}
+        self.assertFalse(self.board.load_game_elements(config))
+        field = self.board.get_field()
+        self.assertEqual((field.seed, field.obstacle_density, field.portal_density),
+                         (7, 0.1, DEFAULT_PORTAL_DENSITY))
+        self.assertTrue(self.board.get_obstacles())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import math
+import random
+import unittest
+from quantile_sketch import *
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles_within_accuracy(self):
+        rng = random.Random(3)
+        values = sorted(rng.expovariate(0.1) for _ in range(10000))
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), DEFAULT_RELATIVE_ACCURACY * exact * 1.0001)
+
+    def test_zero(self):
+        sketch = QuantileSketch()
+        for value in (0, 0, 0, 5):
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.5), 0)
+        self.assertTrue(math.isnan(QuantileSketch().quantile(0.5)), "An empty sketch has no quantiles")
+
+    def test_merge(self):
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in range(1, 101):
+            whole.add(value)
+            (first if value % 2 else second).add(value)
+        first.merge(second)
+        self.assertEqual(first.to_dict(), whole.to_dict(), "Merging should be exact")
+
+    def test_bounded_buckets(self):
+        sketch = QuantileSketch(max_buckets=10)
+        for value in range(1, 1000):
+            sketch.add(value)
+        self.assertLessEqual(len(sketch.to_dict()["buckets"]), 10)
+        self.assertAlmostEqual(sketch.quantile(0.99), 989, delta=989 * DEFAULT_RELATIVE_ACCURACY)
+
+    def test_dict(self):
+        sketch = QuantileSketch()
+        sketch.add(2.5)
+        self.assertEqual(QuantileSketch.from_dict(sketch.to_dict()).quantile(0.5), sketch.quantile(0.5))
+
+if __name__ == '__main__':
+    unittest.main()
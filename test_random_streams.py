@@ -0,0 +1,25 @@
+import unittest
+from random_streams import *
+
+class TestRandomStreams(unittest.TestCase):
+    def test_run_streams_match_spawn(self):
+        children = np.random.SeedSequence(5).spawn(3)
+        self.assertEqual(run_seed_sequence(5, 2).generate_state(4).tolist(), children[2].generate_state(4).tolist(),
+                         "A run stream should be the child of its index")
+
+    def test_streams_repeat(self):
+        self.assertEqual(make_random(run_seed_sequence(5, 1)).random(), make_random(run_seed_sequence(5, 1)).random())
+        self.assertEqual(make_generator(run_seed_sequence(5, 1)).random(),
+                         make_generator(run_seed_sequence(5, 1)).random())
+
+    def test_runs_differ(self):
+        self.assertNotEqual(make_random(run_seed_sequence(5, 0)).random(), make_random(run_seed_sequence(5, 1)).random(),
+                            "Different runs should get different streams")
+
+    def test_new_root_seed(self):
+        self.assertIsInstance(new_root_seed(), int)
+        seed = new_root_seed()
+        self.assertEqual(np.random.SeedSequence(seed).entropy, seed, "The seed should be the drawn entropy itself")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from reporting import *
+
+
+class TestReporting(unittest.TestCase):
+    def test_make_graph(self):
+        statistics = Statistics(None)
+        for position in [(1, 0), (1, 1), (0, 1), (-1, 1)]:
+            statistics.record_step(position)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.png")
+            make_graph(statistics, path)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n", "The graph should be saved as a png")
+
+    def test_decimate(self):
+        values = np.sin(np.arange(10000) / 100.0)
+        values[5000] = 10.0
+        indexes, kept = decimate(values, 500)
+        self.assertEqual(len(indexes), 500)
+        self.assertEqual((indexes[0], indexes[-1]), (0, 9999), "The first and the last points should be kept")
+        self.assertTrue(np.all(np.diff(indexes) > 0), "The points should stay in order")
+        self.assertIn(5000, indexes, "A spike should be kept")
+        np.testing.assert_array_equal(kept, values[indexes])
+
+    def test_decimate_short_series(self):
+        values = np.arange(10.0)
+        indexes, kept = decimate(values, 20)
+        np.testing.assert_array_equal(indexes, np.arange(10), "A short series should be kept whole")
+        with self.assertRaises(ValueError):
+            decimate(values, 2)
+
+    def test_graph_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            statistics_path = os.path.join(directory, "stats.npz")
+            statistics = Statistics(statistics_path)
+            for position in [(1, 0), (1, 1), (0, 1)]:
+                statistics.record_step(position)
+            statistics.flush()
+            image_path = os.path.join(directory, "graph.png")
+            export = GraphExport(statistics_path, image_path)
+            export.join(60)
+            messages = export.poll()
+            self.assertEqual(messages[-1], (DONE_MESSAGE, image_path), f"Export should succeed: {messages}")
+            self.assertEqual(messages[-2], (PROGRESS_MESSAGE, 1.0, "done"))
+            self.assertTrue(os.path.exists(image_path))
+
+    def test_import_has_no_side_effects(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # a clean interpreter, so modules other tests loaded don't count
+            code = "import sys, board, headless; print('matplotlib' in sys.modules)"
+            output = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True,
+                                    env={**os.environ, "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))},
+                                    check=True).stdout
+            self.assertEqual(output.strip(), "False", "matplotlib should be loaded only when a graph is made")
+            self.assertEqual(os.listdir(directory), [], "Importing should not write any file")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from spatial_index import *
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        self.index = SpatialHash(1.0)
+        self.index.insert("near", (0.5, 0.5), 0.2)
+        self.index.insert("big", (3, 3), 1.5)
+        self.index.insert("far", (100, -100), 0.2)
+
+    def test_query_segment(self):
+        self.assertEqual(self.index.query_segment((0, 0), (0.9, 0.9)), ["near"], "Only items near the segment")
+        self.assertIn("big", self.index.query_segment((1.6, 1.6), (1.9, 1.9)), "Radius should be covered")
+        self.assertEqual(self.index.query_segment((50, 50), (51, 51)), [], "Empty area should return nothing")
+
+    def test_query_point(self):
+        self.assertEqual(self.index.query_point((100.1, -99.9)), ["far"])
+
+    def test_no_duplicates(self):
+        self.assertEqual(self.index.query_box(0, 0, 5, 5).count("big"), 1, "An item is returned once")
+
+    def test_remove(self):
+        self.index.remove("big")
+        self.assertNotIn("big", self.index)
+        self.assertEqual(self.index.query_box(0, 0, 5, 5), ["near"])
+        self.assertEqual(len(self.index), 2)
+
+    def test_insert_twice(self):
+        with self.assertRaises(ValueError):
+            self.index.insert("near", (0, 0), 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from sprite_cache import *
+
+class TestSpriteCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SpriteCache(2)
+        self.made = []
+
+    def make(self, name):
+        def make_sprite():
+            self.made.append(name)
+            return name
+        return make_sprite
+
+    def test_prepared_once(self):
+        self.assertEqual(self.cache.get(("stone", 5), self.make("a")), "a")
+        self.assertEqual(self.cache.get(("stone", 5), self.make("b")), "a", "Cached sprite should be returned")
+        self.assertEqual(self.made, ["a"], "Sprite should be prepared only once")
+
+    def test_least_recently_used_is_dropped(self):
+        self.cache.get(1, self.make("a"))
+        self.cache.get(2, self.make("b"))
+        self.cache.get(1, self.make("a"))  # 2 is now the least recently used
+        self.cache.get(3, self.make("c"))
+        self.assertIn(1, self.cache)
+        self.assertNotIn(2, self.cache, "Least recently used sprite should be dropped")
+        self.assertEqual(len(self.cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
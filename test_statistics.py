@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from statistics import *
+
+class TestStatistics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "stats.npz")
+        self.legacy_file_path = os.path.join(self.directory.name, "stats.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def saved_steps(self):
+        with np.load(self.file_path) as file:
+            return len(file["count"])
+
+    def test_record_step(self):
+        stats = Statistics(self.file_path)
+        stats.record_step((3, 4))
+        self.assertEqual(stats.get_column("average_distance")[0], 5, "Distance from the origin should be recorded")
+        self.assertEqual(stats.get_column("average_x_axis")[0], 4)
+        self.assertEqual(stats.get_column("average_y_axis")[0], 3)
+        self.assertEqual(self.saved_steps(), 1, "Every step is saved by default")
+
+    def test_columns_grow(self):
+        stats = Statistics(self.file_path, flush_steps=10 ** 6)
+        for step in range(1, INITIAL_CAPACITY + 11):
+            stats.record_step((step, 0))
+        np.testing.assert_array_equal(stats.get_column("average_distance"), np.arange(1, INITIAL_CAPACITY + 11))
+
+    def test_save_and_load(self):
+        stats = Statistics(self.file_path)
+        stats.record_step((1, 0))
+        stats.reset_statistics()
+        stats.record_step((-1, 0))
+        loaded = Statistics(self.file_path)
+        self.assertEqual(loaded.recorded_steps, 1)
+        self.assertEqual(loaded.get_column("count")[0], 2, "Both runs should be counted in the saved file")
+        self.assertEqual(loaded.get_column("average_distance")[0], 1)
+
+    def test_import_legacy_file(self):
+        with open(self.legacy_file_path, 'w') as file:
+            json.dump({"initial_position": [0, 0],
+                       "average_distance": [{"count": 2, "average_distance": 1.5, "average_x_axis": 0.5,
+                                             "average_y_axis": 1, "average_crossing_y": 0}],
+                       "steps_to_pass_radius_10": {"total_counts": 1, "sum_steps": 20, "average_steps": 20}}, file)
+        stats = Statistics(self.file_path, legacy_file_path=self.legacy_file_path)
+        self.assertEqual(stats.get_column("average_distance")[0], 1.5, "Legacy steps should be imported")
+        self.assertEqual(stats.data["steps_to_pass_radius_10"]["sum_steps"], 20)
+        self.assertTrue(os.path.exists(self.file_path), "The imported data should be saved in the new format")
+
+    def test_merge(self):
+        stats, other = Statistics(None), Statistics(None)
+        stats.record_step((1, 0))
+        stats.record_step((2, 0))
+        other.record_step((3, 0))
+        other.record_step((11, 0))
+        other.record_step((12, 0))
+        stats.merge(other)
+        np.testing.assert_array_equal(stats.get_column("count"), [2, 2, 1])
+        np.testing.assert_array_equal(stats.get_column("average_distance"), [2, 6.5, 12])
+        self.assertEqual(stats.data["steps_to_pass_radius_10"]["average_steps"], 2, "Radius passes should be merged")
+
+    def test_spread(self):
+        stats = Statistics(None)
+        stats.record_step((1, 0))
+        self.assertEqual(stats.get_column("average_distance")[0], 1, "A run can be read in the middle")
+        stats.record_step((2, 0))
+        stats.reset_statistics()
+        stats.record_step((3, 0))
+        stats.record_step((6, 0))
+        np.testing.assert_array_equal(stats.get_column("average_distance"), [2, 4])
+        np.testing.assert_array_equal(stats.get_column("average_distance" + M2_SUFFIX), [2, 8])
+
+    def test_merge_radius_spread(self):
+        stats, other = Statistics(None), Statistics(None)
+        for target, steps in ((stats, 10), (other, 12)):
+            for step in range(1, steps + 1):
+                target.record_step((step * 10 / steps, 0))
+        stats.merge(other)
+        radius_stats = stats.data[RADIUS_PASS_KEY]
+        self.assertEqual((radius_stats["average_steps"], radius_stats["m2_steps"]), (11, 2))
+
+    def test_confidence_interval(self):
+        stats = Statistics(None)
+        for distance in (1, 3):
+            stats.record_step((distance, 0))
+            stats.reset_statistics()
+        np.testing.assert_array_equal(stats.get_variance("average_distance"), [2])
+        low, high = stats.get_confidence_interval("average_distance")
+        np.testing.assert_allclose([low[0], high[0]], [2 - CONFIDENCE_Z, 2 + CONFIDENCE_Z])
+
+    def test_distance_quantiles(self):
+        stats = Statistics(self.file_path, track_quantiles=True)
+        for distance in range(1, 102):
+            for step in range(1, 5):
+                stats.record_step((distance, 0))
+            stats.reset_statistics()
+        self.assertEqual(stats.get_quantile_checkpoints(), [1, 2, 4], "Only the powers of 2 are checkpoints")
+        self.assertAlmostEqual(stats.get_distance_quantile(4, 0.5), 51, delta=0.51)
+        loaded = Statistics(self.file_path)
+        self.assertEqual(loaded.get_distance_quantile(4, 0.5), stats.get_distance_quantile(4, 0.5))
+        loaded.merge(stats)
+        self.assertAlmostEqual(loaded.get_distance_quantile(1, 0.9), 91, delta=0.91)
+
+    def test_first_passages(self):
+        stats = Statistics(self.file_path, passage_radii=(1, 3, 5))
+        for position in ((1, 0), (2, 0), (6, 0), (0, 0)):
+            stats.record_step(position)
+        stats.reset_statistics()
+        stats.record_step((4, 0))
+        loaded = Statistics(self.file_path, passage_radii=(2,))
+        np.testing.assert_array_equal(loaded.get_passage_radii(), [1, 3, 5], "The radii of the file should be kept")
+        np.testing.assert_array_equal(loaded.get_passage_histogram(0), [2, 0, 0, 0])
+        np.testing.assert_array_equal(loaded.get_passage_histogram(1), [1, 0, 1, 0])
+        np.testing.assert_array_equal(loaded.get_passage_probability(2), [0, 0, 0.5, 0.5])
+
+    def test_in_memory(self):
+        stats = Statistics(None)
+        stats.record_step((1, 0))
+        stats.flush()
+        self.assertEqual(os.listdir(self.directory.name), [], "Statistics without a file should not be saved")
+
+    def test_write_behind(self):
+        stats = Statistics(self.file_path, flush_steps=3)
+        stats.record_step((1, 0))
+        stats.record_step((2, 0))
+        self.assertFalse(os.path.exists(self.file_path), "Steps should be kept in memory until the interval")
+        stats.record_step((3, 0))
+        self.assertEqual(self.saved_steps(), 3, "Steps should be saved when the interval is reached")
+
+    def test_reset_flushes(self):
+        stats = Statistics(self.file_path, flush_steps=100)
+        stats.record_step((1, 0))
+        stats.reset_statistics()
+        self.assertEqual(self.saved_steps(), 1, "Reset should save the steps kept in memory")
+        stats.record_step((0, 1))
+        self.assertEqual(stats.get_column("count")[0], 2, "A new run should add to the same steps")
+
+    def test_flush_cost_bounded(self):
+        stats = Statistics(self.file_path, flush_steps=100, flush_growth=0.5)
+        written_rows = []
+        save_data = stats.save_data
+
+        def counted_save_data():
+            written_rows.append(stats.recorded_steps)
+            save_data()
+        stats.save_data = counted_save_data
+        steps = 20000
+        for step in range(steps):
+            stats.record_step((step, 0))
+        self.assertLess(len(written_rows), 20, "The file should be written less often as it grows")
+        self.assertLess(sum(written_rows), 4 * steps, "All the writes together should take time in proportion "
+                                                      "to the steps")
+        stats.flush()
+        self.assertEqual(self.saved_steps(), steps)
+
+    def test_no_temporary_files_left(self):
+        stats = Statistics(self.file_path)
+        stats.record_step((1, 0))
+        self.assertEqual(os.listdir(self.directory.name), ["stats.npz"], "Only the statistics file should remain")
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, STATISTICS_FILE_MODE)
+
+    def test_failed_save_cleans_up(self):
+        stats = Statistics(self.file_path)
+        stats.record_step((1, 0))
+        stats.data["unsaved"] = object()  # the metadata can't be written as json
+        with self.assertRaises(TypeError):
+            stats.save_data()
+        self.assertEqual(os.listdir(self.directory.name), ["stats.npz"], "The temporary file should be deleted")
+        self.assertEqual(self.saved_steps(), 1, "The old file should be kept")
+        del stats.data["unsaved"]
+
+if __name__ == '__main__':
+    unittest.main()
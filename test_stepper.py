@@ -0,0 +1,97 @@
+import time
+import unittest
+from unittest.mock import Mock
+from board import Board, Walker, Statistics, SQUARE_WALK
+from stepper import BoardStepper
+
+WAIT_SECONDS = 5
+
+
+class LimitedWalker(Walker):
+    """a walker that makes the given number of steps to the right, and then can't move anymore"""
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+
+    def walk(self):
+        if self.steps == 0:
+            raise RuntimeError("no steps left")
+        self.steps -= 1
+        x, y = self.get_position()
+        self.set_position((x + 1, y))
+
+
+def wait_for(condition):
+    """waits until the condition holds, or fails after WAIT_SECONDS"""
+    deadline = time.monotonic() + WAIT_SECONDS
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition was not met in time")
+        time.sleep(0.001)
+
+
+class TestBoardStepper(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(Walker(SQUARE_WALK), Statistics(None))
+
+    def test_snapshot_advances(self):
+        stepper = BoardStepper(self.board, batch_steps=10)
+        self.assertIsNone(stepper.get_snapshot().screen, "Nothing should be published before the first batch")
+        stepper.start()
+        try:
+            wait_for(lambda: stepper.get_snapshot().steps >= 100)
+        finally:
+            stepper.stop()
+        snapshot = stepper.get_snapshot()
+        self.assertFalse(stepper.is_running(), "Stop should wait for the worker thread")
+        self.assertEqual(snapshot.steps % 10, 0, "Snapshots should be published after whole batches")
+        self.assertEqual(snapshot.screen, self.board.get_screen(),
+                         "The screen after the last batch should be published")
+        self.assertFalse(snapshot.stopped)
+        self.assertIsNone(snapshot.error)
+
+    def test_stopped_when_walker_cant_move(self):
+        board = Board(LimitedWalker(25), Statistics(None))
+        stepper = BoardStepper(board, batch_steps=10)
+        stepper.start()
+        wait_for(lambda: not stepper.is_running())
+        snapshot = stepper.get_snapshot()
+        self.assertTrue(snapshot.stopped, "The stepper should stop when the walker can't move")
+        self.assertEqual(snapshot.steps, 25)
+        self.assertEqual(board.get_walker_position(), (25, 0))
+        self.assertEqual(snapshot.screen, board.get_screen(), "The last position should be published")
+
+    def test_error_is_published(self):
+        board = Mock(spec=Board)
+        board.do_move.side_effect = ValueError("broken board")
+        stepper = BoardStepper(board)
+        stepper.start()
+        wait_for(lambda: not stepper.is_running())
+        self.assertIsInstance(stepper.get_snapshot().error, ValueError)
+
+    def test_paused_gives_the_board(self):
+        stepper = BoardStepper(self.board, batch_steps=10)
+        stepper.start()
+        try:
+            wait_for(lambda: stepper.get_snapshot().steps > 0)
+            with stepper.paused() as board:
+                self.assertIs(board, self.board)
+                position = board.get_walker_position()
+                time.sleep(0.01)
+                self.assertEqual(board.get_walker_position(), position,
+                                 "No steps should be made while the board is paused")
+        finally:
+            stepper.stop()
+
+    def test_start_twice(self):
+        stepper = BoardStepper(self.board)
+        stepper.start()
+        try:
+            with self.assertRaises(RuntimeError):
+                stepper.start()
+        finally:
+            stepper.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
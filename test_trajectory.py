@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from trajectory import *
+
+class TestTrajectory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.traj")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_and_read(self):
+        with TrajectoryRecorder(self.path, buffer_steps=2) as recorder:
+            recorder.start_run()
+            recorder.record_step((1, 0))
+            recorder.record_step((1, 1), [((1, 0), (1, 0.5)), ((4, 4), (4, 4.5))])
+            recorder.start_run()
+            recorder.start_run()
+            recorder.record_step((0, -1))
+        reader = TrajectoryReader(self.path)
+        self.assertEqual(len(reader), 3)
+        np.testing.assert_array_equal(reader.get_positions(1, 3), [[1, 1], [0, -1]])
+        np.testing.assert_array_equal(reader.get_runs(), [0, 0, 1], "Runs without steps should not be counted")
+        np.testing.assert_array_equal(reader.get_run_starts(), [0, 2])
+        self.assertEqual(len(reader.get_segments(0)), 0, "A straight step has no segments")
+        np.testing.assert_array_equal(reader.get_segments(1)["src_x"], [1, 4])
+
+    def test_views_are_read_only(self):
+        with TrajectoryRecorder(self.path) as recorder:
+            recorder.record_step((1, 0))
+        positions = TrajectoryReader(self.path).get_positions()
+        with self.assertRaises(ValueError):
+            positions[0, 0] = 5
+
+    def test_cut_record_is_left_out(self):
+        with TrajectoryRecorder(self.path) as recorder:
+            recorder.record_step((1, 0))
+            recorder.record_step((2, 0))
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 3)
+        self.assertEqual(len(TrajectoryReader(self.path)), 1)
+
+    def test_player(self):
+        with TrajectoryRecorder(self.path) as recorder:
+            for step in range(1, 8):
+                recorder.record_step((step, 0))
+        player = TrajectoryPlayer(TrajectoryReader(self.path), frame_skip=3)
+        self.assertEqual([player.next_position() for _ in range(4)], [(3, 0), (6, 0), (7, 0), None],
+                         "Every frame should show the last of its steps, and the last step should be shown")
+        self.assertEqual(player.seek(1), (1, 0), "Seeking should return the step shown until the next frame")
+        self.assertEqual(player.next_position(), (4, 0))
+        self.assertIsNone(player.seek(0))
+        player.seek(100)
+        self.assertTrue(player.is_done(), "Seeking is kept inside the recording")
+
+    def test_not_a_trajectory(self):
+        with open(self.path, 'wb') as file:
+            file.write(b"something else entirely")
+        with self.assertRaises(ValueError):
+            TrajectoryReader(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
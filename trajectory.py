@@ -0,0 +1,216 @@
+import os
+from typing import BinaryIO, Optional, Sequence
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from walker import Position
+
+MAGIC = b"RWTRAJ01"  # the first bytes of a trajectory file
+SEGMENTS_MAGIC = b"RWSEGS01"  # the first bytes of its segments file
+SEGMENTS_SUFFIX = ".segments"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("record_size", "<u4"), ("reserved", "<u4")])
+
+# one record per step: where the walker ended, the run it belongs to, and its portal cut segments if it went
+# through portals, as a range in the segments file
+STEP_DTYPE = np.dtype([("x", "<f8"), ("y", "<f8"), ("run", "<u4"), ("segment_count", "<u4"),
+                       ("first_segment", "<u8")])
+SEGMENT_DTYPE = np.dtype([("src_x", "<f8"), ("src_y", "<f8"), ("dst_x", "<f8"), ("dst_y", "<f8")])
+BUFFER_STEPS = 65536
+
+
+def _write_header(file: BinaryIO, magic: bytes, dtype: np.dtype) -> None:
+    np.array([(magic, dtype.itemsize, 0)], dtype=HEADER_DTYPE).tofile(file)
+
+
+def _map_records(path: str, magic: bytes, dtype: np.dtype) -> np.ndarray:
+    """maps the records of a file for reading, after checking its header. a record that was cut in the middle,
+    for example by a crash, is left out"""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header[0]["magic"] != magic or header[0]["record_size"] != dtype.itemsize:
+        raise ValueError(f"Not a trajectory file of this version: {path}")
+    count = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+class TrajectoryRecorder:
+    """
+    Appends the position of every step of a board to a binary file of fixed size records (see STEP_DTYPE), so
+    the runs can be analysed later without running them again. When a step goes through portals, the segments
+    it was cut into are appended to a second file, path + SEGMENTS_SUFFIX, and the step record points at them.
+
+    The steps are kept in a buffer and written in chunks. The recorder should be closed, or used in a with
+    statement, so the last chunk is written.
+
+    Attributes:
+        path (str): The path of the trajectory file.
+        steps (int): The number of steps that were recorded.
+        __run (int): The index of the current run, the first run is 0.
+        __run_steps (int): The number of steps of the current run.
+        __buffer (list[tuple]): The steps that were not written yet, as the fields of STEP_DTYPE.
+        __buffer_steps (int): The number of steps that are written together.
+        __segments (list[tuple[float, float, float, float]]): The segments that were not written yet.
+        __segment_count (int): The number of segments that were recorded.
+    """
+    def __init__(self, path: str, buffer_steps: int = BUFFER_STEPS):
+        self.path = path
+        self.steps = 0
+        self.__run = 0
+        self.__run_steps = 0
+        self.__buffer: list[tuple[float, float, int, int, int]] = []
+        self.__buffer_steps = buffer_steps
+        self.__segments: list[tuple[float, float, float, float]] = []
+        self.__segment_count = 0
+        self.__file = open(path, 'wb')
+        self.__segments_file = open(path + SEGMENTS_SUFFIX, 'wb')
+        _write_header(self.__file, MAGIC, STEP_DTYPE)
+        _write_header(self.__segments_file, SEGMENTS_MAGIC, SEGMENT_DTYPE)
+
+    def start_run(self) -> None:
+        """the steps from now on belong to a new run. a run with no steps is not counted"""
+        if self.__run_steps > 0:
+            self.__run += 1
+            self.__run_steps = 0
+
+    def record_step(self, position: Position, segments: Optional[Sequence[tuple[Position, Position]]] = None) -> None:
+        """
+        appends one step
+        :param position: where the walker ended the step
+        :param segments: the segments the step was cut into by portals, None for a step that went straight
+        """
+        if segments:
+            self.__buffer.append((position[0], position[1], self.__run, len(segments), self.__segment_count))
+            self.__segments.extend((*src, *dst) for src, dst in segments)
+            self.__segment_count += len(segments)
+        else:
+            self.__buffer.append((position[0], position[1], self.__run, 0, 0))
+        self.__run_steps += 1
+        self.steps += 1
+        if len(self.__buffer) >= self.__buffer_steps:
+            self.flush()
+
+    def flush(self) -> None:
+        """writes the buffered steps and segments to the files"""
+        if self.__buffer:
+            np.array(self.__buffer, dtype=STEP_DTYPE).tofile(self.__file)
+            self.__buffer.clear()
+        if self.__segments:
+            np.array(self.__segments, dtype=np.float64).tofile(self.__segments_file)
+            self.__segments.clear()
+        self.__file.flush()
+        self.__segments_file.flush()
+
+    def close(self) -> None:
+        """writes what is left and closes the files"""
+        if self.__file.closed:
+            return
+        self.flush()
+        self.__file.close()
+        self.__segments_file.close()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Reads a file written by TrajectoryRecorder. The file is memory mapped, so the steps are read from the disk
+    only when they are used, and every method returns numpy views over a range of steps instead of copies.
+
+    Attributes:
+        path (str): The path of the trajectory file.
+        __steps (np.ndarray): The mapped step records.
+        __segments (np.ndarray): The mapped segment records.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.__steps = _map_records(path, MAGIC, STEP_DTYPE)
+        self.__segments = _map_records(path + SEGMENTS_SUFFIX, SEGMENTS_MAGIC, SEGMENT_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.__steps)
+
+    def get_records(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """returns a read only view of the step records of a range of steps, with the fields of STEP_DTYPE"""
+        return self.__steps[start:stop]
+
+    def get_positions(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """returns a read only view of the positions of a range of steps, a row of x and y per step"""
+        return structured_to_unstructured(self.__steps[start:stop][["x", "y"]], copy=False)
+
+    def get_runs(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """returns a read only view of the run index of every step of a range"""
+        return self.__steps[start:stop]["run"]
+
+    def get_run_starts(self) -> np.ndarray:
+        """returns the index of the first step of every run. reads the run of every step, in chunks"""
+        starts = [np.zeros(1, dtype=np.int64)] if len(self.__steps) else []
+        for chunk_start in range(0, len(self.__steps), BUFFER_STEPS):
+            runs = self.__steps[max(chunk_start - 1, 0):chunk_start + BUFFER_STEPS]["run"]
+            changes = np.flatnonzero(runs[1:] != runs[:-1]) + 1 + max(chunk_start - 1, 0)
+            starts.append(changes)
+        return np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+
+    def get_segments(self, step: int) -> np.ndarray:
+        """
+        returns the segments a step was cut into by portals
+        :param step: the index of the step
+        :return: a read only view of the segments, with the fields of SEGMENT_DTYPE, empty if the step went
+        straight
+        """
+        record = self.__steps[step]
+        first = int(record["first_segment"])
+        return self.__segments[first:first + int(record["segment_count"])]
+
+
+class TrajectoryPlayer:
+    """
+    Plays a recorded trajectory back one frame at a time. With a frame skip of k, a frame moves k steps forward
+    and only the last of them is shown, so long runs can be reviewed quickly. The steps that are skipped are never
+    read from the file.
+
+    Attributes:
+        reader (TrajectoryReader): The recorded trajectory.
+        frame_skip (int): The number of steps every frame moves forward.
+        step (int): The index of the first step of the next frame.
+    """
+    def __init__(self, reader: TrajectoryReader, frame_skip: int = 1, start_step: int = 0):
+        if frame_skip <= 0:
+            raise ValueError("Frame skip must be positive")
+        self.reader = reader
+        self.frame_skip = frame_skip
+        self.step = 0
+        self.seek(start_step)
+
+    def seek(self, step: int) -> Optional[Position]:
+        """
+        the next frame starts at the given step, it is kept inside the recording
+        :param step: the first step of the next frame
+        :return: the position of the step before it, to show until the next frame. None at the beginning
+        """
+        self.step = max(0, min(step, len(self.reader)))
+        if self.step == 0:
+            return None
+        x, y = self.reader.get_positions(self.step - 1, self.step)[0].tolist()
+        return x, y
+
+    def is_done(self) -> bool:
+        """checks if all the steps were played"""
+        return self.step >= len(self.reader)
+
+    def next_position(self) -> Optional[Position]:
+        """
+        moves one frame forward
+        :return: the position to show in the frame, None if all the steps were played
+        """
+        if self.is_done():
+            return None
+        shown_step = min(self.step + self.frame_skip, len(self.reader)) - 1
+        x, y = self.reader.get_positions(shown_step, shown_step + 1)[0].tolist()
+        self.step = shown_step + 1
+        return x, y
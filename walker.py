@@ -1,6 +1,6 @@
 import random
 import math
-from typing import Tuple
+from typing import Tuple, Optional
 
 Position = Tuple[float, float]
 
@@ -23,6 +23,8 @@ class Walker:
         __x (float): The current x-coordinate of the walker.
         __y (float): The current y-coordinate of the walker.
         __walking_method (int): The method of walking, which defines the pattern and mechanics of movement.
+        __random (random.Random): The random generator every step is drawn from. Giving a seeded one makes the
+            walk reproducible.
 
     Methods:
         walk(): Executes a movement step based on the current walking method.
@@ -31,15 +33,17 @@ class Walker:
         set_position(): Sets the walker's position to a specified location.
         walking_method(): Retrieves the current walking method.
         set_walking_method(): Sets the walking method, validating against predefined options.
+        set_random(): Sets the random generator the steps are drawn from.
 
     The walker supports dynamic interaction with environments, such as portals, and offers customizable
     walking patterns, making it versatile for different types of simulations. It maintains its own position
     and can adjust its movement strategy dynamically based on method settings.
     """
-    def __init__(self, walking_method: int = SIMPLE_WALK):
+    def __init__(self, walking_method: int = SIMPLE_WALK, rng: Optional[random.Random] = None):
         self.__x: float = 0
         self.__y: float = 0
         self.__walking_method = walking_method
+        self.__random = rng if rng is not None else random.Random()
 
     def walk(self) -> None:
         """move the walker one step, according to its current walking method"""
@@ -54,22 +58,22 @@ class Walker:
 
     def __simple_walk(self) -> None:
         """move one step in any direction"""
-        angle = random.uniform(0, 2 * math.pi)  # Random angle in radians
+        angle = self.__random.uniform(0, 2 * math.pi)  # Random angle in radians
         self.__x += math.cos(angle)  # Change in x
         self.__y += math.sin(angle)  # Change in y
 
     def __square_walk(self) -> None:
         """move one step in one of the 4 straight directions"""
-        direction = random.choice(['x', 'y'])
+        direction = self.__random.choice(['x', 'y'])
         if direction == 'x':
-            self.__x += random.choice([-1, 1])
+            self.__x += self.__random.choice([-1, 1])
         else:
-            self.__y += random.choice([-1, 1])
+            self.__y += self.__random.choice([-1, 1])
 
     def __random_size_walk(self) -> None:
         """move to any direction, a size in any length between 0.5 to 1.5"""
-        angle = random.uniform(0, 2 * math.pi)  # Random angle in radians
-        step_length = random.uniform(0.5, 1.5)  # Random step length between 0.5 and 1.5
+        angle = self.__random.uniform(0, 2 * math.pi)  # Random angle in radians
+        step_length = self.__random.uniform(0.5, 1.5)  # Random step length between 0.5 and 1.5
         self.__x += math.cos(angle) * step_length  # Change in x
         self.__y += math.sin(angle) * step_length  # Change in y
 
@@ -81,7 +85,7 @@ class Walker:
         preferred_probability = 10  # Higher weight for preferred directions
 
         # Generate a random angle
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.__random.uniform(0, 2 * math.pi)
         step_length = 1  # Fixed step length
 
         # Increase probability for specific angles corresponding to up, down, left, right, and towards origin
@@ -97,7 +101,7 @@ class Walker:
         # Adjust the angle based on weighted probability
         angles = [angle] + list(preferred_angles.keys())
         weights = [base_probability] + list(preferred_angles.values())
-        chosen_angle = random.choices(angles, weights=weights, k=1)[0]
+        chosen_angle = self.__random.choices(angles, weights=weights, k=1)[0]
 
         # Move the walker
         self.__x += math.cos(chosen_angle) * step_length
@@ -138,6 +142,10 @@ class Walker:
         self.__x = new_position[X_INDEX]
         self.__y = new_position[Y_INDEX]
 
+    def set_random(self, rng: random.Random) -> None:
+        """change the random generator the steps are drawn from"""
+        self.__random = rng
+
     def walking_method(self) -> int:
         """get the current walking meathod"""
         return self.__walking_method